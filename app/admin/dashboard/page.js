@@ -22,8 +22,14 @@ export default function AdminDashboard() {
 
   const [products, setProducts] = useState([])
   const [orders, setOrders] = useState([])
+  const [ordersTotal, setOrdersTotal] = useState(0)
+  const [ordersCursor, setOrdersCursor] = useState(null)
+  const [orderStatusFilter, setOrderStatusFilter] = useState('all')
   const [users, setUsers] = useState([])
   const [totalUsersCount, setTotalUsersCount] = useState(0)
+  const [usersCursor, setUsersCursor] = useState(null)
+  const [userSearch, setUserSearch] = useState('')
+  const [userSort, setUserSort] = useState('name')
   const [loading, setLoading] = useState(true)
 
   // Product form state
@@ -71,74 +77,72 @@ export default function AdminDashboard() {
     }
   }
 
-  const fetchOrders = async () => {
+  const fetchOrders = async (cursor = null, status = orderStatusFilter) => {
     try {
-      const { data: ordersData, error } = await supabase
-        .from('orders')
-        .select('*')
-        .order('created_at', { ascending: false })
+      const params = new URLSearchParams({ limit: '50' })
+      if (status !== 'all') params.set('status', status)
+      if (cursor) params.set('cursor', cursor)
 
-      if (error) throw error
+      const res = await fetch(`/api/admin/orders?${params}`)
+      const result = await res.json()
 
-      // Fetch related product and user details for each order
-      const ordersWithDetails = await Promise.all(
-        (ordersData || []).map(async (order) => {
-          const [productResult, userResult] = await Promise.all([
-            supabase.from('products').select('name').eq('id', order.product_id).single(),
-            supabase.from('users').select('email').eq('id', order.user_id).single()
-          ])
-
-          return {
-            ...order,
-            products: productResult.data,
-            users: userResult.data
-          }
-        })
-      )
-
-      setOrders(ordersWithDetails)
+      if (!res.ok) throw new Error(result.error || 'Failed to fetch orders')
+
+      setOrders(prev => cursor ? [...prev, ...(result.data || [])] : (result.data || []))
+      setOrdersCursor(result.next_cursor)
+      if (!cursor) setOrdersTotal(result.total || 0)
     } catch (error) {
       console.error('Error fetching orders:', error)
     }
   }
 
-  const fetchUsers = async () => {
+  const handleOrderStatusFilter = (status) => {
+    setOrderStatusFilter(status)
+    fetchOrders(null, status)
+  }
+
+  const fetchUsers = async (cursor = null, sort = userSort) => {
     try {
       // Get user count
-      const countResponse = await fetch(`/api/users/count`)
-      const countData = await countResponse.json()
+      if (!cursor) {
+        const countResponse = await fetch(`/api/users/count`)
+        const countData = await countResponse.json()
 
-      if (countResponse.ok && countData.count !== undefined) {
-        setTotalUsersCount(countData.count)
+        if (countResponse.ok && countData.count !== undefined) {
+          setTotalUsersCount(countData.count)
+        }
       }
 
-      // Fetch users from API endpoint (uses service role key to bypass RLS)
-      const usersResponse = await fetch(`/api/users`)
+      // Admins are excluded and the list is filtered and sorted server-side
+      const params = new URLSearchParams({ limit: '50', sort })
+      if (userSearch.trim()) params.set('search', userSearch.trim())
+      if (cursor) params.set('cursor', cursor)
+
+      const usersResponse = await fetch(`/api/users?${params}`)
       const usersData = await usersResponse.json()
 
       if (!usersResponse.ok) {
         throw new Error(usersData.error || 'Failed to fetch users')
       }
 
-      console.log('Fetched users data:', usersData.data)
-
-      // Filter out admin emails and sort by name
-      const filteredUsers = (usersData.data || [])
-        .filter(user => !user.email.startsWith('admin@'))
-        .sort((a, b) => {
-          const nameA = (a.name || a.email || '').toLowerCase()
-          const nameB = (b.name || b.email || '').toLowerCase()
-          return nameA.localeCompare(nameB)
-        })
-
-      console.log('Filtered users:', filteredUsers)
-      setUsers(filteredUsers)
+      setUsers(prev => cursor ? [...prev, ...(usersData.data || [])] : (usersData.data || []))
+      setUsersCursor(usersData.next_cursor)
     } catch (error) {
       console.error('Error fetching users:', error)
-      setUsers([])
+      if (!cursor) setUsers([])
     }
   }
 
+  const handleUserSort = (sort) => {
+    setUserSort(sort)
+    fetchUsers(null, sort)
+  }
+
+  const handleUserSearch = (e) => {
+    e.preventDefault()
+    fetchUsers(null)
+  }
+
   // Handle image upload to Supabase Storage
   const handleImageUpload = async (file) => {
     if (!file) return null
@@ -192,24 +196,16 @@ export default function AdminDashboard() {
         image_url: imageUrl
       }
 
-      if (productForm.id) {
-        // Update existing product
-        const { error } = await supabase
-          .from('products')
-          .update(productData)
-          .eq('id', productForm.id)
-
-        if (error) throw error
-        toast.success('Product updated successfully')
-      } else {
-        // Create new product
-        const { error } = await supabase
-          .from('products')
-          .insert([productData])
+      // Writes go through the API so cached product pages are invalidated
+      const res = await fetch(productForm.id ? `/api/products/${productForm.id}` : '/api/products', {
+        method: productForm.id ? 'PUT' : 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(productData)
+      })
+      const result = await res.json()
 
-        if (error) throw error
-        toast.success('Product created successfully')
-      }
+      if (!res.ok) throw new Error(result.error || 'Failed to save product')
+      toast.success(productForm.id ? 'Product updated successfully' : 'Product created successfully')
 
       resetProductForm()
       setDialogOpen(false)
@@ -252,12 +248,10 @@ export default function AdminDashboard() {
     if (!confirm('Are you sure you want to delete this product?')) return
 
     try {
-      const { error } = await supabase
-        .from('products')
-        .delete()
-        .eq('id', productId)
+      const res = await fetch(`/api/products/${productId}`, { method: 'DELETE' })
+      const result = await res.json()
 
-      if (error) throw error
+      if (!res.ok) throw new Error(result.error || 'Failed to delete product')
       toast.success('Product deleted successfully')
       fetchProducts()
     } catch (error) {
@@ -345,7 +339,7 @@ export default function AdminDashboard() {
               <ShoppingCart className="h-4 w-4 text-muted-foreground" />
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold">{orders.length}</div>
+              <div className="text-2xl font-bold">{ordersTotal}</div>
             </CardContent>
           </Card>
           <Card>
@@ -580,8 +574,23 @@ export default function AdminDashboard() {
           <TabsContent value="orders" className="space-y-4">
             <Card>
               <CardHeader>
-                <CardTitle>Orders Management</CardTitle>
-                <CardDescription>View and manage all customer orders</CardDescription>
+                <div className="flex items-start justify-between">
+                  <div>
+                    <CardTitle>Orders Management</CardTitle>
+                    <CardDescription>View and manage all customer orders</CardDescription>
+                  </div>
+                  <Select value={orderStatusFilter} onValueChange={handleOrderStatusFilter}>
+                    <SelectTrigger className="w-40">
+                      <SelectValue />
+                    </SelectTrigger>
+                    <SelectContent>
+                      <SelectItem value="all">All Statuses</SelectItem>
+                      <SelectItem value="pending">Pending</SelectItem>
+                      <SelectItem value="completed">Completed</SelectItem>
+                      <SelectItem value="cancelled">Cancelled</SelectItem>
+                    </SelectContent>
+                  </Select>
+                </div>
               </CardHeader>
               <CardContent>
                 {orders.length === 0 ? (
@@ -628,6 +637,13 @@ export default function AdminDashboard() {
                         </CardContent>
                       </Card>
                     ))}
+                    {ordersCursor && (
+                      <div className="flex justify-center">
+                        <Button variant="outline" onClick={() => fetchOrders(ordersCursor)}>
+                          Load more orders
+                        </Button>
+                      </div>
+                    )}
                   </div>
                 )}
               </CardContent>
@@ -638,8 +654,32 @@ export default function AdminDashboard() {
           <TabsContent value="users" className="space-y-4">
             <Card>
               <CardHeader>
-                <CardTitle>Users Management</CardTitle>
-                <CardDescription>View and manage user accounts</CardDescription>
+                <div className="flex items-start justify-between gap-4">
+                  <div>
+                    <CardTitle>Users Management</CardTitle>
+                    <CardDescription>View and manage user accounts</CardDescription>
+                  </div>
+                  <div className="flex items-center gap-2">
+                    <form onSubmit={handleUserSearch}>
+                      <Input
+                        placeholder="Search by email..."
+                        value={userSearch}
+                        onChange={(e) => setUserSearch(e.target.value)}
+                        className="w-56"
+                      />
+                    </form>
+                    <Select value={userSort} onValueChange={handleUserSort}>
+                      <SelectTrigger className="w-36">
+                        <SelectValue />
+                      </SelectTrigger>
+                      <SelectContent>
+                        <SelectItem value="name">Name</SelectItem>
+                        <SelectItem value="newest">Newest</SelectItem>
+                        <SelectItem value="oldest">Oldest</SelectItem>
+                      </SelectContent>
+                    </Select>
+                  </div>
+                </div>
               </CardHeader>
               <CardContent>
                 {users.length === 0 ? (
@@ -687,6 +727,13 @@ export default function AdminDashboard() {
                         </CardContent>
                       </Card>
                     ))}
+                    {usersCursor && (
+                      <div className="flex justify-center">
+                        <Button variant="outline" onClick={() => fetchUsers(usersCursor)}>
+                          Load more users
+                        </Button>
+                      </div>
+                    )}
                   </div>
                 )}
               </CardContent>
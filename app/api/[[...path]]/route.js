@@ -1,19 +1,7 @@
-import { MongoClient } from 'mongodb'
 import { v4 as uuidv4 } from 'uuid'
 import { NextResponse } from 'next/server'
-
-// MongoDB connection
-let client
-let db
-
-async function connectToMongo() {
-  if (!client) {
-    client = new MongoClient(process.env.MONGO_URL)
-    await client.connect()
-    db = client.db(process.env.DB_NAME)
-  }
-  return db
-}
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { withServerTiming } from '@/lib/serverTiming'
 
 // Helper function to handle CORS
 function handleCORS(response) {
@@ -36,8 +24,6 @@ async function handleRoute(request, { params }) {
   const method = request.method
 
   try {
-    const db = await connectToMongo()
-
     // Root endpoint - GET /api/root (since /api/ is not accessible with catch-all)
     if (route === '/root' && method === 'GET') {
       return handleCORS(NextResponse.json({ message: "Hello World" }))
@@ -64,21 +50,23 @@ async function handleRoute(request, { params }) {
         timestamp: new Date()
       }
 
-      await db.collection('status_checks').insertOne(statusObj)
+      const { error } = await supabaseAdmin
+        .from('status_checks')
+        .insert([statusObj])
+
+      if (error) throw error
       return handleCORS(NextResponse.json(statusObj))
     }
 
     // Status endpoints - GET /api/status
     if (route === '/status' && method === 'GET') {
-      const statusChecks = await db.collection('status_checks')
-        .find({})
+      const { data: statusChecks, error } = await supabaseAdmin
+        .from('status_checks')
+        .select('id, client_name, timestamp')
         .limit(1000)
-        .toArray()
-
-      // Remove MongoDB's _id field from response
-      const cleanedStatusChecks = statusChecks.map(({ _id, ...rest }) => rest)
 
-      return handleCORS(NextResponse.json(cleanedStatusChecks))
+      if (error) throw error
+      return handleCORS(NextResponse.json(statusChecks))
     }
 
     // Route not found
@@ -97,8 +85,8 @@ async function handleRoute(request, { params }) {
 }
 
 // Export all HTTP methods
-export const GET = handleRoute
-export const POST = handleRoute
-export const PUT = handleRoute
-export const DELETE = handleRoute
-export const PATCH = handleRoute
+export const GET = withServerTiming(handleRoute)
+export const POST = withServerTiming(handleRoute)
+export const PUT = withServerTiming(handleRoute)
+export const DELETE = withServerTiming(handleRoute)
+export const PATCH = withServerTiming(handleRoute)
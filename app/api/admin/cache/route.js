@@ -0,0 +1,9 @@
+import { NextResponse } from 'next/server'
+import { cacheStats } from '@/lib/cache'
+import { withServerTiming } from '@/lib/serverTiming'
+
+// Route cache counters for this server process, for sizing
+// ROUTE_CACHE_MAX_ENTRIES and the per-route TTLs
+export const GET = withServerTiming(async function GET() {
+  return NextResponse.json({ data: cacheStats() })
+})
@@ -0,0 +1,64 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { parseLimit } from '@/lib/keyset'
+import { EXPORT_BATCH_SIZE, MAX_EXPORT_BATCH_SIZE, keysetBatches, ndjsonStream } from '@/lib/ndjsonExport'
+import { withServerTiming } from '@/lib/serverTiming'
+
+// Exportable tables and the filters each one accepts besides from/to
+const EXPORTS = {
+  orders: {
+    filter: (query, searchParams) => {
+      const status = searchParams.get('status')
+      return status && status !== 'all' ? query.eq('status', status) : query
+    }
+  },
+  users: {
+    filter: (query, searchParams) => {
+      return searchParams.get('include_admins') === '1' ? query : query.neq('role', 'admin')
+    }
+  }
+}
+
+// Whole-table export for reporting jobs: one JSON object per line
+// (application/x-ndjson), oldest first, streamed batch by batch so memory
+// stays flat however many rows there are. ?from= / ?to= bound created_at;
+// ?batch= sets the rows per query.
+export const GET = withServerTiming(async function GET(request, { params }) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const spec = EXPORTS[params.table]
+
+    if (!spec) {
+      return NextResponse.json({ error: `Unknown export: ${params.table}` }, { status: 404 })
+    }
+
+    const batchSize = parseLimit(searchParams.get('batch'), EXPORT_BATCH_SIZE, MAX_EXPORT_BATCH_SIZE)
+    const from = searchParams.get('from')
+    const to = searchParams.get('to')
+
+    const buildQuery = () => {
+      let query = spec.filter(supabaseAdmin.from(params.table).select('*'), searchParams)
+      if (from) {
+        query = query.gte('created_at', from)
+      }
+      if (to) {
+        query = query.lte('created_at', to)
+      }
+      return query
+    }
+
+    const loadBatch = keysetBatches(buildQuery, batchSize)
+    const first = await loadBatch(null)
+
+    return new NextResponse(ndjsonStream(loadBatch, first), {
+      headers: {
+        'Content-Type': 'application/x-ndjson',
+        'Content-Disposition': `attachment; filename="${params.table}.ndjson"`,
+        'Cache-Control': 'no-store'
+      }
+    })
+  } catch (error) {
+    console.error('Export error:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
@@ -0,0 +1,71 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { applyKeyset, decodeCursor, keysetPage, orderForKeyset, parseLimit } from '@/lib/keyset'
+import { fetchProductsById, fetchRowsById } from '@/lib/lookups'
+import { withServerTiming } from '@/lib/serverTiming'
+
+const DEFAULT_LIMIT = 50
+const MAX_LIMIT = 200
+
+// Paginated admin order list, newest first, joined with product and customer
+// fields through two batched lookups - three round trips per page however
+// many orders exist.
+export const GET = withServerTiming(async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const status = searchParams.get('status')
+    const from = searchParams.get('from')
+    const to = searchParams.get('to')
+    const limit = parseLimit(searchParams.get('limit'), DEFAULT_LIMIT, MAX_LIMIT)
+    const cursorParam = searchParams.get('cursor')
+
+    const cursor = cursorParam ? decodeCursor(cursorParam) : null
+    if (cursorParam && !cursor) {
+      return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 })
+    }
+
+    // Exact total only on the first page; later pages reuse the client's copy
+    let query = supabaseAdmin
+      .from('orders')
+      .select('*', cursor ? {} : { count: 'exact' })
+
+    if (status && status !== 'all') {
+      query = query.eq('status', status)
+    }
+    if (from) {
+      query = query.gte('created_at', from)
+    }
+    if (to) {
+      query = query.lte('created_at', to)
+    }
+
+    query = orderForKeyset(applyKeyset(query, 'created_at', false, cursor), 'created_at', false, limit)
+
+    const { data, count, error } = await query
+
+    if (error) throw error
+
+    const { page, hasMore, nextCursor } = keysetPage(data || [], 'created_at', limit)
+
+    const [productsById, usersById] = await Promise.all([
+      fetchProductsById(supabaseAdmin, page, 'id, name, price, image_url'),
+      fetchRowsById(supabaseAdmin, 'users', page.map(o => o.user_id), 'id, email, name')
+    ])
+
+    const orders = page.map(order => ({
+      ...order,
+      products: productsById[order.product_id] || null,
+      users: usersById[order.user_id] || null
+    }))
+
+    return NextResponse.json({
+      data: orders,
+      total: cursor ? null : count,
+      has_more: hasMore,
+      next_cursor: nextCursor
+    })
+  } catch (error) {
+    console.error('Error fetching admin orders:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
@@ -1,19 +1,8 @@
 import { NextResponse } from 'next/server'
-import { supabase } from '@/lib/supabaseClient'
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { withServerTiming } from '@/lib/serverTiming'
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
-
-// Create admin client for server-side operations
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey, {
-  auth: {
-    autoRefreshToken: false,
-    persistSession: false
-  }
-})
-
-export async function POST(request) {
+export const POST = withServerTiming(async function POST(request) {
   try {
     const { name, email, phone, password } = await request.json()
 
@@ -89,4 +78,4 @@ export async function POST(request) {
       { status: 500 }
     )
   }
-}
\ No newline at end of file
+})
\ No newline at end of file
@@ -0,0 +1,91 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { invalidateUserCounts } from '@/lib/userCounts'
+import { withServerTiming } from '@/lib/serverTiming'
+
+const OPS = ['add', 'set', 'remove', 'clear']
+
+// Apply a list of cart operations for one user in a single request.
+//
+// Body: { user_id, operations: [
+//   { op: 'add', product_id, quantity },
+//   { op: 'set', id, quantity },
+//   { op: 'remove', id },
+//   { op: 'clear' }
+// ] }
+//
+// Operations are grouped by type and each group runs as one statement, in the
+// order clear -> remove -> set -> add.
+export const POST = withServerTiming(async function POST(request) {
+  try {
+    const { user_id, operations } = await request.json()
+
+    if (!user_id || !Array.isArray(operations) || operations.length === 0) {
+      return NextResponse.json({ error: 'Missing required fields' }, { status: 400 })
+    }
+
+    const invalid = operations.find(o =>
+      !OPS.includes(o?.op) ||
+      (o.op === 'add' && !o.product_id) ||
+      (o.op === 'set' && (!o.id || o.quantity === undefined)) ||
+      (o.op === 'remove' && !o.id)
+    )
+    if (invalid) {
+      return NextResponse.json({ error: 'Invalid operation', operation: invalid }, { status: 400 })
+    }
+
+    const clear = operations.some(o => o.op === 'clear')
+    const removeIds = operations.filter(o => o.op === 'remove').map(o => o.id)
+    const setItems = operations.filter(o => o.op === 'set').map(o => ({ id: o.id, qty: o.quantity }))
+    const addItems = operations.filter(o => o.op === 'add').map(o => ({ product_id: o.product_id, qty: o.quantity || 1 }))
+
+    const result = { cleared: false, removed: 0, updated: [], added: [] }
+
+    if (clear) {
+      const { error } = await supabaseAdmin
+        .from('cart')
+        .delete()
+        .eq('user_id', user_id)
+
+      if (error) throw error
+      result.cleared = true
+    }
+
+    if (removeIds.length > 0 && !clear) {
+      const { data, error } = await supabaseAdmin
+        .from('cart')
+        .delete()
+        .eq('user_id', user_id)
+        .in('id', removeIds)
+        .select('id')
+
+      if (error) throw error
+      result.removed = (data || []).length
+    }
+
+    if (setItems.length > 0 && !clear) {
+      const { data, error } = await supabaseAdmin
+        .rpc('set_cart_qty_batch', { p_user_id: user_id, p_items: setItems })
+
+      if (error) throw error
+      result.updated = data || []
+    }
+
+    if (addItems.length > 0) {
+      const { data, error } = await supabaseAdmin
+        .rpc('add_to_cart_batch', { p_user_id: user_id, p_items: addItems })
+
+      if (error) throw error
+      result.added = data || []
+    }
+
+    if (clear || removeIds.length > 0 || addItems.length > 0) {
+      invalidateUserCounts(user_id)
+    }
+
+    return NextResponse.json({ data: result })
+  } catch (error) {
+    console.error('Batch cart error:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
@@ -1,13 +1,11 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
-import { v4 as uuidv4 } from 'uuid'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { fetchProductsById, roundMoney } from '@/lib/lookups'
+import { withIdempotency } from '@/lib/idempotency'
+import { invalidateUserCounts } from '@/lib/userCounts'
+import { withServerTiming } from '@/lib/serverTiming'
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
-
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
-
-export async function POST(request) {
+export const POST = withServerTiming(withIdempotency('cart', async function POST(request) {
   try {
     const { user_id, product_id, quantity } = await request.json()
 
@@ -15,67 +13,29 @@ export async function POST(request) {
       return NextResponse.json({ error: 'Missing required fields' }, { status: 400 })
     }
 
-    // Check if item already exists in cart
-    const { data: existing } = await supabaseAdmin
-      .from('cart')
-      .select('*')
-      .eq('user_id', user_id)
-      .eq('product_id', product_id)
+    // Atomic upsert keyed on (user_id, product_id) - see add_to_cart() in supabase/migrations
+    const { data, error } = await supabaseAdmin
+      .rpc('add_to_cart', {
+        p_user_id: user_id,
+        p_product_id: product_id,
+        p_qty: quantity || 1
+      })
       .single()
 
-    if (existing) {
-      // Item exists - use DELETE + INSERT to bypass UPDATE trigger
-      const newQty = existing.qty + (quantity || 1)
-      
-      // Delete existing
-      const { error: deleteError } = await supabaseAdmin
-        .from('cart')
-        .delete()
-        .eq('id', existing.id)
-
-      if (deleteError) throw deleteError
-
-      // Insert with new quantity
-      const { data, error } = await supabaseAdmin
-        .from('cart')
-        .insert([{
-          id: existing.id,
-          user_id: existing.user_id,
-          product_id: existing.product_id,
-          qty: newQty,
-          created_at: existing.created_at
-        }])
-        .select()
-        .single()
-
-      if (error) throw error
-      return NextResponse.json({ data })
-    } else {
-      // Insert new cart item
-      const { data, error } = await supabaseAdmin
-        .from('cart')
-        .insert([{
-          id: uuidv4(),
-          user_id,
-          product_id,
-          qty: quantity || 1
-        }])
-        .select()
-        .single()
-
-      if (error) throw error
-      return NextResponse.json({ data })
-    }
+    if (error) throw error
+    invalidateUserCounts(user_id)
+    return NextResponse.json({ data })
   } catch (error) {
     console.error('Cart error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+}))
 
-export async function GET(request) {
+export const GET = withServerTiming(async function GET(request) {
   try {
     const { searchParams } = new URL(request.url)
     const user_id = searchParams.get('user_id')
+    const expand = searchParams.get('expand')
 
     if (!user_id) {
       return NextResponse.json({ error: 'User ID required' }, { status: 400 })
@@ -87,14 +47,39 @@ export async function GET(request) {
       .eq('user_id', user_id)
 
     if (error) throw error
-    return NextResponse.json({ data })
+
+    if (expand !== 'product') {
+      return NextResponse.json({ data })
+    }
+
+    // expand=product: join product details and totals in one batched lookup
+    const productsById = await fetchProductsById(supabaseAdmin, data || [])
+
+    const items = (data || []).map(item => {
+      const product = productsById[item.product_id] || null
+      const price = parseFloat(product?.price || 0)
+      return {
+        ...item,
+        product,
+        quantity: item.qty,
+        line_total: roundMoney(price * item.qty)
+      }
+    })
+
+    const totals = {
+      items: items.length,
+      quantity: items.reduce((sum, item) => sum + item.qty, 0),
+      subtotal: roundMoney(items.reduce((sum, item) => sum + item.line_total, 0))
+    }
+
+    return NextResponse.json({ data: items, totals })
   } catch (error) {
     console.error('Get cart error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function DELETE(request) {
+export const DELETE = withServerTiming(async function DELETE(request) {
   try {
     const { searchParams } = new URL(request.url)
     const cart_id = searchParams.get('id')
@@ -103,20 +88,22 @@ export async function DELETE(request) {
       return NextResponse.json({ error: 'Cart ID required' }, { status: 400 })
     }
 
-    const { error } = await supabaseAdmin
+    const { data, error } = await supabaseAdmin
       .from('cart')
       .delete()
       .eq('id', cart_id)
+      .select('user_id')
 
     if (error) throw error
+    invalidateUserCounts(...(data || []).map(row => row.user_id))
     return NextResponse.json({ success: true })
   } catch (error) {
     console.error('Delete cart error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function PATCH(request) {
+export const PATCH = withServerTiming(async function PATCH(request) {
   try {
     const { id, quantity } = await request.json()
 
@@ -124,45 +111,19 @@ export async function PATCH(request) {
       return NextResponse.json({ error: 'Missing required fields' }, { status: 400 })
     }
 
-    // WORKAROUND: Instead of UPDATE (which triggers the error), 
-    // we DELETE the old item and INSERT a new one with updated quantity
-    // This completely bypasses the UPDATE trigger
-    
-    // Step 1: Get current cart item details
-    const { data: currentItem, error: fetchError } = await supabaseAdmin
-      .from('cart')
-      .select('*')
-      .eq('id', id)
-      .single()
-
-    if (fetchError) throw fetchError
-
-    // Step 2: Delete the current item
-    const { error: deleteError } = await supabaseAdmin
-      .from('cart')
-      .delete()
-      .eq('id', id)
-
-    if (deleteError) throw deleteError
-
-    // Step 3: Insert new item with updated quantity (same ID)
-    const { data: newItem, error: insertError } = await supabaseAdmin
-      .from('cart')
-      .insert([{
-        id: currentItem.id,
-        user_id: currentItem.user_id,
-        product_id: currentItem.product_id,
-        qty: quantity,
-        created_at: currentItem.created_at
-      }])
-      .select()
-      .single()
+    // Single-statement update - see set_cart_qty() in supabase/migrations
+    const { data, error } = await supabaseAdmin
+      .rpc('set_cart_qty', { p_id: id, p_qty: quantity })
+      .maybeSingle()
 
-    if (insertError) throw insertError
+    if (error) throw error
+    if (!data) {
+      return NextResponse.json({ error: 'Cart item not found' }, { status: 404 })
+    }
 
-    return NextResponse.json({ data: newItem })
+    return NextResponse.json({ data })
   } catch (error) {
     console.error('Update cart error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
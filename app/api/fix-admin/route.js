@@ -1,12 +1,8 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { withServerTiming } from '@/lib/serverTiming'
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
-
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
-
-export async function POST(request) {
+export const POST = withServerTiming(async function POST(request) {
   try {
     // Update admin user role in users table
     const { data, error } = await supabaseAdmin
@@ -26,4 +22,4 @@ export async function POST(request) {
     console.error('Fix admin error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
@@ -1,12 +1,8 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { withServerTiming } from '@/lib/serverTiming'
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
-
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
-
-export async function POST(request) {
+export const POST = withServerTiming(async function POST(request) {
   try {
     const results = []
 
@@ -39,4 +35,4 @@ export async function POST(request) {
     console.error('Init tables error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
@@ -0,0 +1,43 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { getUserCounts, isInCart } from '@/lib/userCounts'
+import { withServerTiming } from '@/lib/serverTiming'
+
+function etagMatches(header, etag) {
+  if (!header) return false
+  return header === '*' || header.split(',').some(tag => tag.trim() === etag)
+}
+
+// Navbar badge counts: { data: { cart, wishlist } }, plus in_cart when
+// ?product_id= is given (the "already in your cart" check before adding).
+// The ETag is derived from the counts, and Cache-Control: no-cache makes the
+// browser revalidate with If-None-Match, so an unchanged badge costs a 304
+// with no body.
+export const GET = withServerTiming(async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const userId = searchParams.get('user_id')
+    const productId = searchParams.get('product_id')
+
+    if (!userId) {
+      return NextResponse.json({ error: 'User ID required' }, { status: 400 })
+    }
+
+    const [counts, inCart] = await Promise.all([
+      getUserCounts(supabaseAdmin, userId),
+      productId ? isInCart(supabaseAdmin, userId, productId) : null
+    ])
+
+    const data = productId ? { ...counts, in_cart: inCart } : counts
+    const etag = `W/"${data.cart}-${data.wishlist}${productId ? `-${inCart ? 1 : 0}` : ''}"`
+    const headers = { ETag: etag, 'Cache-Control': 'private, no-cache' }
+
+    if (etagMatches(request.headers.get('if-none-match'), etag)) {
+      return new NextResponse(null, { status: 304, headers })
+    }
+    return NextResponse.json({ data }, { headers })
+  } catch (error) {
+    console.error('Get counts error:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
@@ -1,77 +1,155 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
 import { v4 as uuidv4 } from 'uuid'
-
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
-
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
-
-export async function POST(request) {
+import { fetchProductsById } from '@/lib/lookups'
+import { decodeCursor, parseLimit } from '@/lib/keyset'
+import { MAX_ORDER_GROUPS_PAGE_SIZE, ORDER_GROUPS_PAGE_SIZE, getOrderGroup, listOrderGroups } from '@/lib/orderGroups'
+import { MAX_ORDER_HISTORY_PAGE_SIZE, ORDER_HISTORY_PAGE_SIZE, listOrderHistory } from '@/lib/orderHistory'
+import { getOrderCapabilities, isColumnError } from '@/lib/schemaCapabilities'
+import { PricingError, priceItems } from '@/lib/pricing'
+import { withIdempotency } from '@/lib/idempotency'
+import { withServerTiming } from '@/lib/serverTiming'
+
+export const POST = withServerTiming(withIdempotency('orders', async function POST(request) {
   try {
-    const { user_id, items, total_amount, payment_method, shipping_address } = await request.json()
+    const { user_id, items, promo_code, pincode, payment_method, shipping_address } = await request.json()
 
-    if (!user_id || !items || !total_amount) {
+    if (!user_id || !items) {
       return NextResponse.json({ error: 'Missing required fields' }, { status: 400 })
     }
 
-    // Create individual orders for each item (compatible with existing schema)
-    const orderPromises = items.map(async (item) => {
-      const orderId = uuidv4()
-
-      const base = {
-        id: orderId,
-        user_id,
-        product_id: item.product_id,
-        quantity: item.quantity,
-        total_price: item.total,
-        status: 'pending'
-      }
-      const withExtras = { ...base, payment_method, shipping_address }
+    // Line totals come from catalog prices, never from the client's
+    // total_amount / item.total. Read fresh rather than from this process's
+    // caches, so a price or promotion change made through another instance
+    // is charged at once.
+    const quote = await priceItems(supabaseAdmin, items, { promoCode: promo_code, pincode, fresh: true })
+    if (quote.promo_error) {
+      return NextResponse.json({ error: quote.promo_error }, { status: 400 })
+    }
+
+    const buildRows = ({ paymentDetails }) => quote.lines.map(line => ({
+      id: uuidv4(),
+      user_id,
+      product_id: line.product_id,
+      quantity: line.quantity,
+      total_price: line.total,
+      status: 'pending',
+      ...(paymentDetails ? { payment_method, shipping_address } : {})
+    }))
+
+    // The order group and its lines in one transaction - see place_order()
+    // in supabase/migrations
+    const placeOrder = () => supabaseAdmin.rpc('place_order', {
+      p_user_id: user_id,
+      p_items: quote.lines.map(line => ({
+        product_id: line.product_id,
+        quantity: line.quantity,
+        total_price: line.total
+      })),
+      p_subtotal: quote.subtotal,
+      p_discount: quote.discount,
+      p_shipping: quote.shipping,
+      p_total_amount: quote.total,
+      p_promo_code: quote.promotion?.code || null,
+      p_payment_method: payment_method || null,
+      p_shipping_address: shipping_address || null
+    })
 
-      // Try inserting with payment_method/shipping_address; if columns don't exist, retry with base fields only
-      let result = await supabaseAdmin
+    const insertOrders = async (capabilities) => capabilities.orderGroups
+      ? placeOrder()
+      : supabaseAdmin
         .from('orders')
-        .insert([withExtras])
+        .insert(buildRows(capabilities))
         .select()
-        .single()
-
-      if (result.error && /does not exist|column|payment_method|shipping_address/i.test(result.error.message || '')) {
-        result = await supabaseAdmin
-          .from('orders')
-          .insert([base])
-          .select()
-          .single()
-      }
 
-      return result
-    })
+    // One round trip per checkout; schema support is probed once per process
+    let result = await insertOrders(await getOrderCapabilities(supabaseAdmin))
 
-    const results = await Promise.all(orderPromises)
-    
-    // Check if any order failed
-    const failedOrder = results.find(result => result.error)
-    if (failedOrder) {
-      throw failedOrder.error
+    if (result.error && isColumnError(result.error)) {
+      // Schema changed since the probe - refresh the cached capabilities and retry once
+      result = await insertOrders(await getOrderCapabilities(supabaseAdmin, { refresh: true }))
     }
 
+    if (result.error) throw result.error
+
     return NextResponse.json({ 
       success: true,
-      data: results[0].data, // Return first order for redirect
+      data: result.data[0], // Return first order for redirect
+      orders: result.data,
+      // Databases without order groups address a checkout by its first line
+      order_group_id: result.data[0]?.order_group_id || result.data[0]?.id,
+      pricing: quote,
       message: 'Orders created successfully'
     })
   } catch (error) {
+    if (error instanceof PricingError) {
+      return NextResponse.json({ error: error.message }, { status: 400 })
+    }
     console.error('Create order error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
-
-export async function GET(request) {
+}))
+
+// ?group_id=   one checkout with its line items; with &recent=N also the
+//              user's N most recent other checkouts (pass &user_id= to load
+//              them alongside the group)
+// ?user_id=&view=groups   the user's checkouts newest first, paginated by
+//              ?limit= and ?cursor= (next_cursor from the previous page)
+// ?user_id=&view=history  the user's order lines newest first with their
+//              products, paginated the same way; optional ?status=
+// ?user_id=    every order line of the user; ?id= a single line
+export const GET = withServerTiming(async function GET(request) {
   try {
     const { searchParams } = new URL(request.url)
     const userId = searchParams.get('user_id')
     const orderId = searchParams.get('id')
-    let createdAt = searchParams.get('created_at')
+    const groupId = searchParams.get('group_id')
+    const recentParam = searchParams.get('recent')
+
+    if (groupId) {
+      const recentLimit = recentParam ? parseLimit(recentParam, 5, MAX_ORDER_GROUPS_PAGE_SIZE) : 0
+      // One extra in case the group itself is among the most recent
+      const listRecent = (ownerId) => listOrderGroups(supabaseAdmin, ownerId, { limit: recentLimit + 1 })
+
+      const [group, recentForUser] = await Promise.all([
+        getOrderGroup(supabaseAdmin, groupId),
+        recentLimit && userId ? listRecent(userId) : null
+      ])
+
+      if (!group) {
+        return NextResponse.json({ error: 'Order not found' }, { status: 404 })
+      }
+      if (!recentLimit) {
+        return NextResponse.json({ data: group })
+      }
+
+      const recent = recentForUser && userId === group.user_id
+        ? recentForUser
+        : await listRecent(group.user_id)
+
+      return NextResponse.json({
+        data: group,
+        recent: recent.data.filter(g => g.id !== group.id).slice(0, recentLimit)
+      })
+    }
+
+    const view = searchParams.get('view')
+    if (userId && (view === 'groups' || view === 'history')) {
+      const cursorParam = searchParams.get('cursor')
+      const cursor = cursorParam ? decodeCursor(cursorParam) : null
+      if (cursorParam && !cursor) {
+        return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 })
+      }
+
+      if (view === 'history') {
+        const limit = parseLimit(searchParams.get('limit'), ORDER_HISTORY_PAGE_SIZE, MAX_ORDER_HISTORY_PAGE_SIZE)
+        const status = searchParams.get('status')
+        return NextResponse.json(await listOrderHistory(supabaseAdmin, userId, { limit, cursor, status }))
+      }
+
+      const limit = parseLimit(searchParams.get('limit'), ORDER_GROUPS_PAGE_SIZE, MAX_ORDER_GROUPS_PAGE_SIZE)
+      return NextResponse.json(await listOrderGroups(supabaseAdmin, userId, { limit, cursor }))
+    }
 
     let query = supabaseAdmin
       .from('orders')
@@ -80,12 +158,6 @@ export async function GET(request) {
 
     if (orderId) {
       query = query.eq('id', orderId)
-    } else if (userId && createdAt) {
-      // Normalize createdAt if '+' got converted to space in query parsing
-      if (createdAt && createdAt.includes(' ')) {
-        createdAt = createdAt.replace(' ', '+')
-      }
-      query = query.eq('user_id', userId).eq('created_at', createdAt)
     } else if (userId) {
       query = query.eq('user_id', userId)
     } else {
@@ -98,19 +170,7 @@ export async function GET(request) {
 
     const orders = data || []
 
-    const productIds = [...new Set(orders.map(o => o.product_id).filter(Boolean))]
-    let productsById = {}
-
-    if (productIds.length > 0) {
-      const { data: products, error: productsError } = await supabaseAdmin
-        .from('products')
-        .select('id, name, price, image_url')
-        .in('id', productIds)
-
-      if (productsError) throw productsError
-
-      productsById = Object.fromEntries((products || []).map(p => [p.id, p]))
-    }
+    const productsById = await fetchProductsById(supabaseAdmin, orders, 'id, name, price, image_url')
 
     const formattedData = orders.map(order => ({
       ...order,
@@ -122,9 +182,9 @@ export async function GET(request) {
     console.error('Error fetching orders:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function PATCH(request) {
+export const PATCH = withServerTiming(async function PATCH(request) {
   try {
     const { id, status } = await request.json()
 
@@ -145,9 +205,9 @@ export async function PATCH(request) {
     console.error('Update order error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function DELETE(request) {
+export const DELETE = withServerTiming(async function DELETE(request) {
   try {
     const { searchParams } = new URL(request.url)
     const order_id = searchParams.get('id')
@@ -167,4 +227,4 @@ export async function DELETE(request) {
     console.error('Delete order error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
@@ -0,0 +1,23 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { PricingError, priceItems } from '@/lib/pricing'
+import { withServerTiming } from '@/lib/serverTiming'
+
+// Checkout quote: line totals, promo discount, shipping and the order total,
+// all from server-side prices. Body: { items: [{ product_id, quantity }],
+// promo_code?, pincode? }. An unusable promo code still prices the order,
+// without a discount, and says why in promo_error.
+export const POST = withServerTiming(async function POST(request) {
+  try {
+    const { items, promo_code, pincode } = await request.json()
+
+    const data = await priceItems(supabaseAdmin, items, { promoCode: promo_code, pincode })
+    return NextResponse.json({ data })
+  } catch (error) {
+    if (error instanceof PricingError) {
+      return NextResponse.json({ error: error.message }, { status: 400 })
+    }
+    console.error('Pricing error:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
@@ -0,0 +1,83 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { getProduct, getProductDetail, invalidateProduct } from '@/lib/productCache'
+import { revalidateCatalogPages } from '@/lib/catalogPages'
+import { withServerTiming } from '@/lib/serverTiming'
+
+const EDITABLE_FIELDS = ['name', 'description', 'price', 'category', 'image_url']
+
+// ?expand=detail adds everything the product page shows - suggestions, the
+// first page of reviews and the rating summary - so the page needs a single
+// request. Every part is served from the route cache.
+export const GET = withServerTiming(async function GET(request, { params }) {
+  try {
+    const { searchParams } = new URL(request.url)
+
+    if (searchParams.get('expand') !== 'detail') {
+      const product = await getProduct(supabaseAdmin, params.id)
+
+      if (!product) {
+        return NextResponse.json({ error: 'Product not found' }, { status: 404 })
+      }
+      return NextResponse.json({ data: product })
+    }
+
+    const detail = await getProductDetail(supabaseAdmin, params.id)
+
+    if (!detail) {
+      return NextResponse.json({ error: 'Product not found' }, { status: 404 })
+    }
+    const { product, ...rest } = detail
+    return NextResponse.json({ data: product, ...rest })
+  } catch (error) {
+    console.error('Error fetching product:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
+
+export const PUT = withServerTiming(async function PUT(request, { params }) {
+  try {
+    const body = await request.json()
+
+    const updateData = {}
+    for (const field of EDITABLE_FIELDS) {
+      if (body[field] !== undefined) updateData[field] = body[field]
+    }
+
+    const { data, error } = await supabaseAdmin
+      .from('products')
+      .update(updateData)
+      .eq('id', params.id)
+      .select()
+      .maybeSingle()
+
+    if (error) throw error
+    invalidateProduct(params.id)
+    revalidateCatalogPages()
+
+    if (!data) {
+      return NextResponse.json({ error: 'Product not found' }, { status: 404 })
+    }
+    return NextResponse.json({ data })
+  } catch (error) {
+    console.error('Error updating product:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
+
+export const DELETE = withServerTiming(async function DELETE(request, { params }) {
+  try {
+    const { error } = await supabaseAdmin
+      .from('products')
+      .delete()
+      .eq('id', params.id)
+
+    if (error) throw error
+    invalidateProduct(params.id)
+    revalidateCatalogPages()
+    return NextResponse.json({ success: true })
+  } catch (error) {
+    console.error('Error deleting product:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
@@ -0,0 +1,24 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { parseLimit } from '@/lib/keyset'
+import { getProduct, getSuggestions, SUGGESTIONS_LIMIT } from '@/lib/productCache'
+import { withServerTiming } from '@/lib/serverTiming'
+
+export const GET = withServerTiming(async function GET(request, { params }) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const limit = parseLimit(searchParams.get('limit'), SUGGESTIONS_LIMIT, 20)
+
+    const product = await getProduct(supabaseAdmin, params.id)
+
+    if (!product) {
+      return NextResponse.json({ error: 'Product not found' }, { status: 404 })
+    }
+
+    const data = await getSuggestions(supabaseAdmin, product, limit)
+    return NextResponse.json({ data })
+  } catch (error) {
+    console.error('Error fetching suggested products:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
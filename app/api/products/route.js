@@ -0,0 +1,70 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { decodeCursor, parseLimit } from '@/lib/keyset'
+import { CATALOG_PAGE_SIZE, MAX_CATALOG_PAGE_SIZE, SORTS, cleanSearch, listProducts } from '@/lib/productListing'
+import { invalidateProduct } from '@/lib/productCache'
+import { revalidateCatalogPages } from '@/lib/catalogPages'
+import { withServerTiming } from '@/lib/serverTiming'
+
+function parsePrice(value) {
+  if (value === null || value === '') return null
+  const price = parseFloat(value)
+  return Number.isFinite(price) ? price : null
+}
+
+export const GET = withServerTiming(async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const search = cleanSearch(searchParams.get('search'))
+    const category = searchParams.get('category')
+    const minPrice = parsePrice(searchParams.get('min_price'))
+    const maxPrice = parsePrice(searchParams.get('max_price'))
+    const sort = SORTS[searchParams.get('sort')] ? searchParams.get('sort') : 'name'
+    const limit = parseLimit(searchParams.get('limit'), CATALOG_PAGE_SIZE, MAX_CATALOG_PAGE_SIZE)
+    const cursorParam = searchParams.get('cursor')
+    const withFacets = searchParams.get('facets') !== '0'
+
+    const cursor = cursorParam ? decodeCursor(cursorParam) : null
+    if (cursorParam && !cursor) {
+      return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 })
+    }
+
+    return NextResponse.json(await listProducts(supabaseAdmin, {
+      search,
+      category,
+      minPrice,
+      maxPrice,
+      sort,
+      limit,
+      cursor,
+      withFacets
+    }))
+  } catch (error) {
+    console.error('Error listing products:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
+
+export const POST = withServerTiming(async function POST(request) {
+  try {
+    const { name, description, price, category, image_url } = await request.json()
+
+    if (!name || price === undefined || price === null || price === '') {
+      return NextResponse.json({ error: 'Missing required fields' }, { status: 400 })
+    }
+
+    const { data, error } = await supabaseAdmin
+      .from('products')
+      .insert([{ name, description, price, category, image_url }])
+      .select()
+      .single()
+
+    if (error) throw error
+    invalidateProduct(null)
+    revalidateCatalogPages()
+    return NextResponse.json({ data })
+  } catch (error) {
+    console.error('Error creating product:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
@@ -1,13 +1,14 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
 import { v4 as uuidv4 } from 'uuid'
+import { cached, invalidate } from '@/lib/cache'
+import { refreshPromotionIndex } from '@/lib/promotionIndex'
+import { withServerTiming } from '@/lib/serverTiming'
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
+const PROMOTIONS_CACHE_KEY = 'promotions:all'
+const PROMOTIONS_TTL_MS = 60 * 1000
 
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
-
-export async function POST(request) {
+export const POST = withServerTiming(async function POST(request) {
   try {
     const { name, description, discount_percentage, discount_amount, code, start_date, end_date, active } = await request.json()
 
@@ -32,29 +33,35 @@ export async function POST(request) {
       .single()
 
     if (error) throw error
+    invalidate(PROMOTIONS_CACHE_KEY)
+    refreshPromotionIndex()
     return NextResponse.json({ data })
   } catch (error) {
     console.error('Create promotion error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function GET(request) {
+export const GET = withServerTiming(async function GET(request) {
   try {
-    const { data, error } = await supabaseAdmin
-      .from('promotions')
-      .select('*')
-      .order('created_at', { ascending: false })
+    const data = await cached(PROMOTIONS_CACHE_KEY, PROMOTIONS_TTL_MS, async () => {
+      const { data, error } = await supabaseAdmin
+        .from('promotions')
+        .select('*')
+        .order('created_at', { ascending: false })
+
+      if (error) throw error
+      return data
+    })
 
-    if (error) throw error
     return NextResponse.json({ data })
   } catch (error) {
     console.error('Get promotions error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function PUT(request) {
+export const PUT = withServerTiming(async function PUT(request) {
   try {
     const { id, name, description, discount_percentage, discount_amount, code, start_date, end_date, active } = await request.json()
 
@@ -80,14 +87,16 @@ export async function PUT(request) {
       .single()
 
     if (error) throw error
+    invalidate(PROMOTIONS_CACHE_KEY)
+    refreshPromotionIndex()
     return NextResponse.json({ data })
   } catch (error) {
     console.error('Update promotion error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function DELETE(request) {
+export const DELETE = withServerTiming(async function DELETE(request) {
   try {
     const { searchParams } = new URL(request.url)
     const promo_id = searchParams.get('id')
@@ -102,9 +111,11 @@ export async function DELETE(request) {
       .eq('id', promo_id)
 
     if (error) throw error
+    invalidate(PROMOTIONS_CACHE_KEY)
+    refreshPromotionIndex()
     return NextResponse.json({ success: true })
   } catch (error) {
     console.error('Delete promotion error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
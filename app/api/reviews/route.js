@@ -1,40 +1,48 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
-
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
-
-export async function GET(request) {
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { decodeCursor, parseLimit } from '@/lib/keyset'
+import { MAX_REVIEWS_PAGE_SIZE, REVIEWS_PAGE_SIZE, getReviewPage, invalidateReviews } from '@/lib/reviewCache'
+import { revalidateProductPage } from '@/lib/catalogPages'
+import { withServerTiming } from '@/lib/serverTiming'
+
+// A product's reviews, newest first, one page at a time. Pass next_cursor
+// back as ?cursor= for the following page. Counts and the average come from
+// GET /api/reviews/summary rather than from the list.
+export const GET = withServerTiming(async function GET(request) {
   try {
     const { searchParams } = new URL(request.url)
     const productId = searchParams.get('product_id')
+    const limit = parseLimit(searchParams.get('limit'), REVIEWS_PAGE_SIZE, MAX_REVIEWS_PAGE_SIZE)
+    const cursorParam = searchParams.get('cursor')
 
     if (!productId) {
       return NextResponse.json({ error: 'Product ID required' }, { status: 400 })
     }
 
-    const { data, error } = await supabaseAdmin
-      .from('reviews')
-      .select('*, users(name, email)')
-      .eq('product_id', productId)
-      .order('created_at', { ascending: false })
+    const cursor = cursorParam ? decodeCursor(cursorParam) : null
+    if (cursorParam && !cursor) {
+      return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 })
+    }
 
-    if (error) throw error
-    return NextResponse.json({ data: data || [] })
+    const page = await getReviewPage(supabaseAdmin, productId, { limit, cursor })
+
+    return NextResponse.json(page)
   } catch (error) {
     console.error('Error fetching reviews:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function POST(request) {
+export const POST = withServerTiming(async function POST(request) {
   try {
     const { product_id, user_id, rating, review_text } = await request.json()
 
     if (!product_id || !user_id || !rating || !review_text) {
       return NextResponse.json({ error: 'All fields required' }, { status: 400 })
     }
+    if (!Number.isInteger(rating) || rating < 1 || rating > 5) {
+      return NextResponse.json({ error: 'Rating must be between 1 and 5' }, { status: 400 })
+    }
 
     const { data, error } = await supabaseAdmin
       .from('reviews')
@@ -42,10 +50,13 @@ export async function POST(request) {
       .select()
       .single()
 
+    // The reviews trigger has already added the rating to the product's summary
     if (error) throw error
+    invalidateReviews(product_id)
+    revalidateProductPage(product_id)
     return NextResponse.json({ data })
   } catch (error) {
     console.error('Error creating review:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
\ No newline at end of file
+})
\ No newline at end of file
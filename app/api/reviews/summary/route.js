@@ -0,0 +1,23 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { getRatingSummary } from '@/lib/reviewCache'
+import { withServerTiming } from '@/lib/serverTiming'
+
+// Rating count, average and 1-5 histogram for one product, read from the
+// summary row the reviews trigger keeps up to date
+export const GET = withServerTiming(async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const productId = searchParams.get('product_id')
+
+    if (!productId) {
+      return NextResponse.json({ error: 'Product ID required' }, { status: 400 })
+    }
+
+    const data = await getRatingSummary(supabaseAdmin, productId)
+    return NextResponse.json({ data })
+  } catch (error) {
+    console.error('Error fetching rating summary:', error)
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+})
@@ -1,11 +1,8 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { withServerTiming } from '@/lib/serverTiming'
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
-
-export async function GET(request) {
+export const GET = withServerTiming(async function GET(request) {
   try {
     const { searchParams } = new URL(request.url)
     const userId = searchParams.get('user_id')
@@ -26,9 +23,9 @@ export async function GET(request) {
     console.error('Error fetching cards:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function POST(request) {
+export const POST = withServerTiming(async function POST(request) {
   try {
     const { user_id, card_type, card_number, card_holder, expiry_date } = await request.json()
 
@@ -60,9 +57,9 @@ export async function POST(request) {
     console.error('Error saving card:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function DELETE(request) {
+export const DELETE = withServerTiming(async function DELETE(request) {
   try {
     const { searchParams } = new URL(request.url)
     const cardId = searchParams.get('id')
@@ -82,4 +79,4 @@ export async function DELETE(request) {
     console.error('Error deleting card:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
\ No newline at end of file
+})
\ No newline at end of file
@@ -1,17 +1,8 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { withServerTiming } from '@/lib/serverTiming'
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
-
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey, {
-  auth: {
-    autoRefreshToken: false,
-    persistSession: false
-  }
-})
-
-export async function POST(request) {
+export const POST = withServerTiming(async function POST(request) {
   try {
     // Try to create admin user
     let userId = null
@@ -68,9 +59,9 @@ export async function POST(request) {
     console.error('Setup admin error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function GET(request) {
+export const GET = withServerTiming(async function GET(request) {
   try {
     // Check admin user status
     const { data: users } = await supabaseAdmin.auth.admin.listUsers()
@@ -95,4 +86,4 @@ export async function GET(request) {
     console.error('Check admin error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
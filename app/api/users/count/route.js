@@ -1,12 +1,7 @@
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { withServerTiming } from '@/lib/serverTiming'
 
-// Admin client with service role key to bypass RLS
-const supabaseAdmin = createClient(
-  process.env.NEXT_PUBLIC_SUPABASE_URL,
-  process.env.SUPABASE_SERVICE_ROLE_KEY
-)
-
-export async function GET() {
+export const GET = withServerTiming(async function GET() {
   try {
     // Use admin client to get accurate count bypassing RLS
     const { count, error } = await supabaseAdmin
@@ -23,4 +18,4 @@ export async function GET() {
     console.error('Error in users count API:', error)
     return Response.json({ error: 'Internal server error' }, { status: 500 })
   }
-}
\ No newline at end of file
+})
\ No newline at end of file
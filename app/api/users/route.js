@@ -1,59 +1,95 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+import { applyKeyset, decodeCursor, keysetPage, orderForKeyset, parseLimit } from '@/lib/keyset'
+import { isColumnError } from '@/lib/schemaCapabilities'
+import { withServerTiming } from '@/lib/serverTiming'
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
+const USER_COLUMNS = 'id, email, role, created_at, name, phone'
+const BASIC_COLUMNS = 'id, email, role, created_at'
+const DEFAULT_LIMIT = 50
+const MAX_LIMIT = 200
 
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
+// Keyset orderings: [column, ascending, nullable]; id breaks ties in the same direction
+const SORTS = {
+  'name': ['name', true, true],
+  'newest': ['created_at', false, false],
+  'oldest': ['created_at', true, false]
+}
+
+// Email prefix, stripped of PostgREST filter characters and the % and *
+// wildcards; _ is escaped so it matches only a literal underscore
+function cleanPrefix(term) {
+  return (term || '').replace(/[,()*%"\\\s]/g, '').replace(/_/g, '\\_').toLowerCase()
+}
+
+function buildQuery(columns, { search, includeAdmins, sort, cursor, limit, withCount }) {
+  const [column, ascending, nullable] = SORTS[sort]
+
+  let query = supabaseAdmin
+    .from('users')
+    .select(columns, withCount ? { count: 'exact' } : {})
+
+  if (!includeAdmins) {
+    query = query.neq('role', 'admin').not('email', 'ilike', 'admin@*')
+  }
+  if (search) {
+    query = query.ilike('email', `${search}*`)
+  }
+
+  query = applyKeyset(query, column, ascending, cursor, { nullable })
+  return orderForKeyset(query, column, ascending, limit)
+}
 
-export async function GET(request) {
+// Paginated user listing with filtering, sorting and search done in one
+// database query. A schema without name/phone falls back to newest-first
+// every time, so cursors stay consistent across pages.
+export const GET = withServerTiming(async function GET(request) {
   try {
-    // Try basic fields first (always exist)
-    const { data: basicData, error: basicError } = await supabaseAdmin
-      .from('users')
-      .select('id, email, role, created_at')
-      .order('created_at', { ascending: false })
-
-    if (basicError) throw basicError
-
-    // Try to get name and phone fields separately
-    let usersWithExtras = basicData
-    
-    try {
-      const { data: extraData, error: extraError } = await supabaseAdmin
-        .from('users')
-        .select('id, name, phone')
-      
-      if (!extraError && extraData) {
-        // Merge the extra data
-        usersWithExtras = basicData.map(user => {
-          const extra = extraData.find(e => e.id === user.id)
-          return {
-            ...user,
-            name: extra?.name || null,
-            phone: extra?.phone || null
-          }
-        })
-      } else {
-        // If columns don't exist, add null values
-        usersWithExtras = basicData.map(user => ({
-          ...user,
-          name: null,
-          phone: null
-        }))
-      }
-    } catch (err) {
-      console.log('Name/phone columns do not exist, using defaults')
-      usersWithExtras = basicData.map(user => ({
-        ...user,
-        name: null,
-        phone: null
-      }))
+    const { searchParams } = new URL(request.url)
+    const search = cleanPrefix(searchParams.get('search'))
+    const includeAdmins = searchParams.get('include_admins') === '1'
+    const requestedSort = SORTS[searchParams.get('sort')] ? searchParams.get('sort') : 'name'
+    const limit = parseLimit(searchParams.get('limit'), DEFAULT_LIMIT, MAX_LIMIT)
+    const cursorParam = searchParams.get('cursor')
+
+    const cursor = cursorParam ? decodeCursor(cursorParam) : null
+    if (cursorParam && !cursor) {
+      return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 })
+    }
+
+    // Exact total only on the first page; later pages reuse the client's copy
+    const options = { search, includeAdmins, sort: requestedSort, cursor, limit, withCount: !cursor }
+
+    let sort = requestedSort
+    let result = await buildQuery(USER_COLUMNS, options)
+
+    if (result.error && isColumnError(result.error)) {
+      console.log('Name/phone columns do not exist, listing by created_at')
+      sort = requestedSort === 'name' ? 'newest' : requestedSort
+      result = await buildQuery(BASIC_COLUMNS, { ...options, sort })
     }
 
-    return NextResponse.json({ data: usersWithExtras || [] })
+    const { data, count, error } = result
+    if (error) throw error
+
+    const [column] = SORTS[sort]
+    const { page, hasMore, nextCursor } = keysetPage(data || [], column, limit)
+
+    const users = page.map(user => ({
+      ...user,
+      name: user.name || null,
+      phone: user.phone || null
+    }))
+
+    return NextResponse.json({
+      data: users,
+      total: cursor ? null : count,
+      sort,
+      has_more: hasMore,
+      next_cursor: nextCursor
+    })
   } catch (error) {
     console.error('Error fetching users:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
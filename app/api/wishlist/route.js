@@ -1,13 +1,11 @@
 import { NextResponse } from 'next/server'
-import { createClient } from '@supabase/supabase-js'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
 import { v4 as uuidv4 } from 'uuid'
+import { fetchProductsById } from '@/lib/lookups'
+import { invalidateUserCounts } from '@/lib/userCounts'
+import { withServerTiming } from '@/lib/serverTiming'
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
-const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY
-
-const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
-
-export async function POST(request) {
+export const POST = withServerTiming(async function POST(request) {
   try {
     const { user_id, product_id } = await request.json()
 
@@ -38,17 +36,19 @@ export async function POST(request) {
       .single()
 
     if (error) throw error
+    invalidateUserCounts(user_id)
     return NextResponse.json({ data })
   } catch (error) {
     console.error('Wishlist error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function GET(request) {
+export const GET = withServerTiming(async function GET(request) {
   try {
     const { searchParams } = new URL(request.url)
     const user_id = searchParams.get('user_id')
+    const expand = searchParams.get('expand')
 
     if (!user_id) {
       return NextResponse.json({ error: 'User ID required' }, { status: 400 })
@@ -60,14 +60,27 @@ export async function GET(request) {
       .eq('user_id', user_id)
 
     if (error) throw error
-    return NextResponse.json({ data })
+
+    if (expand !== 'product') {
+      return NextResponse.json({ data })
+    }
+
+    // expand=product: join product details in one batched lookup
+    const productsById = await fetchProductsById(supabaseAdmin, data || [])
+
+    return NextResponse.json({
+      data: (data || []).map(item => ({
+        ...item,
+        product: productsById[item.product_id] || null
+      }))
+    })
   } catch (error) {
     console.error('Get wishlist error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
 
-export async function DELETE(request) {
+export const DELETE = withServerTiming(async function DELETE(request) {
   try {
     const { searchParams } = new URL(request.url)
     const wishlist_id = searchParams.get('id')
@@ -76,15 +89,17 @@ export async function DELETE(request) {
       return NextResponse.json({ error: 'Wishlist ID required' }, { status: 400 })
     }
 
-    const { error } = await supabaseAdmin
+    const { data, error } = await supabaseAdmin
       .from('wishlist')
       .delete()
       .eq('id', wishlist_id)
+      .select('user_id')
 
     if (error) throw error
+    invalidateUserCounts(...(data || []).map(row => row.user_id))
     return NextResponse.json({ success: true })
   } catch (error) {
     console.error('Delete wishlist error:', error)
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-}
+})
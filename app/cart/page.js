@@ -25,11 +25,10 @@ export default function CartPage() {
 
   const fetchCart = async () => {
     try {
-      const res = await fetch(`/api/cart?user_id=${user.id}`, {
+      const res = await fetch(`/api/cart?user_id=${user.id}&expand=product`, {
         credentials: 'include',
       })
 
-      const contentType = res.headers.get('content-type')
       if (!res.ok) {
         const text = await res.text()
         throw new Error(text || `Server error: ${res.status}`)
@@ -38,20 +37,7 @@ export default function CartPage() {
       const data = await res.json()
 
       if (data.data) {
-        // Fetch product details for each cart item
-        const itemsWithProducts = await Promise.all(
-          data.data.map(async (item) => {
-            const productRes = await fetch(`https://qttglmtiagzuxpttjsoy.supabase.co/rest/v1/products?id=eq.${item.product_id}`, {
-              headers: {
-                'apikey': process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY,
-                'Authorization': `Bearer ${process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY}`
-              }
-            })
-            const products = await productRes.json()
-            return { ...item, product: products[0], quantity: item.qty }
-          })
-        )
-        setCartItems(itemsWithProducts)
+        setCartItems(data.data)
       }
     } catch (error) {
       console.error('Error fetching cart:', error)
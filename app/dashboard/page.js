@@ -14,6 +14,8 @@ import { Package, Clock, CheckCircle, XCircle } from 'lucide-react'
 export default function UserDashboard() {
   const [orders, setOrders] = useState([])
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const { user, loading: userLoading } = useUser()
   const router = useRouter()
 
@@ -25,38 +27,33 @@ export default function UserDashboard() {
     }
   }, [user, userLoading, router])
 
-  const fetchOrders = async () => {
+  const fetchOrders = async (cursor = null) => {
     try {
-      const { data: ordersData, error } = await supabase
-        .from('orders')
-        .select('*')
-        .eq('user_id', user.id)
-        .order('created_at', { ascending: false })
+      const params = new URLSearchParams({ user_id: user.id, view: 'history' })
+      if (cursor) params.set('cursor', cursor)
 
-      if (error) throw error
+      // One page of order lines with their products, joined server-side
+      const response = await fetch(`/api/orders?${params}`)
+      const result = await response.json()
+
+      if (!response.ok) throw new Error(result.error)
 
-      // Fetch product details for each order
-      const ordersWithProducts = await Promise.all(
-        (ordersData || []).map(async (order) => {
-          const { data: product } = await supabase
-            .from('products')
-            .select('name, image_url, category')
-            .eq('id', order.product_id)
-            .single()
-          
-          return { ...order, products: product }
-        })
-      )
-
-      setOrders(ordersWithProducts)
+      setOrders(prev => cursor ? [...prev, ...result.data] : result.data)
+      setNextCursor(result.next_cursor)
     } catch (error) {
       console.error('Error fetching orders:', error)
       toast.error('Failed to load orders')
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
+  const handleLoadMore = () => {
+    setLoadingMore(true)
+    fetchOrders(nextCursor)
+  }
+
   const handleCancelOrder = async (orderId) => {
     try {
       const { error } = await supabase
@@ -68,7 +65,8 @@ export default function UserDashboard() {
       if (error) throw error
 
       toast.success('Order cancelled successfully')
-      fetchOrders()
+      // Update the loaded pages in place rather than reloading the first page
+      setOrders(prev => prev.map(order => order.id === orderId ? { ...order, status: 'cancelled' } : order))
     } catch (error) {
       console.error('Error cancelling order:', error)
       toast.error('Failed to cancel order')
@@ -153,10 +151,10 @@ export default function UserDashboard() {
                     <CardContent className="pt-6">
                       <div className="flex items-start justify-between">
                         <div className="flex space-x-4 flex-1">
-                          {order.products?.image_url ? (
+                          {order.product?.image_url ? (
                             <img
-                              src={order.products.image_url}
-                              alt={order.products.name}
+                              src={order.product.image_url}
+                              alt={order.product.name}
                               className="w-20 h-20 object-cover rounded"
                             />
                           ) : (
@@ -165,7 +163,7 @@ export default function UserDashboard() {
                             </div>
                           )}
                           <div className="flex-1">
-                            <h3 className="font-semibold text-lg">{order.products?.name}</h3>
+                            <h3 className="font-semibold text-lg">{order.product?.name}</h3>
                             <p className="text-sm text-gray-500">Quantity: {order.quantity}</p>
                             <p className="text-lg font-bold text-primary mt-1">
                               ₹{parseFloat(order.total_price).toFixed(2)}
@@ -194,6 +192,17 @@ export default function UserDashboard() {
                     </CardContent>
                   </Card>
                 ))}
+                {nextCursor && (
+                  <Button
+                    id="load-more-orders"
+                    variant="outline"
+                    className="w-full"
+                    onClick={handleLoadMore}
+                    disabled={loadingMore}
+                  >
+                    {loadingMore ? 'Loading...' : 'Load more orders'}
+                  </Button>
+                )}
               </div>
             )}
           </CardContent>
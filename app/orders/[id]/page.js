@@ -24,62 +24,36 @@ export default function OrderSummaryPage({ params }) {
 
   const fetchOrderDetails = async () => {
     try {
-      // Fetch this specific order with product details
-      const orderRes = await fetch(`/api/orders?id=${params.id}`)
-      const orderData = await orderRes.json()
+      // The checkout with its line items, plus the user's recent checkouts
+      const res = await fetch(`/api/orders?group_id=${params.id}&user_id=${user.id}&recent=5`)
+      const data = await res.json()
 
-      if (!orderData.data || orderData.data.length === 0) {
-        throw new Error('Order not found')
+      if (!data.data) {
+        throw new Error(data.error || 'Order not found')
       }
 
-      const currentOrder = orderData.data[0]
-      setOrder(currentOrder)
+      const group = data.data
+      setOrderItems(group.items.map(item => ({
+        product_name: item.product?.name || 'Product',
+        quantity: item.quantity,
+        total: Number(item.total_price) || 0
+      })))
 
-      // Fetch all orders from same timestamp (grouped order) with product details
-      const groupedRes = await fetch(`/api/orders?user_id=${currentOrder.user_id}&created_at=${encodeURIComponent(currentOrder.created_at)}`)
-      const groupedData = await groupedRes.json()
-
-      const groupOrders = groupedData.data || []
-
-      const items = groupOrders.map(ord => ({
-        product_name: ord.product?.name || 'Product',
-        quantity: ord.quantity,
-        total: ord.total_price
-      }))
-      setOrderItems(items)
-
-      const groupTotalAmount = groupOrders.reduce((sum, ord) => sum + (Number(ord.total_price) || 0), 0)
-      const groupAddress = (groupOrders.find(o => o.shipping_address)?.shipping_address) || currentOrder.shipping_address || ''
       setOrder({
-        ...currentOrder,
-        total_amount: groupTotalAmount,
-        payment_method: currentOrder.payment_method || 'N/A',
-        shipping_address: groupAddress
+        ...group,
+        subtotal: Number(group.subtotal) || 0,
+        discount: Number(group.discount) || 0,
+        shipping: Number(group.shipping) || 0,
+        total_amount: Number(group.total_amount) || 0,
+        payment_method: group.payment_method || 'N/A',
+        shipping_address: group.shipping_address || ''
       })
 
-      // Fetch other recent orders and group by created_at to compute totals
-      const otherRes = await fetch(`/api/orders?user_id=${user.id}`)
-      const otherData = await otherRes.json()
-
-      const allUserOrders = otherData.data || []
-
-      const groups = new Map()
-      for (const ord of allUserOrders) {
-        const key = ord.created_at
-        if (!groups.has(key)) {
-          groups.set(key, { ...ord, total_amount: 0 })
-        }
-        const g = groups.get(key)
-        g.total_amount += Number(ord.total_price) || 0
-        groups.set(key, g)
-      }
-
-      const groupedList = Array.from(groups.values())
-        .filter(g => g.created_at !== currentOrder.created_at)
-        .sort((a, b) => new Date(b.created_at) - new Date(a.created_at))
-        .slice(0, 5)
-
-      setOtherOrders(groupedList)
+      setOtherOrders((data.recent || []).map(g => ({
+        ...g,
+        product: g.items[0]?.product || null,
+        total_amount: Number(g.total_amount) || 0
+      })))
     } catch (error) {
       console.error('Error:', error)
     } finally {
@@ -211,11 +185,17 @@ export default function OrderSummaryPage({ params }) {
               <CardContent className="space-y-3">
                 <div className="flex justify-between">
                   <span>Subtotal</span>
-                  <span>₹{order.total_amount?.toFixed(2)}</span>
+                  <span>₹{order.subtotal.toFixed(2)}</span>
                 </div>
+                {order.discount > 0 && (
+                  <div className="flex justify-between">
+                    <span>Discount{order.promo_code ? ` (${order.promo_code})` : ''}</span>
+                    <span className="text-green-600">-₹{order.discount.toFixed(2)}</span>
+                  </div>
+                )}
                 <div className="flex justify-between">
                   <span>Delivery</span>
-                  <span className="text-green-600">Included</span>
+                  <span className="text-green-600">{order.shipping > 0 ? `₹${order.shipping.toFixed(2)}` : 'Included'}</span>
                 </div>
                 <div className="border-t-2 pt-3 flex justify-between text-xl font-bold">
                   <span>Total</span>
@@ -1,6 +1,6 @@
 'use client'
 
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { useRouter } from 'next/navigation'
 import { useUser } from '@/hooks/use-user'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
@@ -33,6 +33,16 @@ export default function PaymentPage() {
   const [pincode, setPincode] = useState('')
   const [shippingCost, setShippingCost] = useState(0)
 
+  // Promo code state; the discount is whatever /api/pricing quoted
+  const [promoCode, setPromoCode] = useState('')
+  const [appliedPromo, setAppliedPromo] = useState(null)
+  const [discount, setDiscount] = useState(0)
+  const [applyingPromo, setApplyingPromo] = useState(false)
+
+  // One Idempotency-Key per checkout attempt, so a double-click or a retried
+  // request cannot place the order twice
+  const checkoutKey = useRef(null)
+
   useEffect(() => {
     if (!userLoading && !user) {
       router.push('/auth/login')
@@ -43,23 +53,11 @@ export default function PaymentPage() {
 
   const fetchCart = async () => {
     try {
-      const res = await fetch(`/api/cart?user_id=${user.id}`)
+      const res = await fetch(`/api/cart?user_id=${user.id}&expand=product`)
       const data = await res.json()
 
       if (data.data) {
-        const itemsWithProducts = await Promise.all(
-          data.data.map(async (item) => {
-            const productRes = await fetch(`https://qttglmtiagzuxpttjsoy.supabase.co/rest/v1/products?id=eq.${item.product_id}`, {
-              headers: {
-                'apikey': process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY,
-                'Authorization': `Bearer ${process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY}`
-              }
-            })
-            const products = await productRes.json()
-            return { ...item, product: products[0], quantity: item.qty || 1 }
-          })
-        )
-        setCartItems(itemsWithProducts)
+        setCartItems(data.data)
       }
     } catch (error) {
       console.error('Error fetching cart:', error)
@@ -94,6 +92,52 @@ export default function PaymentPage() {
     }
   }
 
+  const handleApplyPromo = async () => {
+    if (!promoCode.trim()) {
+      toast.error('Please enter a promo code')
+      return
+    }
+
+    setApplyingPromo(true)
+    try {
+      const res = await fetch(`/api/pricing`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          items: cartItems.map(item => ({ product_id: item.product_id, quantity: item.quantity })),
+          promo_code: promoCode,
+          pincode
+        })
+      })
+      const data = await res.json()
+
+      if (!res.ok) {
+        throw new Error(data.error || 'Failed to apply promo code')
+      }
+      if (data.data.promo_error) {
+        setAppliedPromo(null)
+        setDiscount(0)
+        toast.error(data.data.promo_error)
+        return
+      }
+
+      setAppliedPromo(data.data.promotion)
+      setDiscount(data.data.discount)
+      toast.success(`Promo code applied: -₹${data.data.discount.toFixed(2)}`)
+    } catch (error) {
+      console.error('Error applying promo code:', error)
+      toast.error(error.message || 'Failed to apply promo code')
+    } finally {
+      setApplyingPromo(false)
+    }
+  }
+
+  const handleRemovePromo = () => {
+    setAppliedPromo(null)
+    setDiscount(0)
+    setPromoCode('')
+  }
+
   const validateCard = () => {
     const cleanNumber = cardNumber.replace(/\s/g, '')
 
@@ -185,45 +229,46 @@ export default function PaymentPage() {
     setProcessing(true)
 
     try {
-      // Prepare order items
+      // Prepare order items; the server prices them from the catalog
       const orderItems = cartItems.map(item => ({
         product_id: item.product_id,
-        product_name: item.product?.name,
-        quantity: item.quantity,
-        price: parseFloat(item.product?.price || 0),
-        total: parseFloat(item.product?.price || 0) * item.quantity
+        quantity: item.quantity
       }))
 
-      const totalAmount = parseFloat(calculateTotal())
-
       // Create single order with all items
       const orderData = {
         user_id: user.id,
         items: orderItems,
-        total_amount: totalAmount + shippingCost,
+        promo_code: appliedPromo?.code,
+        pincode,
         payment_method: cardType,
         shipping_address: `${address}, ${city}, ${pincode}`
       }
 
 
+      checkoutKey.current = checkoutKey.current || crypto.randomUUID()
       const res = await fetch(`/api/orders`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': checkoutKey.current },
         body: JSON.stringify(orderData)
       })
 
       if (!res.ok) {
         const errorData = await res.json()
+        // The next attempt may change the order (promo code, address), so it gets a new key
+        checkoutKey.current = null
         throw new Error(errorData.error || 'Failed to create order')
       }
 
       const orderResponse = await res.json()
-      const orderId = orderResponse.data?.id
+      const orderId = orderResponse.order_group_id || orderResponse.data?.id
 
       // Clear cart
-      for (const item of cartItems) {
-        await fetch(`/api/cart?id=${item.id}`, { method: 'DELETE' })
-      }
+      await fetch(`/api/cart/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ user_id: user.id, operations: [{ op: 'clear' }] })
+      })
 
       toast.success('Order placed successfully!')
       router.push(`/orders/${orderId}`)
@@ -452,6 +497,36 @@ export default function PaymentPage() {
                   <span>Subtotal</span>
                   <span id="order-subtotal">₹{calculateTotal()}</span>
                 </div>
+                <div className="flex gap-2">
+                  <Input
+                    id="promo-code-input"
+                    placeholder="Promo code"
+                    value={promoCode}
+                    onChange={(e) => setPromoCode(e.target.value.toUpperCase())}
+                    disabled={!!appliedPromo}
+                    className="border-2"
+                  />
+                  {appliedPromo ? (
+                    <Button id="remove-promo-btn" variant="outline" onClick={handleRemovePromo}>
+                      Remove
+                    </Button>
+                  ) : (
+                    <Button
+                      id="apply-promo-btn"
+                      variant="outline"
+                      onClick={handleApplyPromo}
+                      disabled={applyingPromo || cartItems.length === 0}
+                    >
+                      {applyingPromo ? 'Applying...' : 'Apply'}
+                    </Button>
+                  )}
+                </div>
+                {discount > 0 && (
+                  <div className="flex justify-between text-gray-600">
+                    <span>Discount ({appliedPromo?.code})</span>
+                    <span id="order-discount" className="font-semibold text-green-600">-₹{discount.toFixed(2)}</span>
+                  </div>
+                )}
                 <div className="flex justify-between text-gray-600">
                   <span>Shipping</span>
                   <span id="order-shipping" className="font-semibold text-green-600">₹{shippingCost}</span>
@@ -462,7 +537,7 @@ export default function PaymentPage() {
                 </div>
                 <div className="border-t-2 pt-4 flex justify-between text-2xl font-bold">
                   <span>Total</span>
-                  <span id="order-total">₹{(parseFloat(calculateTotal()) + shippingCost).toFixed(2)}</span>
+                  <span id="order-total">₹{(parseFloat(calculateTotal()) - discount + shippingCost).toFixed(2)}</span>
                 </div>
                 <Button
                   id="place-order-btn"
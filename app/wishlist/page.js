@@ -27,7 +27,7 @@ export default function WishlistPage() {
     setLoading(true)
 
     try {
-      const res = await fetch(`/api/wishlist?user_id=${user.id}`, {
+      const res = await fetch(`/api/wishlist?user_id=${user.id}&expand=product`, {
         credentials: 'include',
       })
 
@@ -37,37 +37,7 @@ export default function WishlistPage() {
 
       const data = await res.json()
 
-      if (!data?.data) {
-        setWishlistItems([])
-        return
-      }
-
-      const itemsWithProducts = await Promise.all(
-        data.data.map(async (item) => {
-          try {
-            const productRes = await fetch(
-              `https://qttglmtiagzuxpttjsoy.supabase.co/rest/v1/products?id=eq.${item.product_id}`,
-              {
-                headers: {
-                  apikey: process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY,
-                  Authorization: `Bearer ${process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY}`,
-                },
-              }
-            )
-
-            const products = await productRes.json()
-
-            return {
-              ...item,
-              product: products?.[0] ?? null,
-            }
-          } catch {
-            return { ...item, product: null }
-          }
-        })
-      )
-
-      setWishlistItems(itemsWithProducts)
+      setWishlistItems(data?.data || [])
     } catch (error) {
       console.error('Wishlist fetch error:', error)
       toast.error('Failed to load wishlist')
@@ -98,13 +68,13 @@ export default function WishlistPage() {
 
   const moveToCart = async (item) => {
     try {
-      const cartRes = await fetch(`/api/cart`, {
+      const cartRes = await fetch(`/api/cart/batch`, {
         method: 'POST',
         credentials: 'include',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
-          product_id: item.product_id,
-          quantity: 1,
+          user_id: user.id,
+          operations: [{ op: 'add', product_id: item.product_id, quantity: 1 }],
         }),
       })
 
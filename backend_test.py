@@ -8,14 +8,11 @@ FOCUS: Only testing the two APIs that were fixed by CRITICAL_FIX.sql:
 2. Cart API (POST /api/cart, PATCH /api/cart) - updated_at trigger fix
 """
 
-import requests
-import json
+import argparse
 import uuid
 from datetime import datetime
 
-# Configuration
-BASE_URL = "https://supashop-3.preview.emergentagent.com/api"
-HEADERS = {"Content-Type": "application/json"}
+from tests.api_client import ShopClient, add_target_arguments
 
 def log_test(test_name, success, details=""):
     """Log test results with timestamp"""
@@ -25,7 +22,7 @@ def log_test(test_name, success, details=""):
     if details:
         print(f"    Details: {details}")
     print()
-def test_orders_api():
+def test_orders_api(client):
     """Test Orders API - POST operation to verify product_id column fix"""
     print("=" * 60)
     print("TESTING ORDERS API - POST /api/orders")
@@ -37,18 +34,13 @@ def test_orders_api():
         test_product_id = str(uuid.uuid4())
         
         # Test data for order creation
-        order_data = {
-            "user_id": test_user_id,
-            "items": [
-                {
-                    "product_id": test_product_id,
-                    "quantity": 2,
-                    "total": 100.00
-                }
-            ],
-            "total_amount": 100.00,
-            "payment_method": "credit_card"
-        }
+        items = [
+            {
+                "product_id": test_product_id,
+                "quantity": 2,
+                "total": 100.00
+            }
+        ]
         
         print(f"Testing order creation with:")
         print(f"  User ID: {test_user_id}")
@@ -58,11 +50,11 @@ def test_orders_api():
         print()
         
         # Make POST request
-        response = requests.post(
-            f"{BASE_URL}/orders",
-            headers=HEADERS,
-            json=order_data,
-            timeout=10
+        response = client.create_order(
+            test_user_id,
+            items,
+            total_amount=100.00,
+            payment_method="credit_card"
         )
         
         print(f"Response Status: {response.status_code}")
@@ -87,7 +79,7 @@ def test_orders_api():
         log_test("Orders API - Order Creation", False, f"Exception: {str(e)}")
         return False
 
-def test_cart_api():
+def test_cart_api(client):
     """Test Cart API - POST and PATCH operations to verify updated_at fix"""
     print("=" * 60)
     print("TESTING CART API - POST and PATCH operations")
@@ -99,24 +91,13 @@ def test_cart_api():
     
     # Test 1: POST - Add item to cart
     try:
-        cart_data = {
-            "user_id": test_user_id,
-            "product_id": test_product_id,
-            "quantity": 1
-        }
-        
         print(f"Testing cart item addition with:")
         print(f"  User ID: {test_user_id}")
         print(f"  Product ID: {test_product_id}")
         print(f"  Quantity: 1")
         print()
         
-        response = requests.post(
-            f"{BASE_URL}/cart",
-            headers=HEADERS,
-            json=cart_data,
-            timeout=10
-        )
+        response = client.add_to_cart(test_user_id, test_product_id, quantity=1)
         
         print(f"POST Response Status: {response.status_code}")
         print(f"POST Response Body: {response.text}")
@@ -144,22 +125,12 @@ def test_cart_api():
     # Test 2: PATCH - Update quantity (only if POST succeeded)
     if post_success and cart_item_id:
         try:
-            update_data = {
-                "id": cart_item_id,
-                "quantity": 3
-            }
-            
             print(f"Testing cart quantity update with:")
             print(f"  Cart Item ID: {cart_item_id}")
             print(f"  New Quantity: 3")
             print()
             
-            response = requests.patch(
-                f"{BASE_URL}/cart",
-                headers=HEADERS,
-                json=update_data,
-                timeout=10
-            )
+            response = client.update_cart_item(cart_item_id, 3)
             
             print(f"PATCH Response Status: {response.status_code}")
             print(f"PATCH Response Body: {response.text}")
@@ -190,20 +161,24 @@ def test_cart_api():
 
 # Removed other test functions - focusing only on Orders and Cart APIs
 
-def main():
+def main(argv=None):
     """Run all critical API tests"""
+    parser = add_target_arguments(argparse.ArgumentParser(description="Orders and cart fix verification"))
+    client = ShopClient.from_args(parser.parse_args(argv), default_target="preview")
+
     print("BACKEND API TESTING - CRITICAL FIX VERIFICATION")
     print("Testing Orders and Cart APIs after CRITICAL_FIX.sql execution")
+    print(f"Backend URL: {client.base_url}")
     print("=" * 80)
     print()
     
     # Test Orders API
-    orders_working = test_orders_api()
+    orders_working = test_orders_api(client)
     
     print("\n" + "=" * 80 + "\n")
     
     # Test Cart API
-    cart_working = test_cart_api()
+    cart_working = test_cart_api(client)
     
     # Final Summary
     print("\n" + "=" * 80)
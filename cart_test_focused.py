@@ -3,15 +3,12 @@
 Focused Cart API Test - Testing with different approaches to verify the updated_at fix
 """
 
-import requests
-import json
+import argparse
 import uuid
-from datetime import datetime
 
-BASE_URL = "https://supashop-3.preview.emergentagent.com/api"
-HEADERS = {"Content-Type": "application/json"}
+from tests.api_client import ShopClient, add_target_arguments
 
-def test_cart_with_existing_user():
+def test_cart_with_existing_user(client):
     """Test Cart API by first creating a user, then testing cart operations"""
     print("=" * 60)
     print("TESTING CART API WITH USER CREATION APPROACH")
@@ -19,20 +16,10 @@ def test_cart_with_existing_user():
     
     # Step 1: Try to register a user first
     test_email = f"carttest_{uuid.uuid4().hex[:8]}@example.com"
-    register_data = {
-        "email": test_email,
-        "password": "testpassword123"
-    }
-    
     print(f"Step 1: Creating user with email: {test_email}")
     
     try:
-        response = requests.post(
-            f"{BASE_URL}/auth/register",
-            headers=HEADERS,
-            json=register_data,
-            timeout=10
-        )
+        response = client.register(test_email, "testpassword123")
         
         print(f"Registration Response Status: {response.status_code}")
         print(f"Registration Response: {response.text}")
@@ -44,7 +31,7 @@ def test_cart_with_existing_user():
                 print(f"✅ User created successfully with ID: {user_id}")
                 
                 # Step 2: Test Cart API with valid user ID
-                return test_cart_operations(user_id)
+                return test_cart_operations(client, user_id)
             else:
                 print(f"❌ User registration failed: {user_data}")
                 return False
@@ -56,7 +43,7 @@ def test_cart_with_existing_user():
         print(f"❌ Exception during user registration: {str(e)}")
         return False
 
-def test_cart_operations(user_id):
+def test_cart_operations(client, user_id):
     """Test cart operations with a valid user ID"""
     print(f"\nStep 2: Testing Cart operations with User ID: {user_id}")
     
@@ -64,23 +51,12 @@ def test_cart_operations(user_id):
     
     # Test 1: POST - Add item to cart
     try:
-        cart_data = {
-            "user_id": user_id,
-            "product_id": test_product_id,
-            "quantity": 1
-        }
-        
         print(f"\nTesting POST /api/cart with:")
         print(f"  User ID: {user_id}")
         print(f"  Product ID: {test_product_id}")
         print(f"  Quantity: 1")
         
-        response = requests.post(
-            f"{BASE_URL}/cart",
-            headers=HEADERS,
-            json=cart_data,
-            timeout=10
-        )
+        response = client.add_to_cart(user_id, test_product_id, quantity=1)
         
         print(f"\nPOST Response Status: {response.status_code}")
         print(f"POST Response Body: {response.text}")
@@ -92,7 +68,7 @@ def test_cart_operations(user_id):
                 print(f"✅ Cart item added successfully. Cart ID: {cart_item_id}")
                 
                 # Test 2: PATCH - Update quantity
-                return test_cart_update(cart_item_id)
+                return test_cart_update(client, cart_item_id)
             else:
                 print(f"❌ No data in POST response: {response_data}")
                 return False
@@ -104,24 +80,14 @@ def test_cart_operations(user_id):
         print(f"❌ Exception during cart POST: {str(e)}")
         return False
 
-def test_cart_update(cart_item_id):
+def test_cart_update(client, cart_item_id):
     """Test cart quantity update (PATCH operation)"""
     print(f"\nStep 3: Testing PATCH /api/cart with Cart ID: {cart_item_id}")
     
     try:
-        update_data = {
-            "id": cart_item_id,
-            "quantity": 3
-        }
-        
         print(f"Updating quantity to: 3")
         
-        response = requests.patch(
-            f"{BASE_URL}/cart",
-            headers=HEADERS,
-            json=update_data,
-            timeout=10
-        )
+        response = client.update_cart_item(cart_item_id, 3)
         
         print(f"\nPATCH Response Status: {response.status_code}")
         print(f"PATCH Response Body: {response.text}")
@@ -143,13 +109,17 @@ def test_cart_update(cart_item_id):
         print(f"❌ Exception during cart PATCH: {str(e)}")
         return False
 
-def main():
+def main(argv=None):
     """Run focused cart API test"""
+    parser = add_target_arguments(argparse.ArgumentParser(description="Focused cart API test"))
+    client = ShopClient.from_args(parser.parse_args(argv), default_target="preview")
+
     print("FOCUSED CART API TEST - VERIFYING UPDATED_AT FIX")
+    print(f"Backend URL: {client.base_url}")
     print("=" * 80)
     print()
     
-    success = test_cart_with_existing_user()
+    success = test_cart_with_existing_user(client)
     
     print("\n" + "=" * 80)
     print("CART API TEST RESULTS")
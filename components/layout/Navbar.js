@@ -27,19 +27,12 @@ export default function Navbar() {
 
   const fetchCounts = async () => {
     try {
-      const [cartRes, wishlistRes] = await Promise.all([
-        fetch(`/api/cart?user_id=${user.id}`),
-        fetch(`/api/wishlist?user_id=${user.id}`)
-      ])
+      const response = await fetch(`/api/me/counts?user_id=${user.id}`)
 
-      if (cartRes.ok) {
-        const cartData = await cartRes.json()
-        setCartCount(cartData.data?.length || 0)
-      }
-
-      if (wishlistRes.ok) {
-        const wishlistData = await wishlistRes.json()
-        setWishlistCount(wishlistData.data?.length || 0)
+      if (response.ok) {
+        const { data } = await response.json()
+        setCartCount(data?.cart || 0)
+        setWishlistCount(data?.wishlist || 0)
       }
     } catch (error) {
       console.error('Error fetching counts:', error)
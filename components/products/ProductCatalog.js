@@ -0,0 +1,402 @@
+'use client'
+
+import { useState, useEffect, useRef, Suspense } from 'react'
+import { useSearchParams } from 'next/navigation'
+import Link from 'next/link'
+import { Card, CardContent, CardFooter } from '@/components/ui/card'
+import { Badge } from '@/components/ui/badge'
+import { Button } from '@/components/ui/button'
+import { Input } from '@/components/ui/input'
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select'
+import { ShoppingCart, Heart } from 'lucide-react'
+import { toast } from 'sonner'
+import { useUser } from '@/hooks/use-user'
+
+// Keeps the search box in step with ?search= (the Navbar search links here).
+// useSearchParams() opts its Suspense boundary out of pre-rendering, so it
+// lives in its own empty component instead of around the catalog.
+function SearchParamSync({ onSearch }) {
+  const searchParams = useSearchParams()
+  const searchQuery = searchParams.get('search') || ''
+
+  useEffect(() => {
+    if (searchQuery) {
+      onSearch(searchQuery)
+    }
+  }, [searchQuery])
+
+  return null
+}
+
+// The /products page. `initialPage` is the first page for the default
+// filters, rendered on the server; without it (or once the filters change)
+// pages are fetched from /api/products.
+export default function ProductCatalog({ initialPage = null }) {
+  const [products, setProducts] = useState(initialPage?.data || [])
+  const [loading, setLoading] = useState(!initialPage)
+  const [searchTerm, setSearchTerm] = useState('')
+  const [debouncedSearch, setDebouncedSearch] = useState('')
+  const [selectedCategory, setSelectedCategory] = useState('all')
+  const [priceRange, setPriceRange] = useState([0, ''])
+  const [sortBy, setSortBy] = useState('name')
+  const [categories, setCategories] = useState(initialPage?.facets?.categories.map(c => c.category) || [])
+  const [totalProducts, setTotalProducts] = useState(initialPage?.facets?.total || 0)
+  // Keyset pagination: cursors[i] fetches page i + 1, nextCursor fetches the page after
+  const [cursors, setCursors] = useState([null])
+  const [nextCursor, setNextCursor] = useState(initialPage?.next_cursor || null)
+  const currentPage = cursors.length
+  const productsPerPage = 8
+  // The server already rendered the default filters' first page
+  const skipInitialFetch = useRef(Boolean(initialPage))
+  const { user } = useUser()
+
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedSearch(searchTerm), 300)
+    return () => clearTimeout(timer)
+  }, [searchTerm])
+
+  useEffect(() => {
+    if (skipInitialFetch.current) {
+      skipInitialFetch.current = false
+      return
+    }
+    // Filters changed - start again from the first page
+    setCursors([null])
+    fetchProducts(null)
+  }, [debouncedSearch, selectedCategory, priceRange, sortBy])
+
+  const fetchProducts = async (cursor) => {
+    try {
+      const params = new URLSearchParams({
+        sort: sortBy,
+        limit: String(productsPerPage),
+        min_price: String(priceRange[0] || 0)
+      })
+      if (debouncedSearch) params.set('search', debouncedSearch)
+      if (selectedCategory !== 'all') params.set('category', selectedCategory)
+      if (priceRange[1] !== '') params.set('max_price', String(priceRange[1]))
+      if (cursor) params.set('cursor', cursor)
+      // Facets only change with the filters, not while paging
+      if (cursor) params.set('facets', '0')
+
+      const res = await fetch(`/api/products?${params}`)
+      const result = await res.json()
+
+      if (!res.ok) throw new Error(result.error || 'Failed to fetch products')
+
+      setProducts(result.data || [])
+      setNextCursor(result.next_cursor)
+
+      if (result.facets) {
+        setTotalProducts(result.facets.total)
+        setCategories(result.facets.categories.map(c => c.category))
+      }
+    } catch (error) {
+      console.error('Error fetching products:', error)
+    } finally {
+      setLoading(false)
+    }
+  }
+
+  const goToNextPage = () => {
+    if (!nextCursor) return
+    setCursors(prev => [...prev, nextCursor])
+    fetchProducts(nextCursor)
+    window.scrollTo({ top: 0, behavior: 'smooth' })
+  }
+
+  const goToPreviousPage = () => {
+    if (cursors.length <= 1) return
+    const previous = cursors.slice(0, -1)
+    setCursors(previous)
+    fetchProducts(previous[previous.length - 1])
+    window.scrollTo({ top: 0, behavior: 'smooth' })
+  }
+
+  const totalPages = Math.max(1, Math.ceil(totalProducts / productsPerPage))
+
+  const addToCart = async (productId) => {
+    if (!user) {
+      toast.error('Please login to add items to cart')
+      return
+    }
+
+    try {
+      // First, check if item already exists in cart
+      const checkRes = await fetch(`/api/me/counts?user_id=${user.id}&product_id=${productId}`)
+      const checkData = await checkRes.json()
+
+      if (checkRes.ok && checkData.data) {
+        if (checkData.data.in_cart) {
+          // Item already in cart, show warning
+          toast.warning('This item is already in your cart!', {
+            description: 'You can update the quantity from the cart page.'
+          })
+          return
+        }
+      }
+
+      // Item not in cart, proceed to add
+      const res = await fetch(`/api/cart`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          user_id: user.id,
+          product_id: productId,
+          quantity: 1
+        })
+      })
+
+      if (res.ok) {
+        toast.success('Added to cart!')
+        // Refresh page to update cart count
+        window.location.reload()
+      } else {
+        const data = await res.json()
+        toast.error(data.error || 'Failed to add to cart')
+      }
+    } catch (error) {
+      console.error('Error adding to cart:', error)
+      toast.error('Failed to add to cart')
+    }
+  }
+
+  const addToWishlist = async (productId) => {
+    if (!user) {
+      toast.error('Please login to add items to wishlist')
+      return
+    }
+
+    try {
+      const res = await fetch(`/api/wishlist`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          user_id: user.id,
+          product_id: productId
+        })
+      })
+
+      if (res.ok) {
+        toast.success('Added to wishlist!')
+      } else {
+        const data = await res.json()
+        toast.info(data.message || 'Already in wishlist')
+      }
+    } catch (error) {
+      console.error('Error adding to wishlist:', error)
+      toast.error('Failed to add to wishlist')
+    }
+  }
+
+  if (loading) {
+    return (
+      <div className="min-h-screen flex items-center justify-center bg-gray-50">
+        <div id="loading-spinner" className="animate-spin rounded-full h-12 w-12 border-b-2 border-black"></div>
+      </div>
+    )
+  }
+
+  return (
+    <div className="min-h-screen bg-gray-50">
+      <Suspense fallback={null}>
+        <SearchParamSync onSearch={setSearchTerm} />
+      </Suspense>
+      <div className="container mx-auto px-4 py-8">
+        <h1 id="products-title" className="text-4xl font-bold text-black mb-8">All Products</h1>
+
+        {/* Filters */}
+        <Card id="filters-card" className="mb-6 border-2">
+          <CardContent className="pt-6">
+            <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
+              {/* Search */}
+              <Input
+                id="search-input"
+                placeholder="Search products..."
+                value={searchTerm}
+                onChange={(e) => setSearchTerm(e.target.value)}
+                className="border-2"
+              />
+
+              {/* Category Filter */}
+              <Select id="category-filter" value={selectedCategory} onValueChange={setSelectedCategory}>
+                <SelectTrigger id="category-filter-trigger" className="category-filter-dropdown border-2">
+                  <SelectValue placeholder="Category" />
+                </SelectTrigger>
+                <SelectContent id="category-filter-content">
+                  <SelectItem value="all">All Categories</SelectItem>
+                  {categories.map((cat) => (
+                    <SelectItem key={cat} value={cat}>{cat}</SelectItem>
+                  ))}
+                </SelectContent>
+              </Select>
+
+              {/* Sort */}
+              <Select id="sort-filter" value={sortBy} onValueChange={setSortBy}>
+                <SelectTrigger id="sort-filter-trigger" className="sort-filter-dropdown border-2">
+                  <SelectValue placeholder="Sort by" />
+                </SelectTrigger>
+                <SelectContent id="sort-filter-content">
+                  <SelectItem value="name">Name</SelectItem>
+                  <SelectItem value="price-low">Price: Low to High</SelectItem>
+                  <SelectItem value="price-high">Price: High to Low</SelectItem>
+                </SelectContent>
+              </Select>
+
+              {/* Clear Filters Button */}
+              <Button
+                id="clear-filters-btn"
+                className="clear-filters-button bg-gray-200 text-black hover:bg-gray-300"
+                onClick={() => {
+                  setSelectedCategory('all')
+                  setSortBy('name')
+                  setPriceRange([0, ''])
+                  setSearchTerm('')
+                }}
+              >
+                Clear Filters
+              </Button>
+
+              {/* Price Range Editable */}
+              <div className="flex flex-col gap-2">
+                <label className="text-xs font-medium">Price Range</label>
+                <div className="flex gap-2">
+                  <Input
+                    type="number"
+                    placeholder="Min"
+                    value={priceRange[0]}
+                    onChange={(e) => setPriceRange([parseInt(e.target.value) || 0, priceRange[1]])}
+                    className="border-2 w-20"
+                  />
+                  <span className="self-center">-</span>
+                  <Input
+                    type="number"
+                    placeholder="Max"
+                    value={priceRange[1]}
+                    onChange={(e) => setPriceRange([priceRange[0], e.target.value === '' ? '' : parseInt(e.target.value) || 0])}
+                    className="border-2 w-20"
+                  />
+                </div>
+              </div>
+            </div>
+            {searchTerm && (
+              <div className="mt-4">
+                <p className="text-sm text-gray-600">
+                  Showing results for: <span className="font-semibold">"{searchTerm}"</span>
+                  <Button
+                    variant="link"
+                    onClick={() => setSearchTerm('')}
+                    className="ml-2 text-black"
+                  >
+                    Clear search
+                  </Button>
+                </p>
+              </div>
+            )}
+          </CardContent>
+        </Card>
+
+        {/* Products Grid */}
+        {products.length === 0 ? (
+          <div id="no-products" className="text-center py-16">
+            <p className="text-gray-500 text-lg">No products found.</p>
+            {searchTerm && (
+              <Button
+                onClick={() => setSearchTerm('')}
+                className="mt-4 bg-black text-white hover:bg-gray-800"
+              >
+                Clear filters
+              </Button>
+            )}
+          </div>
+        ) : (
+          <>
+            <div id="products-grid" className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
+              {products
+                .map((product, index) => (
+                  <Card key={product.id} id={`product-card-${index}`} className="border-2 hover:border-black transition-all group">
+                    <div className="relative">
+                      {product.image_url ? (
+                        <img
+                          src={product.image_url.split(',')[0]}
+                          alt={product.name}
+                          className="w-full h-64 object-cover"
+                        />
+                      ) : (
+                        <div className="w-full h-64 bg-gray-200 flex items-center justify-center">
+                          <ShoppingCart className="h-16 w-16 text-gray-400" />
+                        </div>
+                      )}
+
+                      {/* Wishlist Button */}
+                      <Button
+                        id={`wishlist-btn-${index}`}
+                        onClick={() => addToWishlist(product.id)}
+                        variant="ghost"
+                        size="icon"
+                        className="absolute top-2 right-2 bg-white hover:bg-gray-100 shadow-lg opacity-0 group-hover:opacity-100 transition-opacity"
+                      >
+                        <Heart className="h-5 w-5" />
+                      </Button>
+                    </div>
+
+                    <CardContent className="pt-4">
+                      <Badge id={`product-category-${index}`} className="product-category-badge mb-2 bg-black text-white">{product.category}</Badge>
+                      <h3 id={`product-title-${index}`} className="product-title font-bold text-lg mb-2 line-clamp-2">{product.name}</h3>
+                      <p id={`product-description-${index}`} className="product-description text-sm text-gray-600 mb-3 line-clamp-2">{product.description}</p>
+                      <p id={`product-price-${index}`} className="product-price text-2xl font-bold">₹{parseFloat(product.price).toFixed(2)}</p>
+                    </CardContent>
+
+                    <CardFooter className="flex gap-2">
+                      <Button
+                        id={`add-cart-btn-${index}`}
+                        onClick={() => addToCart(product.id)}
+                        className="flex-1 bg-black text-white hover:bg-gray-800"
+                      >
+                        <ShoppingCart className="h-4 w-4 mr-2" />
+                        Add to Cart
+                      </Button>
+                      <Link href={`/products/${product.id}`} target="_blank" rel="noopener noreferrer" className="flex-1">
+                        <Button id={`view-btn-${index}`} variant="outline" className="w-full border-2">
+                          View
+                        </Button>
+                      </Link>
+                    </CardFooter>
+                  </Card>
+                ))}
+            </div>
+
+            {/* Pagination */}
+            {(currentPage > 1 || nextCursor) && (
+              <div className="flex justify-center items-center gap-2 mt-8">
+                <Button
+                  id="prev-page-btn"
+                  onClick={goToPreviousPage}
+                  disabled={currentPage === 1}
+                  variant="outline"
+                  className="border-2"
+                >
+                  Previous
+                </Button>
+
+                <span id="page-indicator" className="px-4 text-sm text-gray-600">
+                  Page {currentPage} of {totalPages}
+                </span>
+
+                <Button
+                  id="next-page-btn"
+                  onClick={goToNextPage}
+                  disabled={!nextCursor}
+                  variant="outline"
+                  className="border-2"
+                >
+                  Next
+                </Button>
+              </div>
+            )}
+          </>
+        )}
+      </div>
+    </div>
+  )
+}
@@ -4,13 +4,14 @@ Comprehensive Backend API Testing - Critical Issues Analysis
 Focus on the three recently fixed APIs with detailed error analysis
 """
 
-import requests
-import json
+import argparse
 import uuid
 from datetime import datetime
 
-# Configuration
-BASE_URL = "https://supashop-3.preview.emergentagent.com/api"
+import requests
+
+from tests.api_client import ShopClient, add_target_arguments
+
 TEST_USER_ID = "eecfbc52-7245-48a0-a6bb-d1129dfae60e"
 TEST_PRODUCT_ID = "868f777a-a525-4cc3-a4a1-86e0b813495e"
 
@@ -31,7 +32,7 @@ def print_test_result(test_name, success, details="", critical=False):
         print(f"   Details: {details}")
     print()
 
-def test_orders_api_comprehensive():
+def test_orders_api_comprehensive(client):
     """Comprehensive Orders API Testing"""
     print_section("ORDERS API - CRITICAL ISSUE ANALYSIS")
     
@@ -41,20 +42,15 @@ def test_orders_api_comprehensive():
     
     # Test 1: Original API format (what the code expects)
     print("Test 1: Original API format with items array...")
-    order_data = {
-        "user_id": TEST_USER_ID,
-        "items": [
-            {
-                "product_id": TEST_PRODUCT_ID,
-                "quantity": 2,
-                "total": 50.00
-            }
-        ],
-        "total_amount": 50.00,
-        "payment_method": "credit_card"
-    }
+    items = [
+        {
+            "product_id": TEST_PRODUCT_ID,
+            "quantity": 2,
+            "total": 50.00
+        }
+    ]
     
-    response = requests.post(f"{BASE_URL}/orders", json=order_data, timeout=10)
+    response = client.create_order(TEST_USER_ID, items, total_amount=50.00, payment_method="credit_card")
     success = response.status_code == 200
     error_msg = response.text if not success else "Order created successfully"
     print_test_result("Order Creation (Items Array)", success, error_msg, critical=True)
@@ -68,14 +64,14 @@ def test_orders_api_comprehensive():
         "status": "pending"
     }
     
-    response = requests.post(f"{BASE_URL}/orders", json=direct_order, timeout=10)
+    response = client.post("/orders", json=direct_order)
     success = response.status_code == 200
     error_msg = response.text if not success else "Direct order created successfully"
     print_test_result("Order Creation (Direct)", success, error_msg, critical=True)
     
     # Test 3: Get orders (should work)
     print("Test 3: Get user orders...")
-    response = requests.get(f"{BASE_URL}/orders", params={"user_id": TEST_USER_ID}, timeout=10)
+    response = client.get_orders(TEST_USER_ID)
     success = response.status_code == 200
     if success:
         result = response.json()
@@ -85,7 +81,7 @@ def test_orders_api_comprehensive():
         details = response.text
     print_test_result("Get User Orders", success, details)
 
-def test_cart_api_comprehensive():
+def test_cart_api_comprehensive(client):
     """Comprehensive Cart API Testing"""
     print_section("CART API - CRITICAL ISSUE ANALYSIS")
     
@@ -95,7 +91,7 @@ def test_cart_api_comprehensive():
     
     # First get existing cart items
     print("Getting existing cart items...")
-    response = requests.get(f"{BASE_URL}/cart", params={"user_id": TEST_USER_ID}, timeout=10)
+    response = client.get_cart(TEST_USER_ID)
     if response.status_code == 200:
         result = response.json()
         cart_items = result.get('data', [])
@@ -108,12 +104,7 @@ def test_cart_api_comprehensive():
             
             # Test PATCH operation (the critical fix)
             print("\nTest 1: Update cart quantity (CRITICAL FIX)...")
-            update_data = {
-                "id": cart_id,
-                "quantity": current_qty + 1
-            }
-            
-            response = requests.patch(f"{BASE_URL}/cart", json=update_data, timeout=10)
+            response = client.update_cart_item(cart_id, current_qty + 1)
             success = response.status_code == 200
             if success:
                 result = response.json()
@@ -127,13 +118,7 @@ def test_cart_api_comprehensive():
     
     # Test 2: Add new item to cart
     print("Test 2: Add new item to cart...")
-    cart_data = {
-        "user_id": TEST_USER_ID,
-        "product_id": TEST_PRODUCT_ID,
-        "quantity": 1
-    }
-    
-    response = requests.post(f"{BASE_URL}/cart", json=cart_data, timeout=10)
+    response = client.add_to_cart(TEST_USER_ID, TEST_PRODUCT_ID, quantity=1)
     success = response.status_code == 200
     if success:
         result = response.json()
@@ -183,19 +168,14 @@ def test_search_functionality():
     
     print_test_result("Products Access for Search", success, details)
 
-def test_authentication_api():
+def test_authentication_api(client):
     """Test Authentication API"""
     print_section("AUTHENTICATION API - WORKING FEATURES")
     
     # Test user registration
     print("Test: User Registration...")
     test_email = f"test_{uuid.uuid4().hex[:8]}@example.com"
-    register_data = {
-        "email": test_email,
-        "password": "testpassword123"
-    }
-    
-    response = requests.post(f"{BASE_URL}/auth/register", json=register_data, timeout=10)
+    response = client.register(test_email, "testpassword123")
     success = response.status_code == 200
     if success:
         result = response.json()
@@ -209,13 +189,13 @@ def test_authentication_api():
     
     print_test_result("User Registration", success, details)
 
-def test_admin_apis():
+def test_admin_apis(client):
     """Test Admin APIs"""
     print_section("ADMIN APIs - WORKING FEATURES")
     
     # Test users count
     print("Test: Get Users Count...")
-    response = requests.get(f"{BASE_URL}/users/count", timeout=10)
+    response = client.users_count()
     success = response.status_code == 200
     if success:
         result = response.json()
@@ -226,18 +206,13 @@ def test_admin_apis():
     
     print_test_result("Get Users Count", success, details)
 
-def test_wishlist_api():
+def test_wishlist_api(client):
     """Test Wishlist API"""
     print_section("WISHLIST API - WORKING FEATURES")
     
     # Test add to wishlist
     print("Test: Add to Wishlist...")
-    wishlist_data = {
-        "user_id": TEST_USER_ID,
-        "product_id": TEST_PRODUCT_ID
-    }
-    
-    response = requests.post(f"{BASE_URL}/wishlist", json=wishlist_data, timeout=10)
+    response = client.add_to_wishlist(TEST_USER_ID, TEST_PRODUCT_ID)
     success = response.status_code == 200
     if success:
         result = response.json()
@@ -249,7 +224,7 @@ def test_wishlist_api():
     
     # Test get wishlist
     print("Test: Get Wishlist Items...")
-    response = requests.get(f"{BASE_URL}/wishlist", params={"user_id": TEST_USER_ID}, timeout=10)
+    response = client.get_wishlist(TEST_USER_ID)
     success = response.status_code == 200
     if success:
         result = response.json()
@@ -260,25 +235,28 @@ def test_wishlist_api():
     
     print_test_result("Get Wishlist Items", success, details)
 
-def main():
+def main(argv=None):
     """Run comprehensive backend testing"""
+    parser = add_target_arguments(argparse.ArgumentParser(description="Comprehensive backend API test"))
+    client = ShopClient.from_args(parser.parse_args(argv), default_target="preview")
+
     print("🚀 COMPREHENSIVE BACKEND API TESTING")
     print("=" * 60)
-    print(f"Backend URL: {BASE_URL}")
+    print(f"Backend URL: {client.base_url}")
     print(f"Test User ID: {TEST_USER_ID}")
     print(f"Test Product ID: {TEST_PRODUCT_ID}")
     print(f"Test Time: {datetime.now().isoformat()}")
     print("=" * 60)
     
     # Test the three critical recently-fixed APIs first
-    test_orders_api_comprehensive()
-    test_cart_api_comprehensive()
+    test_orders_api_comprehensive(client)
+    test_cart_api_comprehensive(client)
     test_search_functionality()
     
     # Test working APIs
-    test_authentication_api()
-    test_admin_apis()
-    test_wishlist_api()
+    test_authentication_api(client)
+    test_admin_apis(client)
+    test_wishlist_api(client)
     
     print_section("FINAL SUMMARY")
     print("🔴 CRITICAL ISSUES FOUND:")
@@ -0,0 +1,7 @@
+// Runs once when the Next.js server starts
+export async function register() {
+  if (process.env.NEXT_RUNTIME === 'nodejs' && process.env.SUPABASE_WARMUP !== '0') {
+    const { warmUpSupabase } = await import('./lib/supabaseAdmin')
+    await warmUpSupabase()
+  }
+}
@@ -0,0 +1,96 @@
+// In-process read-through cache for hot GET route handlers.
+//
+// Entries live for a per-call TTL in a bounded LRU (a Map kept in recency
+// order). Concurrent misses on one key share a single load, and writes drop
+// keys explicitly through invalidate()/invalidatePrefix(). Each server
+// process has its own cache, so TTLs bound staleness across instances.
+
+const MAX_ENTRIES = parseInt(process.env.ROUTE_CACHE_MAX_ENTRIES) || 1000
+
+const entries = new Map()
+const inflight = new Map()
+
+const counters = {
+  hits: 0,
+  misses: 0,
+  coalesced: 0,
+  evictions: 0,
+  expirations: 0,
+  invalidations: 0
+}
+
+function store(key, value, ttlMs) {
+  entries.delete(key)
+  entries.set(key, { value, expiresAt: Date.now() + ttlMs })
+
+  while (entries.size > MAX_ENTRIES) {
+    entries.delete(entries.keys().next().value)
+    counters.evictions++
+  }
+}
+
+// Return the cached value for `key`, or run `load()` once and cache what it
+// resolves to. Rejections are passed to every waiter and never cached.
+export async function cached(key, ttlMs, load) {
+  const entry = entries.get(key)
+  if (entry) {
+    if (entry.expiresAt > Date.now()) {
+      entries.delete(key)
+      entries.set(key, entry)
+      counters.hits++
+      return entry.value
+    }
+    entries.delete(key)
+    counters.expirations++
+  }
+
+  const pending = inflight.get(key)
+  if (pending) {
+    counters.coalesced++
+    return pending
+  }
+
+  counters.misses++
+  // load() starts on a later tick, so the in-flight marker is set before it
+  // runs - a loader that throws synchronously rejects like an async one
+  const promise = Promise.resolve()
+    .then(load)
+    .then((value) => {
+      // An invalidation while loading removes the in-flight marker; the
+      // result may predate the write, so hand it back without caching it
+      if (inflight.get(key) === promise) store(key, value, ttlMs)
+      return value
+    })
+    .finally(() => {
+      if (inflight.get(key) === promise) inflight.delete(key)
+    })
+  inflight.set(key, promise)
+  return promise
+}
+
+export function invalidate(...keys) {
+  for (const key of keys) {
+    if (entries.delete(key)) counters.invalidations++
+    inflight.delete(key)
+  }
+}
+
+export function invalidatePrefix(prefix) {
+  for (const key of [...entries.keys()]) {
+    if (key.startsWith(prefix)) invalidate(key)
+  }
+  for (const key of [...inflight.keys()]) {
+    if (key.startsWith(prefix)) inflight.delete(key)
+  }
+}
+
+export function cacheStats() {
+  const lookups = counters.hits + counters.misses + counters.coalesced
+  return {
+    ...counters,
+    hit_rate: lookups ? (counters.hits + counters.coalesced) / lookups : 0,
+    size: entries.size,
+    max_entries: MAX_ENTRIES,
+    inflight: inflight.size
+  }
+}
@@ -0,0 +1,17 @@
+import { revalidatePath } from 'next/cache'
+
+// /products and /products/[id] are pre-rendered and regenerated in the
+// background at most every few minutes (see their `revalidate`). Writes
+// regenerate them on demand so nobody waits out the interval.
+
+// Any catalog write: the listing, and every detail page, since the product
+// can appear in other products' suggestions
+export function revalidateCatalogPages() {
+  revalidatePath('/products')
+  revalidatePath('/products/[id]', 'page')
+}
+
+// A write that only shows on one product's page, e.g. a new review
+export function revalidateProductPage(id) {
+  revalidatePath(`/products/${id}`)
+}
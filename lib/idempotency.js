@@ -0,0 +1,200 @@
+import { createHash } from 'node:crypto'
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabaseAdmin'
+
+// Idempotency-Key support for POST handlers that create rows.
+//
+// A request carrying `Idempotency-Key: <key>` runs the handler once; repeats
+// of the same key on the same route within IDEMPOTENCY_TTL_SECONDS get the
+// stored first response back, marked `Idempotent-Replayed: true`. A repeat
+// that arrives while the first is still running waits for it when both hit
+// the same process, and gets 409 otherwise. Reusing a key with a different
+// body is a 422. 5xx responses and thrown errors are not stored, so the
+// client can retry them under the same key.
+//
+// Keys live in a bounded in-process store by default. Set
+// IDEMPOTENCY_STORE=database to keep them in the idempotency_keys table
+// (see supabase/migrations) so repeats are caught across server processes.
+
+export const IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+const TTL_MS = (parseInt(process.env.IDEMPOTENCY_TTL_SECONDS) || 24 * 60 * 60) * 1000
+const MAX_ENTRIES = parseInt(process.env.IDEMPOTENCY_MAX_ENTRIES) || 10000
+const MAX_KEY_LENGTH = 255
+const STORED_HEADERS = ['content-type']
+
+// Memory store: a Map in insertion order. Every entry gets the same TTL, so
+// the oldest entries are also the first to expire and eviction only ever
+// looks at the front.
+const entries = new Map()
+
+function evictExpired(now) {
+  for (const [id, entry] of entries) {
+    if (entry.expiresAt > now) break
+    entries.delete(id)
+  }
+}
+
+const memoryStore = {
+  async claim(id, fingerprint) {
+    const now = Date.now()
+    evictExpired(now)
+
+    const existing = entries.get(id)
+    if (existing) return existing
+
+    let settle
+    const done = new Promise(resolve => { settle = resolve })
+    entries.set(id, { fingerprint, response: null, done, settle, expiresAt: now + TTL_MS })
+    while (entries.size > MAX_ENTRIES) {
+      entries.delete(entries.keys().next().value)
+    }
+    return null
+  },
+
+  async complete(id, response) {
+    const entry = entries.get(id)
+    if (!entry) return
+    entry.response = response
+    entry.settle()
+  },
+
+  async release(id) {
+    const entry = entries.get(id)
+    entries.delete(id)
+    entry?.settle()
+  }
+}
+
+const databaseStore = {
+  async claim(id, fingerprint) {
+    const now = new Date()
+    const { data, error } = await supabaseAdmin
+      .from('idempotency_keys')
+      .upsert(
+        [{ id, fingerprint, expires_at: new Date(now.getTime() + TTL_MS).toISOString() }],
+        { onConflict: 'id', ignoreDuplicates: true }
+      )
+      .select('id')
+
+    if (error) throw error
+    if (data?.length) return null
+
+    const { data: existing, error: readError } = await supabaseAdmin
+      .from('idempotency_keys')
+      .select('fingerprint, response, expires_at')
+      .eq('id', id)
+      .maybeSingle()
+
+    if (readError) throw readError
+
+    // Released or expired since the insert lost: clear it and claim again
+    if (!existing || Date.parse(existing.expires_at) <= now.getTime()) {
+      const { error: deleteError } = await supabaseAdmin
+        .from('idempotency_keys')
+        .delete()
+        .eq('id', id)
+        .lte('expires_at', now.toISOString())
+
+      if (deleteError) throw deleteError
+      return this.claim(id, fingerprint)
+    }
+    return { fingerprint: existing.fingerprint, response: existing.response }
+  },
+
+  async complete(id, response) {
+    const { error } = await supabaseAdmin
+      .from('idempotency_keys')
+      .update({ response })
+      .eq('id', id)
+
+    if (error) throw error
+  },
+
+  async release(id) {
+    const { error } = await supabaseAdmin
+      .from('idempotency_keys')
+      .delete()
+      .eq('id', id)
+
+    if (error) throw error
+  }
+}
+
+function getStore() {
+  return process.env.IDEMPOTENCY_STORE === 'database' ? databaseStore : memoryStore
+}
+
+function replay(stored) {
+  return new NextResponse(stored.body, {
+    status: stored.status,
+    headers: { ...stored.headers, 'Idempotent-Replayed': 'true' }
+  })
+}
+
+async function snapshot(response) {
+  const headers = {}
+  for (const name of STORED_HEADERS) {
+    const value = response.headers.get(name)
+    if (value) headers[name] = value
+  }
+  return { status: response.status, headers, body: await response.clone().text() }
+}
+
+// Wrap a POST handler so requests with an Idempotency-Key header run at most
+// once per key. `scope` keeps keys of different routes apart.
+export function withIdempotency(scope, handler) {
+  return async function idempotentHandler(request, ...rest) {
+    const key = request.headers.get(IDEMPOTENCY_HEADER)
+    if (!key) return handler(request, ...rest)
+
+    if (key.length > MAX_KEY_LENGTH) {
+      return NextResponse.json({ error: 'Idempotency-Key is too long' }, { status: 400 })
+    }
+
+    const id = `${scope}:${key}`
+    const fingerprint = createHash('sha256')
+      .update(`${request.method} ${new URL(request.url).pathname}\n`)
+      .update(await request.clone().text())
+      .digest('hex')
+    const store = getStore()
+
+    let existing = await store.claim(id, fingerprint)
+    // A repeat of a request still running in this process waits for it
+    if (existing?.done && !existing.response && existing.fingerprint === fingerprint) {
+      await existing.done
+      existing = await store.claim(id, fingerprint)
+    }
+
+    if (existing) {
+      if (existing.fingerprint !== fingerprint) {
+        return NextResponse.json(
+          { error: 'Idempotency-Key was already used for a different request' },
+          { status: 422 }
+        )
+      }
+      if (!existing.response) {
+        return NextResponse.json(
+          { error: 'A request with this Idempotency-Key is still being processed' },
+          { status: 409 }
+        )
+      }
+      return replay(existing.response)
+    }
+
+    let response
+    try {
+      response = await handler(request, ...rest)
+    } catch (error) {
+      await store.release(id)
+      throw error
+    }
+
+    if (response.status >= 500) {
+      await store.release(id)
+    } else {
+      await store.complete(id, await snapshot(response))
+    }
+    return response
+  }
+}
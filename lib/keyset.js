@@ -0,0 +1,62 @@
+// Keyset (cursor) pagination helpers shared by the listing endpoints.
+// A cursor is the (sort value, id) of the last row of the previous page.
+
+export function encodeCursor(row, column) {
+  return Buffer.from(JSON.stringify([row[column], row.id])).toString('base64url')
+}
+
+export function decodeCursor(cursor) {
+  try {
+    const [value, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'))
+    return id ? { value, id } : null
+  } catch {
+    return null
+  }
+}
+
+// Quote a value for use inside a PostgREST or=(...) filter
+export function quoteFilterValue(value) {
+  if (typeof value === 'number') return String(value)
+  return `"${String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"')}"`
+}
+
+// Rows strictly after `cursor` for ORDER BY column, id (both in the same direction).
+// Pass nullable for columns that may hold NULL; they sort the Postgres way,
+// last when ascending and first when descending.
+export function applyKeyset(query, column, ascending, cursor, { nullable = false } = {}) {
+  if (!cursor) return query
+  const op = ascending ? 'gt' : 'lt'
+  const id = quoteFilterValue(cursor.id)
+
+  if (nullable && cursor.value === null) {
+    const tied = `and(${column}.is.null,id.${op}.${id})`
+    return query.or(ascending ? tied : `${tied},${column}.not.is.null`)
+  }
+
+  const value = quoteFilterValue(cursor.value)
+  const after = `${column}.${op}.${value},and(${column}.eq.${value},id.${op}.${id})`
+  return query.or(nullable && ascending ? `${after},${column}.is.null` : after)
+}
+
+// Order by (column, id) and fetch one extra row to learn whether another page exists
+export function orderForKeyset(query, column, ascending, limit) {
+  return query
+    .order(column, { ascending })
+    .order('id', { ascending })
+    .limit(limit + 1)
+}
+
+// Split the over-fetched rows into { page, hasMore, nextCursor }
+export function keysetPage(rows, column, limit) {
+  const hasMore = rows.length > limit
+  const page = hasMore ? rows.slice(0, limit) : rows
+  return {
+    page,
+    hasMore,
+    nextCursor: hasMore ? encodeCursor(page[page.length - 1], column) : null
+  }
+}
+
+export function parseLimit(value, fallback, max) {
+  return Math.min(Math.max(parseInt(value) || fallback, 1), max)
+}
@@ -0,0 +1,28 @@
+export const PRODUCT_SUMMARY_COLUMNS = 'id, name, price, image_url, category'
+
+// One batched `.in('id', ids)` lookup, keyed by id
+export async function fetchRowsById(client, table, ids, columns) {
+  const uniqueIds = [...new Set(ids.filter(Boolean))]
+
+  if (uniqueIds.length === 0) {
+    return {}
+  }
+
+  const { data, error } = await client
+    .from(table)
+    .select(columns)
+    .in('id', uniqueIds)
+
+  if (error) throw error
+
+  return Object.fromEntries((data || []).map(row => [row.id, row]))
+}
+
+// Every product referenced by `rows` (via product_id) in one lookup
+export function fetchProductsById(client, rows, columns = PRODUCT_SUMMARY_COLUMNS) {
+  return fetchRowsById(client, 'products', rows.map(r => r.product_id), columns)
+}
+
+export function roundMoney(value) {
+  return Math.round(value * 100) / 100
+}
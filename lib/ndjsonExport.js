@@ -0,0 +1,68 @@
+import { applyKeyset, orderForKeyset } from '@/lib/keyset'
+
+// Streaming NDJSON exports: a table is read in keyset order, one batch per
+// query, and each batch is written out as soon as it arrives. The next batch
+// is requested while the current one is being sent, so at most two batches
+// are held in memory however many rows the table has.
+
+export const EXPORT_BATCH_SIZE = 1000
+export const MAX_EXPORT_BATCH_SIZE = 5000
+
+const encoder = new TextEncoder()
+
+// `buildQuery()` returns a fresh filtered select; pages are ordered by
+// (created_at, id) ascending so rows added during the export land at the end
+export function keysetBatches(buildQuery, batchSize) {
+  return async function loadBatch(cursor) {
+    const query = applyKeyset(buildQuery(), 'created_at', true, cursor)
+    const { data, error } = await orderForKeyset(query, 'created_at', true, batchSize)
+
+    if (error) throw error
+
+    const rows = data || []
+    const hasMore = rows.length > batchSize
+    const page = hasMore ? rows.slice(0, batchSize) : rows
+    const last = page[page.length - 1]
+    return { rows: page, next: hasMore ? { value: last.created_at, id: last.id } : null }
+  }
+}
+
+function encodeBatch(rows) {
+  let text = ''
+  for (const row of rows) text += JSON.stringify(row) + '\n'
+  return encoder.encode(text)
+}
+
+// ReadableStream of the batches `loadBatch(cursor)` yields, starting from an
+// already loaded first batch so query errors surface before the response
+// starts. A failure mid-export errors the stream, which aborts the chunked
+// response instead of ending it cleanly.
+export function ndjsonStream(loadBatch, first) {
+  let current = first
+  let pending = null
+
+  const prefetch = (next) => {
+    if (!next) return null
+    const promise = loadBatch(next)
+    promise.catch(() => {}) // awaited in pull(); this only avoids an unhandled rejection on cancel
+    return promise
+  }
+
+  return new ReadableStream({
+    start() {
+      pending = prefetch(current.next)
+    },
+    async pull(controller) {
+      if (!current) {
+        current = await pending
+        pending = prefetch(current.next)
+      }
+      if (current.rows.length) controller.enqueue(encodeBatch(current.rows))
+      if (!current.next) controller.close()
+      current = null
+    },
+    cancel() {
+      pending = null
+    }
+  }, { highWaterMark: 0 })
+}
@@ -0,0 +1,166 @@
+import { applyKeyset, keysetPage, orderForKeyset } from '@/lib/keyset'
+import { fetchProductsById, roundMoney } from '@/lib/lookups'
+import { getOrderCapabilities } from '@/lib/schemaCapabilities'
+
+// A checkout is one order_groups row plus one orders row per line item
+// (see the order_groups migration). Groups come back as
+// { ...order_groups row, status, items: [{ ...orders row, product }] }.
+export const ORDER_GROUPS_PAGE_SIZE = 10
+export const MAX_ORDER_GROUPS_PAGE_SIZE = 50
+
+const GROUP_COLUMNS = '*, orders(*)'
+const ORDER_PRODUCT_COLUMNS = 'id, name, price, image_url'
+
+// Lines share a status until an admin moves some of them on
+function groupStatus(items) {
+  const statuses = new Set(items.map(item => item.status))
+  return statuses.size === 1 ? items[0].status : 'mixed'
+}
+
+// Attach products to every line of `groups` with one batched lookup
+async function withProducts(client, groups) {
+  const lines = groups.flatMap(group => group.orders || [])
+  const productsById = await fetchProductsById(client, lines, ORDER_PRODUCT_COLUMNS)
+
+  return groups.map(({ orders, ...group }) => {
+    const items = (orders || []).map(order => ({
+      ...order,
+      product: productsById[order.product_id] || null
+    }))
+    return { ...group, status: groupStatus(items), items }
+  })
+}
+
+async function fetchGroup(client, id) {
+  const { data, error } = await client
+    .from('order_groups')
+    .select(GROUP_COLUMNS)
+    .eq('id', id)
+    .maybeSingle()
+
+  if (error) throw error
+  return data
+}
+
+// Databases without the order_groups migration: lines written by the same
+// checkout share user_id and created_at, and the group takes its first line's id
+function legacyGroups(lines) {
+  const groups = new Map()
+  for (const line of lines) {
+    const key = `${line.user_id}|${line.created_at}`
+    if (!groups.has(key)) {
+      groups.set(key, {
+        id: line.id,
+        user_id: line.user_id,
+        created_at: line.created_at,
+        payment_method: line.payment_method || null,
+        shipping_address: line.shipping_address || null,
+        promo_code: null,
+        discount: 0,
+        shipping: 0,
+        orders: []
+      })
+    }
+    groups.get(key).orders.push(line)
+  }
+  return [...groups.values()].map(group => {
+    const total = roundMoney(group.orders.reduce((sum, o) => sum + (Number(o.total_price) || 0), 0))
+    return { ...group, item_count: group.orders.length, subtotal: total, total_amount: total }
+  })
+}
+
+async function legacyOrderGroup(client, id) {
+  const { data: line, error } = await client
+    .from('orders')
+    .select('*')
+    .eq('id', id)
+    .maybeSingle()
+
+  if (error) throw error
+  if (!line) return null
+
+  const { data, error: siblingsError } = await client
+    .from('orders')
+    .select('*')
+    .eq('user_id', line.user_id)
+    .eq('created_at', line.created_at)
+    .order('id', { ascending: true })
+
+  if (siblingsError) throw siblingsError
+  return legacyGroups(data || [line])[0]
+}
+
+// Every line of the user is read and grouped in memory; only reached until
+// the migration is applied
+async function legacyOrderGroupPage(client, userId, limit, cursor) {
+  const { data, error } = await client
+    .from('orders')
+    .select('*')
+    .eq('user_id', userId)
+    .order('created_at', { ascending: false })
+    .order('id', { ascending: true })
+
+  if (error) throw error
+
+  const groups = legacyGroups(data || []).sort((a, b) =>
+    a.created_at === b.created_at ? (a.id < b.id ? 1 : -1) : (a.created_at < b.created_at ? 1 : -1)
+  )
+  // Same keyset rule as applyKeyset on the migrated path: groups strictly
+  // after the cursor, so a cursor whose group is gone still moves forward
+  const after = cursor
+    ? groups.filter(g => g.created_at < cursor.value || (g.created_at === cursor.value && g.id < cursor.id))
+    : groups
+  return keysetPage(after.slice(0, limit + 1), 'created_at', limit)
+}
+
+// One checkout by group id. Links from before order groups carry the id of
+// one of the checkout's lines, which resolves to that line's group.
+export async function getOrderGroup(client, id) {
+  const { orderGroups } = await getOrderCapabilities(client)
+  let group
+
+  if (!orderGroups) {
+    group = await legacyOrderGroup(client, id)
+  } else {
+    group = await fetchGroup(client, id)
+    if (!group) {
+      const { data: line, error } = await client
+        .from('orders')
+        .select('order_group_id')
+        .eq('id', id)
+        .maybeSingle()
+
+      if (error) throw error
+      if (line?.order_group_id) group = await fetchGroup(client, line.order_group_id)
+    }
+  }
+
+  return group ? (await withProducts(client, [group]))[0] : null
+}
+
+// The user's checkouts newest first, `limit` per page, each with its lines
+export async function listOrderGroups(client, userId, { limit = ORDER_GROUPS_PAGE_SIZE, cursor = null } = {}) {
+  const { orderGroups } = await getOrderCapabilities(client)
+  let result
+
+  if (!orderGroups) {
+    result = await legacyOrderGroupPage(client, userId, limit, cursor)
+  } else {
+    let query = client
+      .from('order_groups')
+      .select(GROUP_COLUMNS)
+      .eq('user_id', userId)
+
+    query = applyKeyset(query, 'created_at', false, cursor)
+    const { data, error } = await orderForKeyset(query, 'created_at', false, limit)
+
+    if (error) throw error
+    result = keysetPage(data || [], 'created_at', limit)
+  }
+
+  return {
+    data: await withProducts(client, result.page),
+    has_more: result.hasMore,
+    next_cursor: result.nextCursor
+  }
+}
@@ -0,0 +1,33 @@
+import { applyKeyset, keysetPage, orderForKeyset } from '@/lib/keyset'
+import { fetchProductsById } from '@/lib/lookups'
+
+// The user dashboard's order history: one row per order line, newest first.
+// A page costs two queries however long the history is - the keyset page of
+// lines and one batched lookup of their products.
+export const ORDER_HISTORY_PAGE_SIZE = 20
+export const MAX_ORDER_HISTORY_PAGE_SIZE = 100
+
+const HISTORY_PRODUCT_COLUMNS = 'id, name, price, image_url, category'
+
+export async function listOrderHistory(client, userId, { limit = ORDER_HISTORY_PAGE_SIZE, cursor = null, status = null } = {}) {
+  let query = client
+    .from('orders')
+    .select('*')
+    .eq('user_id', userId)
+
+  if (status) query = query.eq('status', status)
+
+  query = applyKeyset(query, 'created_at', false, cursor)
+  const { data, error } = await orderForKeyset(query, 'created_at', false, limit)
+
+  if (error) throw error
+
+  const { page, hasMore, nextCursor } = keysetPage(data || [], 'created_at', limit)
+  const productsById = await fetchProductsById(client, page, HISTORY_PRODUCT_COLUMNS)
+
+  return {
+    data: page.map(order => ({ ...order, product: productsById[order.product_id] || null })),
+    has_more: hasMore,
+    next_cursor: nextCursor
+  }
+}
@@ -0,0 +1,102 @@
+import { fetchProductsById, roundMoney } from '@/lib/lookups'
+import { getProduct } from '@/lib/productCache'
+import { findPromotion, normalizeCode } from '@/lib/promotionIndex'
+
+export class PricingError extends Error {}
+
+// Same tiers the payment page has always shown
+export function shippingFor(pincode) {
+  const pin = String(pincode || '')
+  if (!/^\d{6}$/.test(pin)) return 0
+  const firstDigit = parseInt(pin[0])
+  if (firstDigit <= 3) return 50 // Metro cities
+  if (firstDigit <= 6) return 80 // Tier 2 cities
+  return 120 // Remote areas
+}
+
+function discountFor(promotion, subtotal) {
+  const percentage = parseFloat(promotion.discount_percentage) || 0
+  const amount = parseFloat(promotion.discount_amount) || 0
+  return roundMoney(Math.min(subtotal, subtotal * percentage / 100 + amount))
+}
+
+// Spread the order discount over the lines in proportion to their totals;
+// the rounding remainder goes to the last line so the lines add up exactly
+function allocateDiscount(lines, discount, subtotal) {
+  let remaining = discount
+  return lines.map((line, i) => {
+    const share = i === lines.length - 1
+      ? remaining
+      : roundMoney(subtotal ? discount * line.line_total / subtotal : 0)
+    remaining = roundMoney(remaining - share)
+    return { ...line, discount: share, total: roundMoney(line.line_total - share) }
+  })
+}
+
+// The rows of `items`' products, read from the database in one lookup
+async function fetchFreshProducts(client, items) {
+  const byId = await fetchProductsById(client, items, 'id, name, price')
+  return items.map(item => byId[item.product_id] || null)
+}
+
+// Price `items` ([{ product_id, quantity }]) from catalog prices, applying
+// `promoCode` and shipping for `pincode`. Product rows and the promotion
+// index come from the in-process caches, so a warm quote makes no
+// database round trips. With `fresh` they are read from the database
+// instead (two queries): checkout charges what it computes, and another
+// process's caches can be minutes behind an admin's price or promotion
+// change. Throws PricingError for unusable items.
+export async function priceItems(client, items, { promoCode, pincode, at = Date.now(), fresh = false } = {}) {
+  if (!Array.isArray(items) || items.length === 0) {
+    throw new PricingError('At least one item is required')
+  }
+  const invalid = items.find(item => !item?.product_id || !Number.isInteger(item.quantity) || item.quantity < 1)
+  if (invalid) {
+    throw new PricingError('Each item needs a product_id and a positive integer quantity')
+  }
+
+  const code = normalizeCode(promoCode)
+  const [products, promo] = await Promise.all([
+    fresh
+      ? fetchFreshProducts(client, items)
+      : Promise.all(items.map(item => getProduct(client, item.product_id))),
+    code ? findPromotion(client, code, at, { fresh }) : null
+  ])
+
+  const missing = items.find((item, i) => !products[i])
+  if (missing) {
+    throw new PricingError(`Unknown product: ${missing.product_id}`)
+  }
+
+  const lines = items.map((item, i) => {
+    const unitPrice = parseFloat(products[i].price) || 0
+    return {
+      product_id: item.product_id,
+      name: products[i].name,
+      unit_price: unitPrice,
+      quantity: item.quantity,
+      line_total: roundMoney(unitPrice * item.quantity)
+    }
+  })
+
+  const subtotal = roundMoney(lines.reduce((sum, line) => sum + line.line_total, 0))
+  const discount = promo?.promotion ? discountFor(promo.promotion, subtotal) : 0
+  const shipping = shippingFor(pincode)
+
+  return {
+    lines: allocateDiscount(lines, discount, subtotal),
+    subtotal,
+    discount,
+    shipping,
+    total: roundMoney(subtotal - discount + shipping),
+    promotion: promo?.promotion
+      ? {
+        code,
+        name: promo.promotion.name,
+        discount_percentage: promo.promotion.discount_percentage,
+        discount_amount: promo.promotion.discount_amount
+      }
+      : null,
+    promo_error: promo?.error || null
+  }
+}
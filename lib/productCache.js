@@ -0,0 +1,69 @@
+import { cached, invalidate, invalidatePrefix } from '@/lib/cache'
+import { getRatingSummary, getReviewPage } from '@/lib/reviewCache'
+
+// Product detail and "suggested products" change only when an admin edits
+// the catalog, so they can be served from the route cache for minutes.
+const PRODUCT_TTL_MS = 5 * 60 * 1000
+const SUGGESTIONS_TTL_MS = 5 * 60 * 1000
+export const SUGGESTIONS_LIMIT = 4
+
+function productKey(id) {
+  return `product:${id}`
+}
+
+function suggestionsKey(id, limit) {
+  return `suggestions:${id}:${limit}`
+}
+
+// Resolves to the product row, or null when it does not exist
+export function getProduct(client, id) {
+  return cached(productKey(id), PRODUCT_TTL_MS, async () => {
+    const { data, error } = await client
+      .from('products')
+      .select('*')
+      .eq('id', id)
+      .maybeSingle()
+
+    if (error) throw error
+    return data
+  })
+}
+
+// Other products from the same category
+export function getSuggestions(client, product, limit = SUGGESTIONS_LIMIT) {
+  return cached(suggestionsKey(product.id, limit), SUGGESTIONS_TTL_MS, async () => {
+    const { data, error } = await client
+      .from('products')
+      .select('*')
+      .eq('category', product.category)
+      .neq('id', product.id)
+      .limit(limit)
+
+    if (error) throw error
+    return data || []
+  })
+}
+
+// Everything the product page shows: { product, suggestions, reviews,
+// rating_summary }, or null when the product does not exist. Reviews and the
+// summary load alongside the product; only the suggestions wait for it, since
+// they depend on its category.
+export async function getProductDetail(client, id) {
+  const productWithSuggestions = getProduct(client, id).then(async product => (
+    [product, product ? await getSuggestions(client, product) : []]
+  ))
+  const [[product, suggestions], reviews, ratingSummary] = await Promise.all([
+    productWithSuggestions,
+    getReviewPage(client, id),
+    getRatingSummary(client, id)
+  ])
+
+  return product ? { product, suggestions, reviews, rating_summary: ratingSummary } : null
+}
+
+// Any catalog write can change another product's suggestions, so every
+// suggestion list goes along with the product itself
+export function invalidateProduct(id) {
+  if (id) invalidate(productKey(id))
+  invalidatePrefix('suggestions:')
+}
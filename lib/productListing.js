@@ -0,0 +1,79 @@
+import { applyKeyset, keysetPage, orderForKeyset } from '@/lib/keyset'
+
+// The storefront catalog query, shared by GET /api/products and the
+// pre-rendered /products page
+export const CATALOG_PAGE_SIZE = 8
+export const MAX_CATALOG_PAGE_SIZE = 100
+
+const LISTING_COLUMNS = 'id, name, description, price, category, image_url, created_at'
+
+// Keyset orderings: [column, ascending]; id breaks ties in the same direction
+export const SORTS = {
+  'name': ['name', true],
+  'price-low': ['price', true],
+  'price-high': ['price', false],
+  'newest': ['created_at', false]
+}
+
+// Drop PostgREST filter characters and the % and * wildcards; escape _ so it
+// matches only a literal underscore, as the users search does
+export function cleanSearch(term) {
+  return (term || '').replace(/[,()*%"\\]/g, ' ').trim().replace(/_/g, '\\_')
+}
+
+// One page of products plus, with `withFacets`, the facet counts for the
+// same filters: { data, has_more, next_cursor, facets }
+export async function listProducts(client, {
+  search = '',
+  category = null,
+  minPrice = null,
+  maxPrice = null,
+  sort = 'name',
+  limit = CATALOG_PAGE_SIZE,
+  cursor = null,
+  withFacets = true
+} = {}) {
+  const [column, ascending] = SORTS[sort] || SORTS.name
+
+  let query = client
+    .from('products')
+    .select(LISTING_COLUMNS)
+
+  if (search) {
+    query = query.or(`name.ilike.*${search}*,description.ilike.*${search}*,category.ilike.*${search}*`)
+  }
+  if (category && category !== 'all') {
+    query = query.eq('category', category)
+  }
+  if (minPrice !== null) {
+    query = query.gte('price', minPrice)
+  }
+  if (maxPrice !== null) {
+    query = query.lte('price', maxPrice)
+  }
+
+  query = orderForKeyset(applyKeyset(query, column, ascending, cursor), column, ascending, limit)
+
+  const facetsQuery = withFacets
+    ? client.rpc('product_facets', {
+        p_search: search || null,
+        p_category: category && category !== 'all' ? category : null,
+        p_min_price: minPrice,
+        p_max_price: maxPrice
+      })
+    : null
+
+  const [listing, facets] = await Promise.all([query, facetsQuery])
+
+  if (listing.error) throw listing.error
+  if (facets?.error) throw facets.error
+
+  const { page, hasMore, nextCursor } = keysetPage(listing.data || [], column, limit)
+
+  return {
+    data: page,
+    has_more: hasMore,
+    next_cursor: nextCursor,
+    facets: facets?.data ?? null
+  }
+}
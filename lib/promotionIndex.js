@@ -0,0 +1,67 @@
+import { cached, invalidate } from '@/lib/cache'
+
+// In-process index of active promotions keyed by upper-cased code, so
+// checkout pricing resolves a promo code with a Map lookup instead of a
+// promotions query. The index is rebuilt on the first lookup after a
+// promotion is created, updated or deleted through /api/promotions, and at
+// least every INDEX_TTL_MS to pick up changes made by other server processes.
+const INDEX_KEY = 'promotions:index'
+const INDEX_TTL_MS = 5 * 60 * 1000
+const DAY_MS = 24 * 60 * 60 * 1000
+
+// The admin form stores dates only, which land as midnight UTC; such an end
+// date means "through that day"
+function endOfRange(value) {
+  if (!value) return Infinity
+  const end = Date.parse(value)
+  return end % DAY_MS === 0 ? end + DAY_MS - 1 : end
+}
+
+export function normalizeCode(code) {
+  return String(code || '').trim().toUpperCase()
+}
+
+async function buildIndex(client) {
+  const { data, error } = await client
+    .from('promotions')
+    .select('*')
+    .eq('active', true)
+    .not('code', 'is', null)
+
+  if (error) throw error
+
+  const index = new Map()
+  for (const promotion of data || []) {
+    const code = normalizeCode(promotion.code)
+    if (!code) continue
+    const entry = {
+      promotion,
+      startsAt: promotion.start_date ? Date.parse(promotion.start_date) : -Infinity,
+      endsAt: endOfRange(promotion.end_date)
+    }
+    index.set(code, [...(index.get(code) || []), entry])
+  }
+  return index
+}
+
+export function getPromotionIndex(client) {
+  return cached(INDEX_KEY, INDEX_TTL_MS, () => buildIndex(client))
+}
+
+// Resolves to { promotion } for a code that applies at `at`, or
+// { error } saying why it does not. `fresh` builds the index from the
+// database instead of using the cached one.
+export async function findPromotion(client, code, at = Date.now(), { fresh = false } = {}) {
+  const index = fresh ? await buildIndex(client) : await getPromotionIndex(client)
+  const entries = index.get(normalizeCode(code))
+  if (!entries) return { error: 'Invalid promo code' }
+
+  const current = entries.find(e => e.startsAt <= at && at <= e.endsAt)
+  if (current) return { promotion: current.promotion }
+  if (entries.every(e => e.startsAt > at)) return { error: 'Promo code is not active yet' }
+  return { error: 'Promo code has expired' }
+}
+
+export function refreshPromotionIndex() {
+  invalidate(INDEX_KEY)
+}
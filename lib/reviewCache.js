@@ -0,0 +1,92 @@
+import { cached, invalidatePrefix } from '@/lib/cache'
+import { applyKeyset, keysetPage, orderForKeyset } from '@/lib/keyset'
+import { isColumnError } from '@/lib/schemaCapabilities'
+
+// Reviews change on every POST /api/reviews, so they are cached briefly and
+// dropped for the product as soon as a review is written.
+const REVIEWS_TTL_MS = 30 * 1000
+export const REVIEWS_PAGE_SIZE = 10
+export const MAX_REVIEWS_PAGE_SIZE = 50
+
+const REVIEW_COLUMNS = '*, users(name, email)'
+
+function reviewsPrefix(productId) {
+  return `reviews:${productId}:`
+}
+
+// One page of the product's reviews, newest first. Only the first page is
+// cached; later pages are addressed by cursor and read straight through.
+export function getReviewPage(client, productId, { limit = REVIEWS_PAGE_SIZE, cursor = null } = {}) {
+  const load = async () => {
+    let query = client
+      .from('reviews')
+      .select(REVIEW_COLUMNS)
+      .eq('product_id', productId)
+
+    query = applyKeyset(query, 'created_at', false, cursor)
+    const { data, error } = await orderForKeyset(query, 'created_at', false, limit)
+
+    if (error) throw error
+    const { page, hasMore, nextCursor } = keysetPage(data || [], 'created_at', limit)
+    return { data: page, has_more: hasMore, next_cursor: nextCursor }
+  }
+
+  if (cursor) return load()
+  return cached(`${reviewsPrefix(productId)}page:${limit}`, REVIEWS_TTL_MS, load)
+}
+
+function toSummary(productId, row) {
+  const histogram = {
+    1: row?.rating_1 || 0,
+    2: row?.rating_2 || 0,
+    3: row?.rating_3 || 0,
+    4: row?.rating_4 || 0,
+    5: row?.rating_5 || 0
+  }
+  const count = row?.rating_count || 0
+  return {
+    product_id: productId,
+    count,
+    average: count ? Math.round((row.rating_total / count) * 100) / 100 : null,
+    histogram
+  }
+}
+
+// Databases without the product_rating_summaries migration: add up the
+// rating column instead
+async function scanRatings(client, productId) {
+  const { data, error } = await client
+    .from('reviews')
+    .select('rating')
+    .eq('product_id', productId)
+
+  if (error) throw error
+
+  const row = { rating_count: 0, rating_total: 0 }
+  for (const { rating } of data || []) {
+    if (!(rating >= 1 && rating <= 5)) continue
+    row[`rating_${rating}`] = (row[`rating_${rating}`] || 0) + 1
+    row.rating_count++
+    row.rating_total += rating
+  }
+  return row
+}
+
+// { product_id, count, average, histogram: { 1: n, ..., 5: n } } from the
+// incrementally maintained product_rating_summaries row
+export function getRatingSummary(client, productId) {
+  return cached(`${reviewsPrefix(productId)}summary`, REVIEWS_TTL_MS, async () => {
+    const { data, error } = await client
+      .from('product_rating_summaries')
+      .select('*')
+      .eq('product_id', productId)
+      .maybeSingle()
+
+    if (error && !isColumnError(error)) throw error
+    return toSummary(productId, error ? await scanRatings(client, productId) : data)
+  })
+}
+
+export function invalidateReviews(productId) {
+  invalidatePrefix(reviewsPrefix(productId))
+}
@@ -0,0 +1,45 @@
+// Per-process cache of optional-column support, probed once instead of
+// discovering it through a failed insert on every request.
+
+const COLUMN_ERROR = /does not exist|column|schema cache/i
+
+let ordersProbe = null
+
+async function probeColumns(client, table, columns) {
+  const { error } = await client
+    .from(table)
+    .select(columns)
+    .limit(0)
+
+  if (error && !COLUMN_ERROR.test(error.message || '')) throw error
+  return !error
+}
+
+async function probeOrders(client) {
+  const [paymentDetails, orderGroups] = await Promise.all([
+    probeColumns(client, 'orders', 'payment_method, shipping_address'),
+    probeColumns(client, 'order_groups', 'id')
+  ])
+  return { paymentDetails, orderGroups }
+}
+
+// Resolves to { paymentDetails, orderGroups } - whether orders has
+// payment_method/shipping_address, and whether the order_groups migration
+// (table, orders.order_group_id and place_order()) is applied
+export function getOrderCapabilities(client, { refresh = false } = {}) {
+  if (refresh || !ordersProbe) {
+    ordersProbe = probeOrders(client).catch(error => {
+      ordersProbe = null
+      throw error
+    })
+  }
+  return ordersProbe
+}
+
+export function refreshSchemaCapabilities() {
+  ordersProbe = null
+}
+
+export function isColumnError(error) {
+  return COLUMN_ERROR.test(error?.message || '')
+}
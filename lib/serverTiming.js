@@ -0,0 +1,129 @@
+import { AsyncLocalStorage } from 'node:async_hooks'
+
+// Per-request Server-Timing for the API routes.
+//
+// withServerTiming() runs a route handler inside its own timing context;
+// timedFetch() wraps the Supabase client's fetch so every call made while
+// that handler runs is added to it. The response then carries e.g.
+//
+//   Server-Timing: db-select;dur=12.4;count=2, db-insert;dur=3.1;count=1,
+//                  db;dur=15.5;count=3, total;dur=19.8
+//
+// One entry per operation (summed duration, `count` calls; auth calls are
+// db-auth), `db` for all Supabase round trips together and `total` for the whole handler. Calls
+// that run in parallel each count their own duration, so `db` can exceed
+// `total`. A cache hit makes no calls and reports db;count=0.
+
+const storage = globalThis.__serverTimingStorage || (globalThis.__serverTimingStorage = new AsyncLocalStorage())
+
+const WRITE_OPERATIONS = { POST: 'insert', PATCH: 'update', PUT: 'upsert', DELETE: 'delete' }
+
+// Server-Timing metric name for one Supabase request
+export function dbOperation(method, url, headers) {
+  const { pathname } = new URL(url)
+  if (pathname.startsWith('/auth/')) return 'db-auth'
+  if (pathname.startsWith('/rest/v1/rpc/')) return 'db-rpc'
+  if (!pathname.startsWith('/rest/v1/')) return 'db-other'
+
+  if (method === 'GET' || method === 'HEAD') return 'db-select'
+  const prefer = new Headers(headers).get('prefer') || ''
+  if (method === 'POST' && prefer.includes('resolution=')) return 'db-upsert'
+  return `db-${WRITE_OPERATIONS[method] || 'other'}`
+}
+
+function record(timing, name, ms) {
+  if (!timing) return
+  const entry = timing.operations.get(name) || { dur: 0, count: 0 }
+  entry.dur += ms
+  entry.count++
+  timing.operations.set(name, entry)
+}
+
+// Pass `body` through chunk by chunk and call `finish` once it has been read
+// to the end, failed or been cancelled
+function timedBody(body, finish) {
+  const reader = body.getReader()
+  return new ReadableStream({
+    async pull(controller) {
+      try {
+        const { done, value } = await reader.read()
+        if (done) {
+          finish()
+          controller.close()
+        } else {
+          controller.enqueue(value)
+        }
+      } catch (error) {
+        finish()
+        controller.error(error)
+      }
+    },
+    cancel(reason) {
+      finish()
+      return reader.cancel(reason)
+    }
+  })
+}
+
+// fetch() wrapper for the Supabase client. A call is recorded once its body
+// has been read through, so the duration covers the whole response; the
+// body is streamed, not buffered, so streaming reads (the NDJSON exports)
+// keep flowing. Bodies still being read when the handler returns are not
+// in its header.
+export function timedFetch(fetchImpl) {
+  return async function fetchWithTiming(input, init = {}) {
+    const url = input instanceof Request ? input.url : String(input)
+    const method = (init.method || 'GET').toUpperCase()
+    const timing = storage.getStore()
+    const start = performance.now()
+    let recorded = false
+    const finish = () => {
+      if (recorded) return
+      recorded = true
+      record(timing, dbOperation(method, url, init.headers), performance.now() - start)
+    }
+
+    let response
+    try {
+      response = await fetchImpl(input, init)
+    } catch (error) {
+      finish()
+      throw error
+    }
+    if (!response.body) {
+      finish()
+      return response
+    }
+    return new Response(timedBody(response.body, finish), {
+      status: response.status,
+      statusText: response.statusText,
+      headers: response.headers
+    })
+  }
+}
+
+export function formatServerTiming(timing) {
+  const parts = []
+  let dur = 0
+  let count = 0
+  for (const [name, entry] of timing.operations) {
+    parts.push(`${name};dur=${entry.dur.toFixed(1)};count=${entry.count}`)
+    dur += entry.dur
+    count += entry.count
+  }
+  parts.push(`db;dur=${dur.toFixed(1)};count=${count}`)
+  parts.push(`total;dur=${(performance.now() - timing.start).toFixed(1)}`)
+  return parts.join(', ')
+}
+
+// Wrap a route handler so its response carries a Server-Timing header
+export function withServerTiming(handler) {
+  return async function timedHandler(...args) {
+    const timing = { start: performance.now(), operations: new Map() }
+    const response = await storage.run(timing, () => handler(...args))
+    if (response?.headers) {
+      response.headers.append('Server-Timing', formatServerTiming(timing))
+    }
+    return response
+  }
+}
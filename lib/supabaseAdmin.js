@@ -1,11 +1,110 @@
+import http from 'node:http'
+import https from 'node:https'
+import { Readable } from 'node:stream'
 import { createClient } from '@supabase/supabase-js'
+import { timedFetch } from './serverTiming'
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
 const supabaseServiceRoleKey = process.env.SUPABASE_SERVICE_ROLE_KEY
 
-export const supabaseAdmin = createClient(supabaseUrl, supabaseServiceRoleKey, {
-  auth: {
-    autoRefreshToken: false,
-    persistSession: false
+// Upper bound on concurrent sockets to Supabase per server process; requests
+// beyond it queue in the agent instead of opening more connections
+const MAX_SOCKETS = parseInt(process.env.SUPABASE_MAX_SOCKETS) || 50
+// Idle keep-alive sockets are closed after this long, before the upstream
+// load balancer drops them underneath us
+const IDLE_TIMEOUT_MS = parseInt(process.env.SUPABASE_IDLE_TIMEOUT_MS) || 30000
+const WARM_CONNECTIONS = parseInt(process.env.SUPABASE_WARM_CONNECTIONS) || 4
+
+const NULL_BODY_STATUSES = [101, 204, 205, 304]
+
+function createAgents() {
+  const options = {
+    keepAlive: true,
+    maxSockets: MAX_SOCKETS,
+    maxFreeSockets: MAX_SOCKETS,
+    timeout: IDLE_TIMEOUT_MS,
+    scheduling: 'lifo'
+  }
+  return { 'http:': new http.Agent(options), 'https:': new https.Agent(options) }
+}
+
+function encodeBody(body) {
+  if (body === undefined || body === null) return null
+  if (typeof body === 'string' || body instanceof URLSearchParams) return Buffer.from(String(body))
+  if (body instanceof ArrayBuffer) return Buffer.from(body)
+  if (ArrayBuffer.isView(body)) return Buffer.from(body.buffer, body.byteOffset, body.byteLength)
+  return undefined
+}
+
+// fetch() over the pooled agents. PostgREST, RPC and auth calls send string
+// bodies; anything else (FormData, Blob, streams) goes to the built-in fetch.
+function createKeepAliveFetch(agents) {
+  return function keepAliveFetch(input, init = {}) {
+    const payload = encodeBody(init.body)
+    if (payload === undefined) return fetch(input, init)
+
+    const url = new URL(input instanceof Request ? input.url : String(input))
+    const method = (init.method || 'GET').toUpperCase()
+    const headers = Object.fromEntries(new Headers(init.headers))
+    if (payload) headers['content-length'] = String(payload.length)
+
+    const transport = url.protocol === 'https:' ? https : http
+
+    return new Promise((resolve, reject) => {
+      const req = transport.request(url, { method, headers, agent: agents[url.protocol], signal: init.signal }, res => {
+        const responseHeaders = new Headers()
+        for (const [name, value] of Object.entries(res.headers)) {
+          for (const item of [].concat(value)) responseHeaders.append(name, item)
+        }
+
+        const empty = method === 'HEAD' || NULL_BODY_STATUSES.includes(res.statusCode)
+        if (empty) res.resume()
+
+        resolve(new Response(empty ? null : Readable.toWeb(res), {
+          status: res.statusCode,
+          statusText: res.statusMessage,
+          headers: responseHeaders
+        }))
+      })
+      req.on('error', reject)
+      req.end(payload || undefined)
+    })
+  }
+}
+
+function createAdminClient() {
+  const agents = createAgents()
+  return createClient(supabaseUrl, supabaseServiceRoleKey, {
+    auth: {
+      autoRefreshToken: false,
+      persistSession: false,
+      detectSessionInUrl: false
+    },
+    global: {
+      fetch: timedFetch(createKeepAliveFetch(agents))
+    }
+  })
+}
+
+// One client (and one socket pool) per server process, shared by every
+// route bundle and kept across dev-server reloads
+export const supabaseAdmin = globalThis.__supabaseAdmin || (globalThis.__supabaseAdmin = createAdminClient())
+
+// Open a few pooled connections before the first request needs them.
+// Failures are logged, never thrown, so a slow database cannot block boot.
+export async function warmUpSupabase(connections = WARM_CONNECTIONS) {
+  const start = Date.now()
+  const results = await Promise.all(Array.from({ length: connections }, () =>
+    supabaseAdmin
+      .from('products')
+      .select('id', { head: true })
+      .limit(1)
+  ))
+
+  const failed = results.find(result => result.error)
+  if (failed) {
+    console.error('Supabase warm-up failed:', failed.error)
+  } else {
+    console.log(`Supabase warm-up: ${connections} connections in ${Date.now() - start}ms`)
   }
-})
+}
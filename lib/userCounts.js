@@ -0,0 +1,47 @@
+import { cached, invalidate } from '@/lib/cache'
+
+// Cart and wishlist badge counts per user, from HEAD count queries (no rows
+// are transferred). Cached briefly and dropped for the user by every cart or
+// wishlist write in this process; other processes catch up within the TTL.
+const COUNTS_TTL_MS = 10 * 1000
+
+function countsKey(userId) {
+  return `counts:${userId}`
+}
+
+async function countRows(client, table, userId) {
+  const { count, error } = await client
+    .from(table)
+    .select('*', { count: 'exact', head: true })
+    .eq('user_id', userId)
+
+  if (error) throw error
+  return count || 0
+}
+
+// Resolves to { cart, wishlist }: the number of cart lines and saved products
+export function getUserCounts(client, userId) {
+  return cached(countsKey(userId), COUNTS_TTL_MS, async () => {
+    const [cart, wishlist] = await Promise.all([
+      countRows(client, 'cart', userId),
+      countRows(client, 'wishlist', userId)
+    ])
+    return { cart, wishlist }
+  })
+}
+
+// Whether `productId` is already in the user's cart, without reading the cart
+export async function isInCart(client, userId, productId) {
+  const { count, error } = await client
+    .from('cart')
+    .select('*', { count: 'exact', head: true })
+    .eq('user_id', userId)
+    .eq('product_id', productId)
+
+  if (error) throw error
+  return count > 0
+}
+
+export function invalidateUserCounts(...userIds) {
+  invalidate(...userIds.filter(Boolean).map(countsKey))
+}
@@ -1,14 +1,10 @@
-
-import requests
+import argparse
 import uuid
-import json
-import time
 
-BASE_URL = "http://localhost:3000/api"
-HEADERS = {"Content-Type": "application/json"}
+from tests.api_client import ShopClient, add_target_arguments
 
-def test_cart():
-    print(f"Testing against {BASE_URL}")
+def test_cart(client):
+    print(f"Testing against {client.base_url}")
     
     user_id = str(uuid.uuid4())
     product_id = str(uuid.uuid4())
@@ -19,11 +15,7 @@ def test_cart():
     # 1. Add to cart
     print("1. Adding to cart...")
     try:
-        res = requests.post(f"{BASE_URL}/cart", json={
-            "user_id": user_id,
-            "product_id": product_id,
-            "quantity": 1
-        }, headers=HEADERS)
+        res = client.add_to_cart(user_id, product_id, quantity=1)
         print(f"Status: {res.status_code}")
         print(f"Response: {res.text}")
         
@@ -39,4 +31,5 @@ def test_cart():
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    test_cart()
+    parser = add_target_arguments(argparse.ArgumentParser(description="Local cart smoke test"))
+    test_cart(ShopClient.from_args(parser.parse_args()))
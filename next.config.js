@@ -5,8 +5,8 @@ const nextConfig = {
     unoptimized: true,
   },
   experimental: {
-    // Remove if not using Server Components
-    serverComponentsExternalPackages: ['mongodb'],
+    // instrumentation.js warms the shared Supabase connection pool on boot
+    instrumentationHook: true,
   },
   webpack(config, { dev }) {
     if (dev) {
@@ -0,0 +1,61 @@
+-- Atomic cart quantity changes
+--
+-- POST /api/cart used to SELECT, DELETE and re-INSERT the row (three round
+-- trips, with a window where the row is missing). These functions do the
+-- same work in one statement keyed on (user_id, product_id).
+
+-- Make sure the column the update trigger writes exists
+alter table public.cart add column if not exists updated_at timestamptz default now();
+
+-- Collapse any duplicate rows left behind by the old check-then-insert path
+with ranked as (
+  select id,
+         user_id,
+         product_id,
+         sum(qty) over (partition by user_id, product_id) as total_qty,
+         row_number() over (partition by user_id, product_id order by created_at) as rn
+  from public.cart
+)
+update public.cart c
+set qty = r.total_qty
+from ranked r
+where c.id = r.id and r.rn = 1 and c.qty <> r.total_qty;
+
+delete from public.cart c
+using (
+  select id,
+         row_number() over (partition by user_id, product_id order by created_at) as rn
+  from public.cart
+) r
+where c.id = r.id and r.rn > 1;
+
+create unique index if not exists cart_user_product_key
+  on public.cart (user_id, product_id);
+
+-- Add p_qty to the user's line for p_product_id, creating it if needed
+create or replace function public.add_to_cart(p_user_id uuid, p_product_id uuid, p_qty integer default 1)
+returns setof public.cart
+language sql
+as $$
+  insert into public.cart (id, user_id, product_id, qty)
+  values (gen_random_uuid(), p_user_id, p_product_id, greatest(coalesce(p_qty, 1), 1))
+  on conflict (user_id, product_id)
+  do update set qty = public.cart.qty + excluded.qty,
+                updated_at = now()
+  returning *;
+$$;
+
+-- Set the quantity of one cart line
+create or replace function public.set_cart_qty(p_id uuid, p_qty integer)
+returns setof public.cart
+language sql
+as $$
+  update public.cart
+  set qty = p_qty,
+      updated_at = now()
+  where id = p_id
+  returning *;
+$$;
+
+grant execute on function public.add_to_cart(uuid, uuid, integer) to service_role;
+grant execute on function public.set_cart_qty(uuid, integer) to service_role;
@@ -0,0 +1,36 @@
+-- Batch cart operations used by POST /api/cart/batch
+--
+-- Each function applies a whole list of line changes in one statement.
+
+-- p_items: [{"product_id": uuid, "qty": int}, ...]
+-- Duplicate product_ids in one batch are summed before the upsert, since
+-- ON CONFLICT cannot touch the same row twice in a single statement.
+create or replace function public.add_to_cart_batch(p_user_id uuid, p_items jsonb)
+returns setof public.cart
+language sql
+as $$
+  insert into public.cart (id, user_id, product_id, qty)
+  select gen_random_uuid(), p_user_id, x.product_id, sum(greatest(coalesce(x.qty, 1), 1))
+  from jsonb_to_recordset(p_items) as x(product_id uuid, qty integer)
+  group by x.product_id
+  on conflict (user_id, product_id)
+  do update set qty = public.cart.qty + excluded.qty,
+                updated_at = now()
+  returning *;
+$$;
+
+-- p_items: [{"id": uuid, "qty": int}, ...], restricted to p_user_id's lines
+create or replace function public.set_cart_qty_batch(p_user_id uuid, p_items jsonb)
+returns setof public.cart
+language sql
+as $$
+  update public.cart c
+  set qty = x.qty,
+      updated_at = now()
+  from jsonb_to_recordset(p_items) as x(id uuid, qty integer)
+  where c.id = x.id and c.user_id = p_user_id
+  returning c.*;
+$$;
+
+grant execute on function public.add_to_cart_batch(uuid, jsonb) to service_role;
+grant execute on function public.set_cart_qty_batch(uuid, jsonb) to service_role;
@@ -0,0 +1,75 @@
+-- Server-side product listing for GET /api/products
+--
+-- Indexes back the keyset orderings (name, price asc/desc, newest) with id
+-- as the tie-breaker, plus trigram indexes for the substring search.
+
+create extension if not exists pg_trgm;
+
+create index if not exists products_name_id_idx on public.products (name, id);
+create index if not exists products_price_id_idx on public.products (price, id);
+create index if not exists products_created_at_id_idx on public.products (created_at desc, id);
+create index if not exists products_category_price_idx on public.products (category, price, id);
+create index if not exists products_name_trgm_idx on public.products using gin (name gin_trgm_ops);
+create index if not exists products_description_trgm_idx on public.products using gin (description gin_trgm_ops);
+create index if not exists products_category_trgm_idx on public.products using gin (category gin_trgm_ops);
+
+-- Facet counts for the listing filters. Each facet ignores its own filter
+-- so the UI can still offer the other categories / price ranges.
+create or replace function public.product_facets(
+  p_search text default null,
+  p_category text default null,
+  p_min_price numeric default null,
+  p_max_price numeric default null,
+  p_price_bounds numeric[] default array[0, 500, 1000, 2500, 5000]
+)
+returns jsonb
+language sql
+stable
+as $$
+  with searched as (
+    select category, price
+    from public.products
+    where p_search is null
+       or name ilike '%' || p_search || '%'
+       or description ilike '%' || p_search || '%'
+       or category ilike '%' || p_search || '%'
+  ),
+  bounds as (
+    select b as lower_bound,
+           lead(b) over (order by b) as upper_bound
+    from unnest(p_price_bounds) as b
+  )
+  select jsonb_build_object(
+    'total', (
+      select count(*) from searched
+      where (p_category is null or category = p_category)
+        and (p_min_price is null or price >= p_min_price)
+        and (p_max_price is null or price <= p_max_price)
+    ),
+    'max_price', (select max(price) from searched),
+    'categories', coalesce((
+      select jsonb_agg(jsonb_build_object('category', category, 'count', n) order by category)
+      from (
+        select category, count(*) as n
+        from searched
+        where (p_min_price is null or price >= p_min_price)
+          and (p_max_price is null or price <= p_max_price)
+        group by category
+      ) c
+    ), '[]'::jsonb),
+    'price_buckets', coalesce((
+      select jsonb_agg(jsonb_build_object('min', lower_bound, 'max', upper_bound, 'count', n) order by lower_bound)
+      from (
+        select b.lower_bound, b.upper_bound, count(s.price) as n
+        from bounds b
+        left join searched s
+          on s.price >= b.lower_bound
+         and (b.upper_bound is null or s.price < b.upper_bound)
+         and (p_category is null or s.category = p_category)
+        group by b.lower_bound, b.upper_bound
+      ) p
+    ), '[]'::jsonb)
+  );
+$$;
+
+grant execute on function public.product_facets(text, text, numeric, numeric, numeric[]) to service_role, anon;
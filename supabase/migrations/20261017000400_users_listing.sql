@@ -0,0 +1,11 @@
+-- Server-side user listing for GET /api/users
+--
+-- Keyset orderings by name and by created_at (id breaks ties; both are
+-- scanned backwards for the descending sort), plus a trigram index so the
+-- email prefix search does not scan the table.
+
+create extension if not exists pg_trgm;
+
+create index if not exists users_name_id_idx on public.users (name, id);
+create index if not exists users_created_at_id_idx on public.users (created_at, id);
+create index if not exists users_email_trgm_idx on public.users using gin (email gin_trgm_ops);
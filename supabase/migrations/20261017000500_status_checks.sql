@@ -0,0 +1,8 @@
+-- Status checks for /api/status, previously kept in a separate MongoDB
+-- collection. The catch-all route now uses the shared Supabase client.
+
+create table if not exists public.status_checks (
+  id uuid primary key default gen_random_uuid(),
+  client_name text not null,
+  "timestamp" timestamptz not null default now()
+);
@@ -0,0 +1,95 @@
+-- Per-product rating summaries, maintained incrementally
+--
+-- The product page used to download every review of a product to show its
+-- average. product_rating_summaries keeps the count, the rating total and a
+-- 1-5 histogram per product; a trigger on reviews adjusts them in the same
+-- transaction as each insert, update or delete, so POST /api/reviews pays one
+-- row update and readers fetch a single row.
+
+create table if not exists public.product_rating_summaries (
+  product_id uuid primary key references public.products (id) on delete cascade,
+  rating_count integer not null default 0,
+  rating_total integer not null default 0,
+  rating_1 integer not null default 0,
+  rating_2 integer not null default 0,
+  rating_3 integer not null default 0,
+  rating_4 integer not null default 0,
+  rating_5 integer not null default 0,
+  updated_at timestamptz not null default now()
+);
+
+-- Add `sign` (1 or -1) reviews of `rating` to the product's summary
+create or replace function public.adjust_rating_summary(p_product_id uuid, p_rating integer, p_sign integer)
+returns void
+language sql
+as $$
+  insert into public.product_rating_summaries as s (
+    product_id, rating_count, rating_total, rating_1, rating_2, rating_3, rating_4, rating_5
+  )
+  values (
+    p_product_id, greatest(p_sign, 0), greatest(p_sign, 0) * p_rating,
+    (p_rating = 1)::int * greatest(p_sign, 0), (p_rating = 2)::int * greatest(p_sign, 0),
+    (p_rating = 3)::int * greatest(p_sign, 0), (p_rating = 4)::int * greatest(p_sign, 0),
+    (p_rating = 5)::int * greatest(p_sign, 0)
+  )
+  on conflict (product_id) do update set
+    rating_count = s.rating_count + p_sign,
+    rating_total = s.rating_total + p_sign * p_rating,
+    rating_1 = s.rating_1 + p_sign * (p_rating = 1)::int,
+    rating_2 = s.rating_2 + p_sign * (p_rating = 2)::int,
+    rating_3 = s.rating_3 + p_sign * (p_rating = 3)::int,
+    rating_4 = s.rating_4 + p_sign * (p_rating = 4)::int,
+    rating_5 = s.rating_5 + p_sign * (p_rating = 5)::int,
+    updated_at = now();
+$$;
+
+create or replace function public.reviews_rating_summary_trigger()
+returns trigger
+language plpgsql
+as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') and old.rating between 1 and 5 then
+    perform public.adjust_rating_summary(old.product_id, old.rating, -1);
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') and new.rating between 1 and 5 then
+    perform public.adjust_rating_summary(new.product_id, new.rating, 1);
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists reviews_rating_summary on public.reviews;
+create trigger reviews_rating_summary
+  after insert or delete or update of rating, product_id on public.reviews
+  for each row execute function public.reviews_rating_summary_trigger();
+
+-- Backfill from the reviews that already exist
+insert into public.product_rating_summaries (
+  product_id, rating_count, rating_total, rating_1, rating_2, rating_3, rating_4, rating_5
+)
+select product_id,
+       count(*),
+       sum(rating),
+       count(*) filter (where rating = 1),
+       count(*) filter (where rating = 2),
+       count(*) filter (where rating = 3),
+       count(*) filter (where rating = 4),
+       count(*) filter (where rating = 5)
+from public.reviews
+where rating between 1 and 5
+group by product_id
+on conflict (product_id) do update set
+  rating_count = excluded.rating_count,
+  rating_total = excluded.rating_total,
+  rating_1 = excluded.rating_1,
+  rating_2 = excluded.rating_2,
+  rating_3 = excluded.rating_3,
+  rating_4 = excluded.rating_4,
+  rating_5 = excluded.rating_5,
+  updated_at = now();
+
+-- Cursor pagination of a product's reviews, newest first
+create index if not exists reviews_product_created_at_id_idx
+  on public.reviews (product_id, created_at desc, id desc);
+
+grant select on public.product_rating_summaries to anon, authenticated, service_role;
@@ -0,0 +1,102 @@
+-- Order groups: one row per checkout
+--
+-- A checkout writes one orders row per line item, and the order page used to
+-- find a checkout's other lines by matching created_at exactly. order_groups
+-- records the checkout itself (totals, promo code, payment and address) and
+-- every line points at it through orders.order_group_id, so a checkout is
+-- one indexed lookup and a user's history pages over order_groups.
+
+alter table public.orders add column if not exists payment_method text;
+alter table public.orders add column if not exists shipping_address text;
+
+create table if not exists public.order_groups (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid references public.users (id) on delete cascade,
+  item_count integer not null default 0,
+  subtotal numeric,
+  discount numeric not null default 0,
+  shipping numeric not null default 0,
+  total_amount numeric,
+  promo_code text,
+  payment_method text,
+  shipping_address text,
+  created_at timestamptz not null default now()
+);
+
+alter table public.orders
+  add column if not exists order_group_id uuid references public.order_groups (id) on delete cascade;
+
+-- Backfill: lines written by the same checkout share user_id and created_at.
+-- Each group takes the id of its first line so existing /orders/<id> links
+-- keep resolving to the whole checkout.
+insert into public.order_groups (
+  id, user_id, item_count, subtotal, total_amount, payment_method, shipping_address, created_at
+)
+select (array_agg(id order by id))[1],
+       user_id,
+       count(*),
+       sum(total_price),
+       sum(total_price),
+       max(payment_method),
+       max(shipping_address),
+       created_at
+from public.orders
+where order_group_id is null
+group by user_id, created_at
+on conflict (id) do nothing;
+
+update public.orders o
+set order_group_id = g.id
+from public.order_groups g
+where o.order_group_id is null
+  and g.user_id is not distinct from o.user_id
+  and g.created_at = o.created_at;
+
+-- A checkout's lines, and a user's checkouts newest first
+create index if not exists orders_order_group_id_idx on public.orders (order_group_id);
+create index if not exists order_groups_user_created_at_id_idx
+  on public.order_groups (user_id, created_at desc, id desc);
+
+-- Insert the group and all of its lines in one transaction.
+-- p_items: [{"product_id": uuid, "quantity": int, "total_price": numeric}, ...]
+create or replace function public.place_order(
+  p_user_id uuid,
+  p_items jsonb,
+  p_subtotal numeric,
+  p_discount numeric,
+  p_shipping numeric,
+  p_total_amount numeric,
+  p_promo_code text default null,
+  p_payment_method text default null,
+  p_shipping_address text default null
+)
+returns setof public.orders
+language plpgsql
+as $$
+declare
+  v_group_id uuid := gen_random_uuid();
+begin
+  insert into public.order_groups (
+    id, user_id, item_count, subtotal, discount, shipping, total_amount,
+    promo_code, payment_method, shipping_address
+  )
+  values (
+    v_group_id, p_user_id, jsonb_array_length(p_items), p_subtotal, p_discount, p_shipping,
+    p_total_amount, p_promo_code, p_payment_method, p_shipping_address
+  );
+
+  return query
+  insert into public.orders (
+    id, user_id, product_id, quantity, total_price, status,
+    payment_method, shipping_address, order_group_id
+  )
+  select gen_random_uuid(), p_user_id, x.product_id, x.quantity, x.total_price, 'pending',
+         p_payment_method, p_shipping_address, v_group_id
+  from jsonb_to_recordset(p_items) as x(product_id uuid, quantity integer, total_price numeric)
+  returning *;
+end;
+$$;
+
+grant select, insert, update, delete on public.order_groups to service_role;
+grant execute on function public.place_order(uuid, jsonb, numeric, numeric, numeric, numeric, text, text, text)
+  to service_role;
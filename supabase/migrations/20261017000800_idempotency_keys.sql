@@ -0,0 +1,21 @@
+-- Idempotency keys for POST /api/orders and POST /api/cart
+--
+-- Used when the app runs with IDEMPOTENCY_STORE=database (lib/idempotency.js),
+-- so a retried request is recognised by whichever server process receives
+-- it. id is "<route scope>:<Idempotency-Key>"; response stays null while the
+-- first request is running and then holds { status, headers, body }.
+
+create table if not exists public.idempotency_keys (
+  id text primary key,
+  fingerprint text not null,
+  response jsonb,
+  created_at timestamptz not null default now(),
+  expires_at timestamptz not null
+);
+
+-- Expired keys are replaced on their next use; this index lets a scheduled
+-- job purge the rest:
+--   delete from public.idempotency_keys where expires_at < now();
+create index if not exists idempotency_keys_expires_at_idx on public.idempotency_keys (expires_at);
+
+grant select, insert, update, delete on public.idempotency_keys to service_role;
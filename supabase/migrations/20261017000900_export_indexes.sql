@@ -0,0 +1,8 @@
+-- Keyset order for the NDJSON exports under /api/admin/export/<table>
+--
+-- Each export batch is "created_at, id after the last row, limit N"; with
+-- this index every batch is a short range scan, so the cost per batch stays
+-- the same from the first row to the millionth. users already has
+-- users_created_at_id_idx from the users listing migration.
+
+create index if not exists orders_created_at_id_idx on public.orders (created_at, id);
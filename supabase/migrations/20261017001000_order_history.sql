@@ -0,0 +1,7 @@
+-- Keyset order for the dashboard's order history (GET /api/orders?view=history)
+--
+-- A page is "this user's lines, created_at desc, id desc, after the cursor,
+-- limit N"; the index serves it as one backwards range scan however long the
+-- user's history is.
+
+create index if not exists orders_user_id_created_at_id_idx on public.orders (user_id, created_at, id);
@@ -0,0 +1,35 @@
+"""
+Shared HTTP client for the shop API
+
+    from tests.api_client import ShopClient, add_target_arguments
+
+    with ShopClient(target="local") as client:
+        response = client.add_to_cart(user_id, product_id, quantity=2)
+        print(response.status_code, response.data, response.elapsed)
+        print(response.server_timing["db"])      # {"dur": 4.2, "count": 2}
+
+    print_server_timing(client.timings.report())
+
+    for row in client.export_rows("orders"):   # streamed NDJSON, one dict at a time
+        ...
+
+The async variant (needs aiohttp) lives in tests.api_client.aio.
+"""
+
+from tests.api_client.config import TARGETS, add_target_arguments, resolve_base_url
+from tests.api_client.endpoints import ApiError, ApiResponse, ShopEndpoints
+from tests.api_client.session import ShopClient
+from tests.api_client.timing import ServerTimingStats, parse_server_timing, print_server_timing
+
+__all__ = [
+    "TARGETS",
+    "ApiError",
+    "ApiResponse",
+    "ShopClient",
+    "ServerTimingStats",
+    "ShopEndpoints",
+    "add_target_arguments",
+    "parse_server_timing",
+    "print_server_timing",
+    "resolve_base_url",
+]
@@ -0,0 +1,107 @@
+"""
+Asynchronous client on aiohttp, for load and concurrency scripts
+
+Same typed methods as ShopClient; each returns a coroutine:
+
+    async with AsyncShopClient(target="local", pool_size=50) as client:
+        response = await client.add_to_cart(user_id, product_id)
+"""
+
+import asyncio
+import time
+
+import aiohttp
+
+from tests.api_client.config import (
+    DEFAULT_BACKOFF,
+    DEFAULT_RETRIES,
+    DEFAULT_TARGET,
+    IDEMPOTENCY_HEADER,
+    IDEMPOTENT_RETRY_STATUSES,
+    RETRY_STATUSES,
+    backoff_delay,
+    resolve_base_url,
+    retry_methods,
+)
+from tests.api_client.endpoints import ApiResponse, ShopEndpoints, registered_user_id, user_fields
+from tests.api_client.timing import ServerTimingStats, endpoint_key
+
+
+class AsyncShopClient(ShopEndpoints):
+    """One aiohttp session with a bounded connection pool and 5xx retries"""
+
+    def __init__(self, base_url=None, *, target=None, default_target=DEFAULT_TARGET,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, timeout=10,
+                 pool_size=100, retry_posts=False, headers=None):
+        self.base_url = resolve_base_url(base_url, target, default_target)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.retry_methods = retry_methods(retry_posts)
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.timings = ServerTimingStats()
+        self.session = None
+
+    @classmethod
+    def from_args(cls, args, default_target=DEFAULT_TARGET, **kwargs):
+        return cls(getattr(args, "base_url", None), target=getattr(args, "target", None),
+                   default_target=default_target, **kwargs)
+
+    async def open(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def register_test_user(self, prefix):
+        return registered_user_id(await self.register(**user_fields(prefix)))
+
+    async def request(self, method, path, params=None, json=None, headers=None):
+        await self.open()
+        url = f"{self.base_url}{path}"
+        keyed = IDEMPOTENCY_HEADER in (headers or {})
+        retryable = keyed or method in self.retry_methods
+        retry_statuses = IDEMPOTENT_RETRY_STATUSES if keyed else RETRY_STATUSES
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self.session.request(method, url, params=params, json=json,
+                                                headers=headers) as response:
+                    text = await response.text()
+                    if not (retryable and response.status in retry_statuses and attempt <= self.retries):
+                        result = ApiResponse(
+                            method=method,
+                            url=str(response.url),
+                            status_code=response.status,
+                            text=text,
+                            headers=dict(response.headers),
+                            elapsed=time.perf_counter() - start,
+                            attempts=attempt,
+                        )
+                        self.timings.add(endpoint_key(method, path), result.server_timing)
+                        return result
+            except aiohttp.ClientConnectorError:
+                # Nothing was sent, so retrying is safe for every method
+                if attempt > self.retries:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if not retryable or attempt > self.retries:
+                    raise
+            await asyncio.sleep(backoff_delay(self.backoff, attempt))
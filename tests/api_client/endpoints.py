@@ -0,0 +1,293 @@
+"""
+Typed wrappers for the shop's /api routes, shared by the sync and async clients
+
+Each method only builds the request and hands it to `self.request()`, so on
+ShopClient it returns an ApiResponse and on AsyncShopClient an awaitable of
+one. register_test_user() is the exception: it returns the new user's id
+(AsyncShopClient overrides it with a coroutine).
+"""
+
+import json
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+from tests.api_client.config import IDEMPOTENCY_HEADER
+from tests.api_client.timing import parse_server_timing
+
+
+class ApiError(Exception):
+    """A non-2xx response, raised by ApiResponse.raise_for_status()"""
+
+    def __init__(self, response):
+        super().__init__(f"{response.method} {response.url} failed ({response.status_code}): {response.text}")
+        self.response = response
+
+
+@dataclass
+class ApiResponse:
+    """Status, body and timing of one API call (after any retries)"""
+
+    method: str
+    url: str
+    status_code: int
+    text: str
+    headers: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    attempts: int = 1
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 300
+
+    def json(self):
+        return json.loads(self.text) if self.text else None
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise ApiError(self)
+        return self
+
+    @property
+    def data(self):
+        """The `data` member most routes wrap their payload in"""
+        try:
+            body = self.json()
+        except ValueError:
+            return None
+        return body.get("data") if isinstance(body, dict) else None
+
+    @property
+    def replayed(self):
+        """True when the server answered a repeated Idempotency-Key with the stored response"""
+        return any(k.lower() == "idempotent-replayed" and v == "true" for k, v in self.headers.items())
+
+    @property
+    def etag(self):
+        return next((v for k, v in self.headers.items() if k.lower() == "etag"), None)
+
+    @property
+    def server_timing(self):
+        """Parsed Server-Timing metrics, e.g. {"db": {"dur": 4.2, "count": 2}}"""
+        header = ", ".join(v for k, v in self.headers.items() if k.lower() == "server-timing")
+        return parse_server_timing(header)
+
+
+def idempotency_headers(key):
+    return {IDEMPOTENCY_HEADER: key} if key else None
+
+
+def user_fields(prefix):
+    """register() arguments for a throwaway `<prefix>_xxxxxxxxxx@example.com` user"""
+    return {
+        "email": f"{prefix}_{uuid.uuid4().hex[:10]}@example.com",
+        "password": "testpassword123",
+        "name": f"{prefix.title()} Test",
+        "phone": "9000000000",
+    }
+
+
+def registered_user_id(response):
+    """The id from a POST /auth/register response; RuntimeError if it failed"""
+    data = response.json()
+    if response.status_code != 200 or not data.get("success"):
+        raise RuntimeError(f"Registration failed ({response.status_code}): {data}")
+    return data["user"]["id"]
+
+
+class ShopEndpoints(ABC):
+    """Route helpers; subclasses implement request(method, path, params, json)"""
+
+    @abstractmethod
+    def request(self, method, path, params=None, json=None, headers=None):
+        """Send one API request; an ApiResponse, or an awaitable of one"""
+
+    def get(self, path, params=None, **kwargs):
+        return self.request("GET", path, params=params, **kwargs)
+
+    def post(self, path, json=None, **kwargs):
+        return self.request("POST", path, json=json, **kwargs)
+
+    def patch(self, path, json=None, **kwargs):
+        return self.request("PATCH", path, json=json, **kwargs)
+
+    def put(self, path, json=None, **kwargs):
+        return self.request("PUT", path, json=json, **kwargs)
+
+    def delete(self, path, params=None, **kwargs):
+        return self.request("DELETE", path, params=params, **kwargs)
+
+    # -- auth -------------------------------------------------------------
+
+    def register(self, email, password, name=None, phone=None):
+        body = {"email": email, "password": password}
+        if name is not None:
+            body["name"] = name
+        if phone is not None:
+            body["phone"] = phone
+        return self.post("/auth/register", json=body)
+
+    def register_test_user(self, prefix):
+        """Register a throwaway user (e.g. so a test starts from an empty cart) and return its id"""
+        return registered_user_id(self.register(**user_fields(prefix)))
+
+    # -- cart -------------------------------------------------------------
+
+    def get_cart(self, user_id, expand=False):
+        params = {"user_id": user_id}
+        if expand:
+            params["expand"] = "product"
+        return self.get("/cart", params=params)
+
+    def add_to_cart(self, user_id, product_id, quantity=1, idempotency_key=None):
+        return self.post("/cart", json={"user_id": user_id, "product_id": product_id, "quantity": quantity},
+                         headers=idempotency_headers(idempotency_key))
+
+    def update_cart_item(self, cart_id, quantity):
+        return self.patch("/cart", json={"id": cart_id, "quantity": quantity})
+
+    def remove_cart_item(self, cart_id):
+        return self.delete("/cart", params={"id": cart_id})
+
+    def cart_batch(self, user_id, operations):
+        return self.post("/cart/batch", json={"user_id": user_id, "operations": operations})
+
+    # -- counts -----------------------------------------------------------
+
+    def get_counts(self, user_id, product_id=None, etag=None):
+        """Cart and wishlist badge counts; with `etag` an unchanged answer is a 304"""
+        params = {"user_id": user_id}
+        if product_id is not None:
+            params["product_id"] = product_id
+        return self.get("/me/counts", params=params, headers={"If-None-Match": etag} if etag else None)
+
+    # -- orders -----------------------------------------------------------
+
+    def create_order(self, user_id, items, total_amount=None, payment_method=None, shipping_address=None,
+                     promo_code=None, pincode=None, idempotency_key=None):
+        # The server prices the items itself; total_amount is informational
+        body = {"user_id": user_id, "items": items}
+        if total_amount is not None:
+            body["total_amount"] = total_amount
+        if promo_code is not None:
+            body["promo_code"] = promo_code
+        if pincode is not None:
+            body["pincode"] = pincode
+        if payment_method is not None:
+            body["payment_method"] = payment_method
+        if shipping_address is not None:
+            body["shipping_address"] = shipping_address
+        return self.post("/orders", json=body, headers=idempotency_headers(idempotency_key))
+
+    def get_orders(self, user_id):
+        return self.get("/orders", params={"user_id": user_id})
+
+    def get_order_group(self, group_id, recent=None, user_id=None):
+        params = {"group_id": group_id}
+        if recent is not None:
+            params["recent"] = recent
+        if user_id is not None:
+            params["user_id"] = user_id
+        return self.get("/orders", params=params)
+
+    def list_order_groups(self, user_id, **params):
+        return self.get("/orders", params={"user_id": user_id, "view": "groups", **params})
+
+    def order_history(self, user_id, **params):
+        return self.get("/orders", params={"user_id": user_id, "view": "history", **params})
+
+    def update_order_status(self, order_id, status):
+        return self.patch("/orders", json={"id": order_id, "status": status})
+
+    def delete_order(self, order_id):
+        return self.delete("/orders", params={"id": order_id})
+
+    # -- wishlist ---------------------------------------------------------
+
+    def get_wishlist(self, user_id, expand=False):
+        params = {"user_id": user_id}
+        if expand:
+            params["expand"] = "product"
+        return self.get("/wishlist", params=params)
+
+    def add_to_wishlist(self, user_id, product_id):
+        return self.post("/wishlist", json={"user_id": user_id, "product_id": product_id})
+
+    def remove_from_wishlist(self, wishlist_id):
+        return self.delete("/wishlist", params={"id": wishlist_id})
+
+    # -- products ---------------------------------------------------------
+
+    def list_products(self, **params):
+        return self.get("/products", params=params)
+
+    def get_product(self, product_id, expand=False):
+        params = {"expand": "detail"} if expand else None
+        return self.get(f"/products/{product_id}", params=params)
+
+    def get_suggestions(self, product_id):
+        return self.get(f"/products/{product_id}/suggestions")
+
+    # -- reviews ----------------------------------------------------------
+
+    def get_reviews(self, product_id, **params):
+        return self.get("/reviews", params={"product_id": product_id, **params})
+
+    def get_rating_summary(self, product_id):
+        return self.get("/reviews/summary", params={"product_id": product_id})
+
+    def create_review(self, product_id, user_id, rating, review_text):
+        return self.post("/reviews", json={
+            "product_id": product_id, "user_id": user_id, "rating": rating, "review_text": review_text
+        })
+
+    # -- promotions -------------------------------------------------------
+
+    def get_promotions(self):
+        return self.get("/promotions")
+
+    def create_promotion(self, name, **fields):
+        return self.post("/promotions", json={"name": name, **fields})
+
+    def update_promotion(self, promotion_id, **fields):
+        return self.put("/promotions", json={"id": promotion_id, **fields})
+
+    def delete_promotion(self, promotion_id):
+        return self.delete("/promotions", params={"id": promotion_id})
+
+    # -- pricing ----------------------------------------------------------
+
+    def price_cart(self, items, promo_code=None, pincode=None):
+        body = {"items": items}
+        if promo_code is not None:
+            body["promo_code"] = promo_code
+        if pincode is not None:
+            body["pincode"] = pincode
+        return self.post("/pricing", json=body)
+
+    # -- saved cards ------------------------------------------------------
+
+    def get_saved_cards(self, user_id):
+        return self.get("/saved-cards", params={"user_id": user_id})
+
+    def save_card(self, user_id, card_type, card_number, card_holder, expiry_date):
+        return self.post("/saved-cards", json={
+            "user_id": user_id, "card_type": card_type, "card_number": card_number,
+            "card_holder": card_holder, "expiry_date": expiry_date
+        })
+
+    def delete_saved_card(self, card_id):
+        return self.delete("/saved-cards", params={"id": card_id})
+
+    # -- users ------------------------------------------------------------
+
+    def users_count(self):
+        return self.get("/users/count")
+
+    def list_users(self, **params):
+        return self.get("/users", params=params)
+
+    # -- admin ------------------------------------------------------------
+
+    def list_admin_orders(self, **params):
+        return self.get("/admin/orders", params=params)
@@ -0,0 +1,115 @@
+"""
+Synchronous client: one pooled requests.Session with urllib3 retries
+"""
+
+import json
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from tests.api_client.config import (
+    DEFAULT_BACKOFF,
+    DEFAULT_RETRIES,
+    DEFAULT_TARGET,
+    RETRY_STATUSES,
+    resolve_base_url,
+    retry_methods,
+)
+from tests.api_client.endpoints import ApiError, ApiResponse, ShopEndpoints
+from tests.api_client.timing import ServerTimingStats, endpoint_key, parse_server_timing
+
+
+class ShopClient(ShopEndpoints):
+    """Keep-alive HTTP client for the shop API
+
+    Connections are pooled per host (up to `pool_size`), and 5xx responses
+    and connection errors are retried up to `retries` times with
+    exponential backoff for idempotent methods (and POST with retry_posts).
+    Server-Timing headers are aggregated per endpoint in `timings`.
+    """
+
+    def __init__(self, base_url=None, *, target=None, default_target=DEFAULT_TARGET,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, timeout=10,
+                 pool_size=10, retry_posts=False, headers=None):
+        self.base_url = resolve_base_url(base_url, target, default_target)
+        self.timeout = timeout
+        self.timings = ServerTimingStats()
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json", **(headers or {})})
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=retry_methods(retry_posts),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def from_args(cls, args, default_target=DEFAULT_TARGET, **kwargs):
+        """Build from parsed --base-url/--target arguments"""
+        return cls(getattr(args, "base_url", None), target=getattr(args, "target", None),
+                   default_target=default_target, **kwargs)
+
+    def request(self, method, path, params=None, json=None, headers=None, timeout=None):
+        start = time.perf_counter()
+        response = self.session.request(
+            method, f"{self.base_url}{path}", params=params, json=json,
+            headers=headers, timeout=timeout or self.timeout,
+        )
+        elapsed = time.perf_counter() - start
+        history = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+        result = ApiResponse(
+            method=method,
+            url=response.url,
+            status_code=response.status_code,
+            text=response.text,
+            headers=dict(response.headers),
+            elapsed=elapsed,
+            attempts=len(history) + 1,
+        )
+        self.timings.add(endpoint_key(method, path), result.server_timing)
+        return result
+
+    def iter_ndjson(self, path, params=None, timeout=None, chunk_size=64 * 1024):
+        """Yield one decoded object per line of a streamed NDJSON response.
+
+        The body is read `chunk_size` bytes at a time as it arrives, so
+        memory stays at one chunk plus the current row however long the
+        response is. An export the server aborts part-way raises
+        requests.exceptions.ChunkedEncodingError instead of ending early.
+        """
+        with self.session.get(f"{self.base_url}{path}", params=params, stream=True,
+                              timeout=timeout or self.timeout) as response:
+            if response.status_code != 200:
+                raise ApiError(ApiResponse(
+                    method="GET", url=response.url, status_code=response.status_code,
+                    text=response.text, headers=dict(response.headers),
+                ))
+            self.timings.add(endpoint_key("GET", path), parse_server_timing(
+                response.headers.get("Server-Timing", "")
+            ))
+            for line in response.iter_lines(chunk_size=chunk_size):
+                if line:
+                    yield json.loads(line)
+
+    def export_rows(self, table, **params):
+        """Every row of GET /api/admin/export/<table>, one dict at a time"""
+        return self.iter_ndjson(f"/admin/export/{table}", params=params)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
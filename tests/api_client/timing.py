@@ -0,0 +1,120 @@
+"""
+Server-Timing parsing and per-endpoint aggregation
+
+Every API route answers with a header such as
+
+    Server-Timing: db-select;dur=12.4;count=2, db;dur=12.4;count=2, total;dur=15.0
+
+parse_server_timing() turns it into {"db-select": {"dur": 12.4, "count": 2}, ...}
+and ServerTimingStats collects those per endpoint, so a report can show
+database time and round trips per request next to the client-side latency.
+"""
+
+import re
+from collections import defaultdict
+
+from tests.stats import percentile
+
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|\d+)(?=/|$)")
+
+
+def _param_value(value):
+    value = value.strip()
+    if value.startswith('"') and value.endswith('"'):
+        return value[1:-1]
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def parse_server_timing(header):
+    """Parse a Server-Timing header (or several joined by commas)"""
+    metrics = {}
+    for entry in (header or "").split(","):
+        name, *params = [part.strip() for part in entry.split(";")]
+        if not name:
+            continue
+        metric = {}
+        for param in params:
+            key, _, value = param.partition("=")
+            metric[key.strip()] = _param_value(value) if value else None
+        metrics[name] = metric
+    return metrics
+
+
+def endpoint_key(method, path):
+    """'GET /products/868f...' -> 'GET /products/[id]', query string dropped"""
+    return f"{method} {_ID_SEGMENT.sub('/[id]', path.split('?', 1)[0])}"
+
+
+class ServerTimingStats:
+    """Server-Timing metrics per endpoint, across many responses"""
+
+    def __init__(self):
+        self.requests = defaultdict(int)
+        self.durations = defaultdict(lambda: defaultdict(list))
+        self.counts = defaultdict(lambda: defaultdict(list))
+
+    def add(self, endpoint, metrics):
+        if not metrics:
+            return
+        self.requests[endpoint] += 1
+        for name, metric in metrics.items():
+            if isinstance(metric.get("dur"), (int, float)):
+                self.durations[endpoint][name].append(float(metric["dur"]))
+            if isinstance(metric.get("count"), int):
+                self.counts[endpoint][name].append(metric["count"])
+
+    def endpoints(self):
+        return sorted(self.requests)
+
+    def summary(self, endpoint):
+        """Mean/p50/p95 of each metric's duration and mean calls per request"""
+        if not self.requests.get(endpoint):
+            return None
+        metrics = {}
+        for name, values in self.durations[endpoint].items():
+            values = sorted(values)
+            counts = self.counts[endpoint].get(name, [])
+            metrics[name] = {
+                "mean_ms": sum(values) / len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "calls_per_request": (sum(counts) / len(counts)) if counts else None,
+            }
+        round_trips = self.counts[endpoint].get("db", [])
+        return {
+            "responses": self.requests[endpoint],
+            "db_ms": metrics.get("db", {}).get("mean_ms"),
+            "total_ms": metrics.get("total", {}).get("mean_ms"),
+            "round_trips": (sum(round_trips) / len(round_trips)) if round_trips else None,
+            "max_round_trips": max(round_trips) if round_trips else None,
+            "metrics": metrics,
+        }
+
+    def report(self):
+        return {endpoint: self.summary(endpoint) for endpoint in self.endpoints()}
+
+
+def print_server_timing(report):
+    """Fixed-width table of DB time and round trips per endpoint"""
+    print(f"\n{'='*96}")
+    print(f"{'ENDPOINT':<40}{'RESP':>7}{'RTT/REQ':>9}{'MAX RTT':>9}{'DB ms':>10}{'TOTAL ms':>10}  OPERATIONS")
+    print('='*96)
+    for endpoint, row in report.items():
+        if not row:
+            continue
+        operations = ", ".join(
+            f"{name} {m['mean_ms']:.1f}ms x{m['calls_per_request']:.1f}"
+            for name, m in sorted(row["metrics"].items())
+            if name not in ("db", "total") and m["calls_per_request"] is not None
+        )
+        round_trips = row["round_trips"] if row["round_trips"] is not None else 0.0
+        print(f"{endpoint[:39]:<40}{row['responses']:>7}{round_trips:>9.1f}{row['max_round_trips'] or 0:>9}"
+              f"{row['db_ms'] or 0:>10.1f}{row['total_ms'] or 0:>10.1f}  {operations}")
+    print('='*96)
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Per-route and per-journey latency with baseline gating
+
+Every scenario below is run for --requests iterations by --concurrency
+workers (after --warmup unrecorded iterations). Route scenarios time one
+API call; journey scenarios time a whole user flow and also record each
+step, so the write routes they go through get their own rows.
+
+Results are written as UTF-8 JSON (latency distribution, throughput,
+error rate and response bytes per scenario, plus the database time and
+round trips each route reported through Server-Timing) to --output, then compared
+with the stored baseline. A scenario regresses when its p50/p95 latency
+grows, or its throughput drops, by more than --threshold, or its error
+rate grows by more than --max-error-increase. Any regression makes the
+script exit 1.
+
+    python -m tests.benchmark_suite --target local --save-baseline
+    python -m tests.benchmark_suite --target local --threshold 0.15
+    python -m tests.benchmark_suite --only "GET /products" --only "journey:*"
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import aiohttp
+
+from tests.api_client import ServerTimingStats, add_target_arguments, print_server_timing, resolve_base_url
+from tests.api_client.aio import AsyncShopClient
+from tests.stats import LatencyRecorder
+
+TEST_USER_ID = os.environ.get("TEST_USER_ID", "eecfbc52-7245-48a0-a6bb-d1129dfae60e")
+TEST_PRODUCT_ID = os.environ.get("TEST_PRODUCT_ID", "868f777a-a525-4cc3-a4a1-86e0b813495e")
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+RESULTS_VERSION = 1
+
+# (metric, direction): +1 means higher is worse, -1 means lower is worse
+GATED_METRICS = [("p50_ms", 1), ("p95_ms", 1), ("throughput_rps", -1)]
+
+
+class Context:
+    """Ids the scenarios need, set up once before the first scenario runs"""
+
+    def __init__(self, user_id, product_id):
+        self.user_id = user_id
+        self.product_id = product_id
+
+
+class Runner:
+    """Records every call one scenario makes"""
+
+    def __init__(self, client):
+        self.client = client
+        self.recorder = LatencyRecorder()
+        self.timings = ServerTimingStats()
+
+    async def call(self, endpoint, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.recorder.record(endpoint, time.perf_counter() - start, type(e).__name__, ok=False)
+            return None
+        self.recorder.record(endpoint, response.elapsed, response.status_code, response.ok,
+                             len(response.text.encode("utf-8")))
+        self.timings.add(endpoint, response.server_timing)
+        return response if response.ok else None
+
+
+# -- route scenarios ---------------------------------------------------------
+# name -> function(client, ctx) returning the unstarted request coroutine
+
+ROUTES = {
+    "GET /products": lambda c, ctx: c.list_products(limit=24),
+    "GET /products?search": lambda c, ctx: c.list_products(search="shirt", limit=24),
+    "GET /products/[id]": lambda c, ctx: c.get_product(ctx.product_id),
+    "GET /products/[id]?expand": lambda c, ctx: c.get_product(ctx.product_id, expand=True),
+    "GET /products/[id]/suggestions": lambda c, ctx: c.get_suggestions(ctx.product_id),
+    "GET /reviews": lambda c, ctx: c.get_reviews(ctx.product_id),
+    "GET /reviews/summary": lambda c, ctx: c.get_rating_summary(ctx.product_id),
+    "GET /promotions": lambda c, ctx: c.get_promotions(),
+    "POST /pricing": lambda c, ctx: c.price_cart([{"product_id": ctx.product_id, "quantity": 2}],
+                                                 pincode="560001"),
+    "GET /me/counts": lambda c, ctx: c.get_counts(ctx.user_id),
+    "GET /cart": lambda c, ctx: c.get_cart(ctx.user_id),
+    "GET /cart?expand": lambda c, ctx: c.get_cart(ctx.user_id, expand=True),
+    "GET /wishlist": lambda c, ctx: c.get_wishlist(ctx.user_id, expand=True),
+    "GET /orders": lambda c, ctx: c.get_orders(ctx.user_id),
+    "GET /orders?view=groups": lambda c, ctx: c.list_order_groups(ctx.user_id, limit=10),
+    "GET /orders?view=history": lambda c, ctx: c.order_history(ctx.user_id),
+    "GET /saved-cards": lambda c, ctx: c.get_saved_cards(ctx.user_id),
+    "GET /users": lambda c, ctx: c.list_users(sort="name", limit=50),
+    "GET /users/count": lambda c, ctx: c.users_count(),
+    "GET /admin/orders": lambda c, ctx: c.list_admin_orders(limit=50),
+    "GET /status": lambda c, ctx: c.get("/status"),
+}
+
+
+def route_scenario(name, build):
+    async def scenario(runner, ctx):
+        return await runner.call(name, build(runner.client, ctx)) is not None
+    return scenario
+
+
+# -- journey scenarios -------------------------------------------------------
+
+async def browse_journey(runner, ctx):
+    """Catalog page, then a product page (product, suggestions and reviews in one call)"""
+    c = runner.client
+    if not await runner.call("GET /products", c.list_products(limit=24)):
+        return False
+    return bool(await runner.call("GET /products/[id]?expand", c.get_product(ctx.product_id, expand=True)))
+
+
+async def cart_journey(runner, ctx):
+    """Add to cart, change the quantity, view the cart, remove the line"""
+    c = runner.client
+    response = await runner.call("POST /cart", c.add_to_cart(ctx.user_id, ctx.product_id, 1))
+    cart_id = (response.data or {}).get("id") if response else None
+    if not cart_id:
+        return False
+    ok = await runner.call("PATCH /cart", c.update_cart_item(cart_id, 2))
+    ok = await runner.call("GET /cart?expand", c.get_cart(ctx.user_id, expand=True)) and ok
+    ok = await runner.call("DELETE /cart", c.remove_cart_item(cart_id)) and ok
+    return bool(ok)
+
+
+async def checkout_journey(runner, ctx):
+    """Register, fill the cart in one batch, place the order, open its order page"""
+    c = runner.client
+    email = f"bench_{uuid.uuid4().hex[:12]}@example.com"
+    response = await runner.call("POST /auth/register", c.register(email, "bench12345", name="Bench User"))
+    body = response.json() if response else None
+    user_id = (body or {}).get("user", {}).get("id")
+    if not user_id:
+        return False
+    if not await runner.call("POST /cart/batch", c.cart_batch(user_id, [
+        {"op": "add", "product_id": ctx.product_id, "quantity": 2}
+    ])):
+        return False
+    items = [{"product_id": ctx.product_id, "quantity": 2}]
+    response = await runner.call("POST /orders", c.create_order(user_id, items, payment_method="credit_card"))
+    group_id = (response.json() or {}).get("order_group_id") if response else None
+    if not group_id:
+        return False
+    # What the order confirmation page loads
+    return bool(await runner.call("GET /orders?group_id", c.get_order_group(group_id, recent=5, user_id=user_id)))
+
+
+async def wishlist_journey(runner, ctx):
+    """Save a product, view the wishlist, remove it again"""
+    c = runner.client
+    response = await runner.call("POST /wishlist", c.add_to_wishlist(ctx.user_id, ctx.product_id))
+    wishlist_id = (response.data or {}).get("id") if response else None
+    if not wishlist_id:
+        return False
+    ok = await runner.call("GET /wishlist", c.get_wishlist(ctx.user_id, expand=True))
+    ok = await runner.call("DELETE /wishlist", c.remove_from_wishlist(wishlist_id)) and ok
+    return bool(ok)
+
+
+async def admin_journey(runner, ctx):
+    """The admin dashboard's first paint: users, orders and the user count"""
+    c = runner.client
+    results = await asyncio.gather(
+        runner.call("GET /users", c.list_users(sort="name", limit=50)),
+        runner.call("GET /admin/orders", c.list_admin_orders(limit=50)),
+        runner.call("GET /users/count", c.users_count()),
+        runner.call("GET /promotions", c.get_promotions()),
+    )
+    return all(results)
+
+
+JOURNEYS = {
+    "journey:browse": browse_journey,
+    "journey:cart": cart_journey,
+    "journey:checkout": checkout_journey,
+    "journey:wishlist": wishlist_journey,
+    "journey:admin": admin_journey,
+}
+
+
+def scenarios():
+    found = {name: route_scenario(name, build) for name, build in ROUTES.items()}
+    found.update(JOURNEYS)
+    return found
+
+
+def select(names, only, skip):
+    chosen = [n for n in names if not only or any(fnmatch.fnmatchcase(n, p) for p in only)]
+    return [n for n in chosen if not any(fnmatch.fnmatchcase(n, p) for p in skip or ())]
+
+
+# -- running -----------------------------------------------------------------
+
+async def run_scenario(client, ctx, name, scenario, requests, concurrency, warmup):
+    """Return the scenario summary plus one summary per recorded step"""
+    warm = Runner(client)
+    for _ in range(warmup):
+        await scenario(warm, ctx)
+
+    runner = Runner(client)
+    remaining = iter(range(requests))
+    totals = []
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            ok = await scenario(runner, ctx)
+            totals.append((time.perf_counter() - start, ok))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_time = time.perf_counter() - start
+
+    if name in ROUTES:
+        summary = runner.recorder.summary(name, wall_time)
+        summary["server_timing"] = runner.timings.summary(name)
+        steps = {}
+    else:
+        # The journey row is the whole flow; bytes are the sum over its steps
+        overall = LatencyRecorder()
+        for elapsed, ok in totals:
+            overall.record(name, elapsed, "ok" if ok else "failed", ok)
+        overall.bytes[name] = sum(runner.recorder.bytes.values())
+        summary = overall.summary(name, wall_time)
+        steps = {step: runner.recorder.summary(step, wall_time) for step in runner.recorder.endpoints()}
+        for step, row in steps.items():
+            row["server_timing"] = runner.timings.summary(step)
+
+    summary["wall_time_s"] = wall_time
+    summary["steps"] = steps
+    return summary
+
+
+async def prepare_context(client, args):
+    """Register a dedicated user so the write journeys do not touch real carts"""
+    if args.user_id:
+        return Context(args.user_id, args.product_id)
+    try:
+        response = await client.register(f"bench_{uuid.uuid4().hex[:12]}@example.com", "bench12345",
+                                         name="Bench Owner")
+        body = response.json() if response.ok else None
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        body = None
+    user_id = (body or {}).get("user", {}).get("id") or TEST_USER_ID
+    return Context(user_id, args.product_id)
+
+
+async def run_suite(args, names):
+    all_scenarios = scenarios()
+    results = {}
+    async with AsyncShopClient(args.base_url, pool_size=args.concurrency, timeout=args.timeout,
+                               retries=0) as client:
+        ctx = await prepare_context(client, args)
+        for name in names:
+            print(f"  {name} ...", flush=True)
+            results[name] = await run_scenario(client, ctx, name, all_scenarios[name],
+                                               args.requests, args.concurrency, args.warmup)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# -- baselines ---------------------------------------------------------------
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True, default=str)
+        f.write("\n")
+
+
+def compare(current, baseline, threshold, min_delta_ms, max_error_increase):
+    """Return one row per gated metric: (scenario, metric, base, now, change, regressed)"""
+    rows = []
+    for name, now in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric, direction in GATED_METRICS:
+            old, new = base.get(metric), now.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regressed = change * direction > threshold
+            if regressed and metric.endswith("_ms") and new - old < min_delta_ms:
+                regressed = False
+            rows.append((name, metric, old, new, change, regressed))
+        old_errors, new_errors = base.get("error_rate", 0.0), now.get("error_rate", 0.0)
+        rows.append((name, "error_rate", old_errors, new_errors, new_errors - old_errors,
+                     new_errors - old_errors > max_error_increase))
+    return rows
+
+
+# -- report ------------------------------------------------------------------
+
+def print_results(results):
+    print(f"\n{'='*112}")
+    print(f"{'SCENARIO':<34}{'REQS':>6}{'ERR%':>7}{'RPS':>9}{'MEAN ms':>10}{'P50 ms':>10}"
+          f"{'P95 ms':>10}{'P99 ms':>10}{'MAX ms':>10}{'KB/REQ':>9}")
+    print('='*112)
+    for name, row in results.items():
+        print(f"{name:<34}{row['requests']:>6}{row['error_rate'] * 100:>7.1f}{row['throughput_rps']:>9.1f}"
+              f"{row['mean_ms']:>10.1f}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+              f"{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}{row['bytes_mean'] / 1024:>9.1f}")
+    print('='*112)
+
+
+def server_timing_rows(results):
+    """Server-Timing summaries of the route scenarios and of every journey step"""
+    rows = {}
+    for name, row in results.items():
+        if row.get("server_timing"):
+            rows[name] = row["server_timing"]
+        for step, step_row in row.get("steps", {}).items():
+            if step_row.get("server_timing"):
+                rows[f"{name} > {step}"] = step_row["server_timing"]
+    return rows
+
+
+def print_comparison(rows, threshold):
+    regressions = [r for r in rows if r[5]]
+    print(f"\nBaseline comparison (threshold {threshold:.0%}):")
+    if not regressions:
+        print(f"✅ No regressions across {len({r[0] for r in rows})} scenarios")
+        return
+    print(f"{'SCENARIO':<34}{'METRIC':<16}{'BASELINE':>12}{'NOW':>12}{'CHANGE':>10}")
+    for name, metric, old, new, change, _ in regressions:
+        shown = f"{change * 100:+.1f}pt" if metric == "error_rate" else f"{change:+.0%}"
+        print(f"❌ {name:<31}{metric:<16}{old:>12.2f}{new:>12.2f}{shown:>10}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Per-route and per-journey benchmark with baseline gating")
+    add_target_arguments(parser)
+    parser.add_argument("--requests", type=int, default=200, help="recorded iterations per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="parallel workers per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="unrecorded iterations before each scenario")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument("--only", action="append", help="glob of scenarios to run (repeatable)")
+    parser.add_argument("--skip", action="append", help="glob of scenarios to leave out (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list the scenarios and exit")
+    parser.add_argument("--user-id", help="existing user for the route scenarios (default: register one)")
+    parser.add_argument("--product-id", default=TEST_PRODUCT_ID, help="existing product used by the scenarios")
+    parser.add_argument("--output", default="bench_results.json", help="where to write this run's JSON")
+    parser.add_argument("--baseline", help="baseline JSON (default: tests/baselines/<target>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="relative latency/throughput change that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="latency increases smaller than this never count as regressions")
+    parser.add_argument("--max-error-increase", type=float, default=0.01,
+                        help="absolute error-rate increase that counts as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = select(list(scenarios()), args.only, args.skip)
+    if args.list:
+        print("\n".join(names))
+        return True
+
+    args.base_url = resolve_base_url(args.base_url, args.target)
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{args.target or 'local'}.json")
+
+    print("=" * 72)
+    print("BENCHMARK SUITE - ROUTES AND USER JOURNEYS")
+    print("=" * 72)
+    print(f"Backend URL: {args.base_url}")
+    print(f"Scenarios: {len(names)}, {args.requests} requests each at concurrency {args.concurrency}")
+    print(f"Baseline: {baseline_path}")
+
+    started = datetime.now(timezone.utc)
+    results = asyncio.run(run_suite(args, names))
+
+    report = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "started_at": started.isoformat(),
+            "base_url": args.base_url,
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+        },
+        "scenarios": results,
+    }
+    write_json(args.output, report)
+    print_results(results)
+    print_server_timing(server_timing_rows(results))
+    print(f"Results written to {args.output}")
+
+    if all(row["requests"] and row["errors"] == row["requests"] for row in results.values()):
+        print(f"❌ Every request failed; is the app running at {args.base_url}?")
+        return False
+
+    if args.save_baseline:
+        write_json(baseline_path, report)
+        print(f"✅ Baseline saved to {baseline_path}")
+        return True
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return True
+
+    baseline = load_json(baseline_path)
+    settings = ("requests", "concurrency")
+    if any(baseline.get("meta", {}).get(k) != report["meta"][k] for k in settings):
+        print("⚠️  Baseline was recorded with different --requests/--concurrency; throughput is not comparable")
+    rows = compare(results, baseline.get("scenarios", {}), args.threshold,
+                   args.min_delta_ms, args.max_error_increase)
+    print_comparison(rows, args.threshold)
+    return not any(r[5] for r in rows)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Cart Batch Test - Per-item calls vs POST /api/cart/batch
+
+Fills a fresh user's cart with N products and clears it twice: once the
+way the payment page used to (one request per item) and once with a single
+batch request. Prints request counts and wall time for each path.
+
+Product ids default to the fixture catalog of tests/local_supabase.py.
+
+Usage:
+    python -m tests.cart_batch_test --items 20
+    python -m tests.cart_batch_test --target staging
+"""
+
+import argparse
+import sys
+import time
+
+from tests.api_client import ShopClient, add_target_arguments
+from tests.local_supabase import fixture_product_ids
+
+
+def get_cart(client, user_id):
+    return client.get_cart(user_id).raise_for_status().data or []
+
+
+def add_per_item(client, user_id, product_ids):
+    for product_id in product_ids:
+        client.add_to_cart(user_id, product_id, quantity=1).raise_for_status()
+    return len(product_ids)
+
+
+def add_batch(client, user_id, product_ids):
+    client.cart_batch(user_id, [
+        {"op": "add", "product_id": p, "quantity": 1} for p in product_ids
+    ]).raise_for_status()
+    return 1
+
+
+def clear_per_item(client, user_id, items):
+    for item in items:
+        client.remove_cart_item(item["id"]).raise_for_status()
+    return len(items)
+
+
+def clear_batch(client, user_id, items):
+    client.cart_batch(user_id, [{"op": "clear"}]).raise_for_status()
+    return 1
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    calls = fn(*args)
+    return calls, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-item and batch cart calls")
+    add_target_arguments(parser)
+    parser.add_argument("--items", type=int, default=20, help="distinct products in the cart")
+    parser.add_argument("--product-ids", help="comma-separated product ids (default: stand-in fixtures)")
+    args = parser.parse_args(argv)
+    client = ShopClient.from_args(args)
+
+    product_ids = args.product_ids.split(",") if args.product_ids else fixture_product_ids(args.items)
+    product_ids = product_ids[:args.items]
+
+    print("=" * 60)
+    print("CART BATCH TEST - PER-ITEM VS BATCH")
+    print("=" * 60)
+    print(f"Backend URL: {client.base_url}")
+    print(f"Items: {len(product_ids)}")
+    print()
+
+    user_id = client.register_test_user("batch")
+    rows = []
+    success = True
+
+    for label, add_fn, clear_fn in (
+        ("per-item", add_per_item, clear_per_item),
+        ("batch", add_batch, clear_batch),
+    ):
+        add_calls, add_time = timed(add_fn, client, user_id, product_ids)
+        items = get_cart(client, user_id)
+        filled = len(items)
+        clear_calls, clear_time = timed(clear_fn, client, user_id, items)
+        remaining = len(get_cart(client, user_id))
+        rows.append((label, add_calls, add_time, clear_calls, clear_time))
+
+        if filled != len(product_ids) or remaining != 0:
+            success = False
+            print(f"❌ {label}: cart had {filled} rows after add and {remaining} after clear")
+
+    print(f"{'PATH':<10}{'ADD CALLS':>11}{'ADD ms':>10}{'CLEAR CALLS':>13}{'CLEAR ms':>11}")
+    for label, add_calls, add_time, clear_calls, clear_time in rows:
+        print(f"{label:<10}{add_calls:>11}{add_time * 1000:>10.1f}{clear_calls:>13}{clear_time * 1000:>11.1f}")
+    print()
+
+    per_item, batch = rows
+    print(f"Checkout clear speedup: {per_item[4] / batch[4]:.1f}x "
+          f"({per_item[3]} calls -> {batch[3]} call)")
+    if success:
+        print("✅ PASS - both paths left the cart in the expected state")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
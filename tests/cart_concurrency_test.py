@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Cart Concurrency Test - Parallel adds of the same product
+
+Fires N simultaneous POST /api/cart requests for one (user, product) pair
+and checks that the cart ends up with exactly one row whose qty is N.
+With the old SELECT -> DELETE -> INSERT path, concurrent adds lost updates
+or failed on .single(); with the add_to_cart() upsert every add must count.
+
+Usage:
+    python -m tests.cart_concurrency_test --parallel 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from tests.api_client import add_target_arguments
+from tests.api_client.aio import AsyncShopClient
+from tests.stats import percentile
+
+TEST_PRODUCT_ID = os.environ.get("TEST_PRODUCT_ID", "868f777a-a525-4cc3-a4a1-86e0b813495e")
+
+
+async def run(client, product_id, parallel, user_id=None):
+    async with client:
+        user_id = user_id or await client.register_test_user("concurrency")
+
+        before = (await client.get_cart(user_id)).data or []
+        initial_qty = sum(i["qty"] for i in before if i["product_id"] == product_id)
+
+        results = await asyncio.gather(*(
+            client.add_to_cart(user_id, product_id, quantity=1) for _ in range(parallel)
+        ))
+
+        after = (await client.get_cart(user_id)).data or []
+
+    rows = [i for i in after if i["product_id"] == product_id]
+    return user_id, initial_qty, [(r.status_code, r.elapsed) for r in results], rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel add-to-cart consistency test")
+    add_target_arguments(parser)
+    parser.add_argument("--product-id", default=TEST_PRODUCT_ID)
+    parser.add_argument("--parallel", type=int, default=20, help="simultaneous adds")
+    parser.add_argument("--user-id", help="reuse an existing user instead of registering one")
+    args = parser.parse_args(argv)
+    client = AsyncShopClient.from_args(args, pool_size=args.parallel)
+
+    print("=" * 60)
+    print("CART CONCURRENCY TEST - PARALLEL ADDS OF ONE PRODUCT")
+    print("=" * 60)
+    print(f"Backend URL: {client.base_url}")
+    print(f"Parallel adds: {args.parallel}")
+    print()
+
+    user_id, initial_qty, results, rows = asyncio.run(
+        run(client, args.product_id, args.parallel, args.user_id)
+    )
+
+    latencies = sorted(elapsed for _, elapsed in results)
+    failures = [status for status, _ in results if status != 200]
+    expected_qty = initial_qty + args.parallel - len(failures)
+    final_qty = sum(r["qty"] for r in rows)
+
+    print(f"User ID: {user_id}")
+    print(f"Latency p50: {percentile(latencies, 50) * 1000:.1f}ms  "
+          f"p95: {percentile(latencies, 95) * 1000:.1f}ms  "
+          f"p99: {percentile(latencies, 99) * 1000:.1f}ms")
+    print(f"Failed requests: {len(failures)} {sorted(set(failures)) if failures else ''}")
+    print(f"Cart rows for product: {len(rows)}")
+    print(f"Final qty: {final_qty} (expected {expected_qty})")
+    print()
+
+    success = not failures and len(rows) == 1 and final_qty == expected_qty
+    if success:
+        print("✅ PASS - every concurrent add was applied exactly once")
+    else:
+        if failures:
+            print("❌ FAIL - some adds returned errors")
+        if len(rows) != 1:
+            print("❌ FAIL - duplicate cart rows for the same product")
+        if final_qty != expected_qty:
+            print("❌ FAIL - lost quantity updates")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Cold Start Benchmark - First-request latency per route after `next start`
+
+Starts the offline Supabase stand-in, then (per run) a fresh production
+Next.js server pointed at it, and hits each API route twice: the first
+request pays for loading the route bundle and opening connections to
+Supabase, the second shows the warm cost. Medians across --runs are
+reported per route, along with the time until the server accepts
+connections.
+
+--compare-warmup repeats everything with SUPABASE_WARMUP=0 so the effect
+of the boot-time connection warm-up in instrumentation.js is visible.
+
+Needs a production build first:
+    npx next build
+    python -m tests.cold_start_benchmark --runs 5 --compare-warmup
+"""
+
+import argparse
+import os
+import shlex
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from tests.api_client import ShopClient
+from tests.local_supabase import LocalSupabase, TEST_PRODUCT_ID, TEST_USER_ID
+
+ROUTES = [
+    ("GET /api/products", "/products?limit=8"),
+    ("GET /api/products/[id]", f"/products/{TEST_PRODUCT_ID}"),
+    ("GET /api/reviews", f"/reviews?product_id={TEST_PRODUCT_ID}"),
+    ("GET /api/promotions", "/promotions"),
+    ("GET /api/cart", f"/cart?user_id={TEST_USER_ID}"),
+    ("GET /api/wishlist", f"/wishlist?user_id={TEST_USER_ID}"),
+    ("GET /api/orders", f"/orders?user_id={TEST_USER_ID}"),
+    ("GET /api/saved-cards", f"/saved-cards?user_id={TEST_USER_ID}"),
+    ("GET /api/users", "/users?limit=50"),
+    ("GET /api/users/count", "/users/count"),
+    ("GET /api/status", "/status"),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout):
+    """Seconds until the server accepts TCP connections (no route is touched)"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"next start exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.02)
+    raise RuntimeError(f"next start did not listen on port {port} within {timeout}s")
+
+
+def timed_get(client, path):
+    """One request on a fresh connection, so client-side keep-alive never helps"""
+    response = client.get(path)
+    return response.elapsed, response.status_code
+
+
+def run_once(args, supabase_url, warmup):
+    port = free_port()
+    env = {
+        **os.environ,
+        "NEXT_PUBLIC_SUPABASE_URL": supabase_url,
+        "NEXT_PUBLIC_SUPABASE_ANON_KEY": "local",
+        "SUPABASE_SERVICE_ROLE_KEY": "local",
+        "SUPABASE_WARMUP": "1" if warmup else "0",
+        "PORT": str(port),
+    }
+    command = shlex.split(args.next_cmd) + ["-p", str(port)]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+    try:
+        boot = wait_for_port(port, process, args.boot_timeout)
+        result = {"boot": boot, "routes": {}}
+        # No retries: a cold-start 5xx has to show up in the STATUS column
+        with ShopClient(f"http://127.0.0.1:{port}/api", retries=0, timeout=60,
+                        headers={"Connection": "close"}) as client:
+            for label, path in ROUTES:
+                first, status = timed_get(client, path)
+                warm, _ = timed_get(client, path)
+                result["routes"][label] = (first, warm, status)
+        return result
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+
+
+def summarize(runs):
+    boot = statistics.median(r["boot"] for r in runs)
+    rows = []
+    for label, _ in ROUTES:
+        samples = [r["routes"][label] for r in runs]
+        rows.append((
+            label,
+            statistics.median(s[0] for s in samples),
+            statistics.median(s[1] for s in samples),
+            sorted({s[2] for s in samples}),
+        ))
+    return boot, rows
+
+
+def print_table(title, boot, rows):
+    print()
+    print(title)
+    print("=" * 72)
+    print(f"Server listening after: {boot * 1000:.0f}ms (median)")
+    print(f"{'ROUTE':<28}{'FIRST ms':>10}{'WARM ms':>10}{'COLD COST':>12}{'STATUS':>12}")
+    for label, first, warm, statuses in rows:
+        print(f"{label:<28}{first * 1000:>10.1f}{warm * 1000:>10.1f}"
+              f"{(first - warm) * 1000:>11.1f}ms{','.join(map(str, statuses)):>12}")
+    total = sum(first for _, first, _, _ in rows)
+    print(f"{'all routes, first hit':<28}{total * 1000:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-route cold-start latency after next start")
+    parser.add_argument("--runs", type=int, default=3, help="fresh server starts (median is reported)")
+    parser.add_argument("--next-cmd", default="npx next start", help="command that starts the built app")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stand-in latency per request")
+    parser.add_argument("--boot-timeout", type=float, default=60.0)
+    parser.add_argument("--compare-warmup", action="store_true",
+                        help="also run with SUPABASE_WARMUP=0 and compare")
+    args = parser.parse_args(argv)
+
+    print("=" * 72)
+    print("COLD START BENCHMARK - FIRST REQUEST PER ROUTE AFTER NEXT START")
+    print("=" * 72)
+    print(f"Server command: {args.next_cmd}")
+    print(f"Runs: {args.runs}")
+
+    modes = [("warm-up on", True)] + ([("warm-up off", False)] if args.compare_warmup else [])
+    success = True
+    with LocalSupabase(latency_ms=args.latency_ms) as supabase:
+        for title, warmup in modes:
+            runs = [run_once(args, supabase.url, warmup) for _ in range(args.runs)]
+            boot, rows = summarize(runs)
+            print_table(f"{title.upper()}", boot, rows)
+            success = success and all(statuses == [200] for *_, statuses in rows)
+
+    print()
+    if success:
+        print("✅ Every route answered 200 on its first request")
+    else:
+        print("❌ Some routes failed on a cold server")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Contention Stress - Cart and wishlist writes from many processes
+
+Hammers POST /api/cart and/or POST /api/wishlist from --processes worker
+processes, each running --concurrency requests at a time for --duration
+seconds, in one of three contention patterns:
+
+    hot          every request adds the same product for the same user
+    user-spread  one user, requests rotate over --products products
+    spread       every worker task has its own user and picks products at
+                 random - the uncontended baseline
+
+After each run the carts and wishlists of the users involved are read back
+and checked:
+
+    duplicates   more than one cart or wishlist row for a (user, product)
+    lost qty     cart qty outside [successful adds, successful adds +
+                 adds whose outcome is unknown (client timeouts)]
+    missing      a (user, product) with a successful add but no row
+
+Errors are grouped by class (status plus a normalised message, e.g. the
+`.single()` "multiple rows" failure of a check-then-insert path). Pass a
+comma-separated --processes list to step the load up and find where
+throughput stops growing or errors start.
+
+Product ids default to the fixture catalog of tests/local_supabase.py.
+
+Usage:
+    python -m tests.contention_stress --pattern hot --endpoint wishlist
+    python -m tests.contention_stress --pattern spread --processes 1,2,4,8 --duration 20
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import sys
+import time
+from collections import Counter
+
+import aiohttp
+
+from tests.api_client import ShopClient, add_target_arguments, resolve_base_url
+from tests.api_client.aio import AsyncShopClient
+from tests.local_supabase import fixture_product_ids
+from tests.stats import LatencyRecorder, print_report
+
+PATTERNS = ("hot", "user-spread", "spread")
+ENDPOINTS = {"cart": "POST /cart", "wishlist": "POST /wishlist"}
+
+# Substrings of PostgREST/Postgres errors worth naming on their own
+ERROR_CLASSES = [
+    ("multiple (or no) rows", "single() saw several rows"),
+    ("duplicate key", "unique violation"),
+    ("foreign key", "foreign key violation"),
+    ("deadlock", "deadlock"),
+    ("could not serialize", "serialization failure"),
+]
+
+
+def error_class(response):
+    try:
+        message = (response.json() or {}).get("error") or ""
+    except ValueError:
+        message = response.text
+    for needle, name in ERROR_CLASSES:
+        if needle in message.lower():
+            return f"{response.status_code} {name}"
+    return f"{response.status_code} {message[:50]}".rstrip()
+
+
+def task_targets(pattern, users, products, slot, rng):
+    """Endless (user_id, product_id) choices for the worker task in `slot`"""
+    if pattern == "hot":
+        while True:
+            yield users[0], products[0]
+    if pattern == "user-spread":
+        n = rng.randrange(len(products))
+        while True:
+            yield users[0], products[n % len(products)]
+            n += 1
+    user_id = users[slot % len(users)]
+    while True:
+        yield user_id, rng.choice(products)
+
+
+async def run_worker(base_url, endpoints, pattern, users, products, index, concurrency, start_at, duration, timeout):
+    recorder = LatencyRecorder()
+    errors = Counter()
+    succeeded = Counter()  # (endpoint, user, product) -> successful adds
+    unknown = Counter()    # same key, adds that timed out or lost the connection
+
+    async with AsyncShopClient(base_url, pool_size=concurrency, retries=0, timeout=timeout) as client:
+        async def task(slot):
+            rng = random.Random(slot)
+            targets = task_targets(pattern, users, products, slot, rng)
+            n = 0
+            while time.time() < start_at + duration:
+                endpoint = endpoints[n % len(endpoints)]
+                user_id, product_id = next(targets)
+                n += 1
+                key = (endpoint, user_id, product_id)
+                request = (client.add_to_cart(user_id, product_id, quantity=1) if endpoint == "cart"
+                           else client.add_to_wishlist(user_id, product_id))
+                start = time.perf_counter()
+                try:
+                    response = await request
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    recorder.record(ENDPOINTS[endpoint], time.perf_counter() - start, type(e).__name__, ok=False)
+                    errors[f"{ENDPOINTS[endpoint]}: {type(e).__name__}"] += 1
+                    unknown[key] += 1
+                    continue
+                recorder.record(ENDPOINTS[endpoint], response.elapsed, response.status_code, response.ok)
+                if response.ok:
+                    succeeded[key] += 1
+                else:
+                    errors[f"{ENDPOINTS[endpoint]}: {error_class(response)}"] += 1
+
+        await asyncio.sleep(max(0.0, start_at - time.time()))
+        await asyncio.gather(*(task(index * concurrency + t) for t in range(concurrency)))
+
+    return {
+        "latencies": dict(recorder.latencies),
+        "statuses": {e: dict(s) for e, s in recorder.statuses.items()},
+        "errors": dict(recorder.errors),
+        "error_classes": errors,
+        "succeeded": succeeded,
+        "unknown": unknown,
+    }
+
+
+def worker(args):
+    return asyncio.run(run_worker(*args))
+
+
+def check_invariants(client, endpoints, succeeded, unknown):
+    """Read back every user's rows; returns violation messages and the row count checked"""
+    violations = []
+    keys = set(succeeded) | set(unknown)
+    checked = 0
+    for endpoint in endpoints:
+        for user_id in sorted({u for e, u, _ in keys if e == endpoint}):
+            fetch = client.get_cart if endpoint == "cart" else client.get_wishlist
+            rows = fetch(user_id).raise_for_status().data or []
+            checked += len(rows)
+            by_product = {}
+            for row in rows:
+                by_product.setdefault(row["product_id"], []).append(row)
+            for product_id in sorted({p for e, u, p in keys if e == endpoint and u == user_id}):
+                found = by_product.get(product_id, [])
+                ok, maybe = succeeded[(endpoint, user_id, product_id)], unknown[(endpoint, user_id, product_id)]
+                where = f"{endpoint} user {user_id[:8]} product {product_id[:8]}"
+                if len(found) > 1:
+                    violations.append(f"duplicates: {len(found)} rows for {where}")
+                if ok and not found:
+                    violations.append(f"missing: {ok} successful adds but no row for {where}")
+                if endpoint == "cart" and found:
+                    qty = sum(r["qty"] for r in found)
+                    if not ok <= qty <= ok + maybe:
+                        violations.append(f"lost qty: qty {qty}, expected {ok}"
+                                          + (f"-{ok + maybe}" if maybe else "") + f" for {where}")
+    return violations, checked
+
+
+def run_level(args, base_url, client, endpoints, products, processes):
+    count = 1 if args.pattern != "spread" else args.users or processes * args.concurrency
+    users = [client.register_test_user("contention") for _ in range(count)]
+    start_at = time.time() + 1.0
+    jobs = [
+        (base_url, endpoints, args.pattern, users, products, i, args.concurrency, start_at, args.duration, args.timeout)
+        for i in range(processes)
+    ]
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        results = pool.map(worker, jobs)
+
+    recorder = LatencyRecorder()
+    errors, succeeded, unknown = Counter(), Counter(), Counter()
+    for result in results:
+        for endpoint, values in result["latencies"].items():
+            recorder.latencies[endpoint].extend(values)
+        for endpoint, statuses in result["statuses"].items():
+            for status, count in statuses.items():
+                recorder.statuses[endpoint][status] += count
+        for endpoint, count in result["errors"].items():
+            recorder.errors[endpoint] += count
+        errors.update(result["error_classes"])
+        succeeded.update(result["succeeded"])
+        unknown.update(result["unknown"])
+
+    violations, checked = check_invariants(client, endpoints, succeeded, unknown)
+    return recorder, errors, violations, checked
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-process cart/wishlist write contention")
+    add_target_arguments(parser)
+    parser.add_argument("--pattern", choices=PATTERNS, default="hot")
+    parser.add_argument("--endpoint", choices=["cart", "wishlist", "both"], default="both")
+    parser.add_argument("--processes", default="4", help="worker processes, or a comma-separated list to step through")
+    parser.add_argument("--concurrency", type=int, default=10, help="in-flight requests per process")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--products", type=int, default=20, help="products to spread over")
+    parser.add_argument("--product-ids", help="comma-separated product ids (default: stand-in fixtures)")
+    parser.add_argument("--users", type=int, help="users for the spread pattern (default: one per worker task)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    args = parser.parse_args(argv)
+
+    base_url = resolve_base_url(args.base_url, args.target)
+    client = ShopClient(base_url, timeout=60)
+    endpoints = ["cart", "wishlist"] if args.endpoint == "both" else [args.endpoint]
+    products = args.product_ids.split(",") if args.product_ids else fixture_product_ids(args.products)
+    products = products[:1] if args.pattern == "hot" else products[:args.products]
+    levels = [int(p) for p in args.processes.split(",")]
+
+    print("=" * 70)
+    print("CONTENTION STRESS - CART AND WISHLIST WRITES")
+    print("=" * 70)
+    print(f"Backend URL: {base_url}")
+    print(f"Pattern: {args.pattern}, endpoints: {', '.join(endpoints)}, products: {len(products)}")
+    print(f"Processes: {args.processes} x {args.concurrency} in flight, {args.duration:.0f}s per run")
+
+    summary = []
+    for processes in levels:
+        print()
+        print(f"-- {processes} process(es) " + "-" * 50)
+        recorder, errors, violations, checked = run_level(args, base_url, client, endpoints, products, processes)
+        rows = recorder.report(args.duration)
+        print_report(rows, args.duration)
+
+        if errors:
+            print()
+            print(f"{'ERROR CLASS':<60}{'COUNT':>8}")
+            for name, count in errors.most_common():
+                print(f"{name:<60}{count:>8}")
+        print()
+        print(f"Invariants: {checked} rows checked, {len(violations)} violation(s)")
+        for message in violations[:20]:
+            print(f"   ❌ {message}")
+        if len(violations) > 20:
+            print(f"   ... {len(violations) - 20} more")
+
+        total = sum(r["requests"] for r in rows)
+        failed = sum(r["errors"] for r in rows)
+        summary.append((processes, total / args.duration, failed / total if total else 0.0, len(violations)))
+
+    print()
+    print(f"{'PROCESSES':>10}{'REQ/S':>10}{'ERROR %':>10}{'VIOLATIONS':>12}")
+    for processes, rps, error_rate, violation_count in summary:
+        print(f"{processes:>10}{rps:>10.1f}{error_rate * 100:>10.2f}{violation_count:>12}")
+    print()
+
+    success = all(error_rate == 0 and not violation_count for _, _, error_rate, violation_count in summary)
+    if success:
+        print("✅ PASS - no errors and every invariant held at every level")
+    else:
+        print("❌ FAIL - errors or invariant violations under contention")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
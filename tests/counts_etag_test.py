@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Counts ETag Test - Navbar badges from GET /api/me/counts
+
+Walks a fresh user through the calls that move the badges and checks after
+each one that /api/me/counts reports the right numbers, that repeating the
+request with the ETag it returned is a 304 with no body, and that every
+write changes the ETag. Then times --requests navbar loads the old way (the
+full cart and wishlist) against conditional count requests.
+
+Product ids default to the fixture catalog of tests/local_supabase.py.
+
+Usage:
+    python -m tests.counts_etag_test
+    python -m tests.counts_etag_test --target staging --requests 200
+"""
+
+import argparse
+import sys
+import time
+
+from tests.api_client import ShopClient, add_target_arguments
+from tests.local_supabase import fixture_product_ids
+
+
+class Checker:
+    def __init__(self, client, user_id):
+        self.client = client
+        self.user_id = user_id
+        self.etags = set()
+        self.failures = 0
+
+    def fail(self, message):
+        self.failures += 1
+        print(f"❌ {message}")
+
+    def expect(self, step, cart, wishlist):
+        response = self.client.get_counts(self.user_id).raise_for_status()
+        if response.data != {"cart": cart, "wishlist": wishlist}:
+            self.fail(f"{step}: counts {response.data}, expected cart={cart} wishlist={wishlist}")
+            return
+        etag = response.etag
+        if not etag:
+            self.fail(f"{step}: no ETag header")
+            return
+
+        repeat = self.client.get_counts(self.user_id, etag=etag)
+        if repeat.status_code != 304 or repeat.text:
+            self.fail(f"{step}: conditional request returned {repeat.status_code} ({len(repeat.text)} bytes)")
+            return
+
+        if etag in self.etags and step != "cleared":
+            self.fail(f"{step}: ETag {etag} did not change")
+        self.etags.add(etag)
+        print(f"✅ {step}: cart={cart} wishlist={wishlist} ETag {etag}, repeat is 304")
+
+
+def time_calls(fn, requests):
+    total_bytes = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        total_bytes += sum(len(r.text.encode("utf-8")) for r in fn())
+    return (time.perf_counter() - start) / requests * 1000, total_bytes / requests
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the /api/me/counts ETag flow")
+    add_target_arguments(parser)
+    parser.add_argument("--requests", type=int, default=100, help="navbar loads to time per path")
+    parser.add_argument("--product-ids", help="comma-separated product ids (default: stand-in fixtures)")
+    args = parser.parse_args(argv)
+    client = ShopClient.from_args(args)
+
+    product_ids = args.product_ids.split(",") if args.product_ids else fixture_product_ids(3)
+
+    print("=" * 60)
+    print("COUNTS ETAG TEST - /api/me/counts")
+    print("=" * 60)
+    print(f"Backend URL: {client.base_url}")
+    print()
+
+    user_id = client.register_test_user("counts")
+    check = Checker(client, user_id)
+
+    check.expect("new user", 0, 0)
+    cart_ids = [client.add_to_cart(user_id, p).raise_for_status().data["id"] for p in product_ids[:2]]
+    check.expect("two cart lines", 2, 0)
+    # Adding a product already in the cart raises its quantity, not the count
+    client.add_to_cart(user_id, product_ids[0]).raise_for_status()
+    wishlist_id = client.add_to_wishlist(user_id, product_ids[2]).raise_for_status().data["id"]
+    check.expect("wishlist item", 2, 1)
+
+    in_cart = client.get_counts(user_id, product_id=product_ids[0]).raise_for_status().data
+    not_in_cart = client.get_counts(user_id, product_id=product_ids[2]).raise_for_status().data
+    if in_cart.get("in_cart") is not True or not_in_cart.get("in_cart") is not False:
+        check.fail(f"in_cart: {in_cart} / {not_in_cart}")
+    else:
+        print("✅ product_id: in_cart is true for a cart product and false otherwise")
+
+    client.remove_cart_item(cart_ids[0]).raise_for_status()
+    check.expect("cart line removed", 1, 1)
+    client.remove_from_wishlist(wishlist_id).raise_for_status()
+    client.cart_batch(user_id, [{"op": "clear"}]).raise_for_status()
+    check.expect("cleared", 0, 0)
+
+    etag = client.get_counts(user_id).etag
+    full_ms, full_bytes = time_calls(lambda: (client.get_cart(user_id), client.get_wishlist(user_id)), args.requests)
+    counts_ms, counts_bytes = time_calls(lambda: (client.get_counts(user_id),), args.requests)
+    cond_ms, cond_bytes = time_calls(lambda: (client.get_counts(user_id, etag=etag),), args.requests)
+
+    print()
+    print(f"{'NAVBAR LOAD':<28}{'ms':>8}{'bytes':>8}")
+    print(f"{'GET cart + GET wishlist':<28}{full_ms:>8.1f}{full_bytes:>8.0f}")
+    print(f"{'GET me/counts':<28}{counts_ms:>8.1f}{counts_bytes:>8.0f}")
+    print(f"{'GET me/counts (304)':<28}{cond_ms:>8.1f}{cond_bytes:>8.0f}")
+    print()
+
+    if check.failures == 0:
+        print("✅ PASS - counts, ETags and 304s behaved as expected")
+    return check.failures == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Export Benchmark - Streaming NDJSON export vs one JSON array
+
+Seeds --rows order lines into the stand-in, then reads them back while
+sampling memory every --every rows:
+
+    export  GET /api/admin/export/orders through ShopClient.export_rows(),
+            folding each row into running totals (count, revenue, lines
+            per status) as it arrives
+    legacy  the whole orders table as one JSON array from the Supabase
+            REST endpoint, decoded with response.json() and then folded the
+            same way - how the reporting jobs pulled data before. Run on
+            --legacy-rows (default 100k) since the array has to fit in
+            memory at once.
+
+Memory is this process's Python heap (tracemalloc), which includes the
+stand-in serving the batches; with --server-pid the Next server's RSS is
+sampled alongside. The export passes when the heap at the last checkpoint
+is within --tolerance-mb of the first one and the totals match the
+database.
+
+The app has to point at the stand-in port this script serves on:
+    NEXT_PUBLIC_SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_ROLE_KEY=local next start &
+    python -m tests.export_benchmark --rows 1000000 --server-pid $!
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import requests
+
+from tests.api_client import ShopClient, add_target_arguments
+from tests.local_supabase import LocalSupabase
+
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "local")
+MB = 1024 * 1024
+
+
+def rss_mb(pid):
+    """Resident set size of `pid` from /proc, or None where that is unavailable"""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+class Totals:
+    """Running aggregates, so no row outlives its own iteration"""
+
+    def __init__(self):
+        self.count = 0
+        self.revenue = 0.0
+        self.statuses = Counter()
+
+    def add(self, row):
+        self.count += 1
+        self.revenue += row["total_price"] or 0
+        self.statuses[row["status"]] += 1
+
+
+def run_export(client, args):
+    totals = Totals()
+    samples = []
+    start = time.perf_counter()
+    for row in client.export_rows("orders", batch=args.batch):
+        totals.add(row)
+        if totals.count % args.every == 0:
+            samples.append((totals.count, tracemalloc.get_traced_memory()[0] / MB, rss_mb(args.server_pid)))
+            print(f"   {totals.count:>9} rows  heap {samples[-1][1]:7.1f} MB"
+                  + (f"  server RSS {samples[-1][2]:7.1f} MB" if samples[-1][2] is not None else ""))
+    return totals, time.perf_counter() - start, samples
+
+
+def run_legacy(supabase_url, rows):
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    response = requests.get(
+        f"{supabase_url}/rest/v1/orders",
+        params={"select": "*", "order": "created_at.asc,id.asc", "limit": rows},
+        headers={"apikey": SUPABASE_ANON_KEY, "Authorization": f"Bearer {SUPABASE_ANON_KEY}"},
+        timeout=600,
+    )
+    response.raise_for_status()
+    data = response.json()
+    totals = Totals()
+    for row in data:
+        totals.add(row)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / MB
+    del data, response
+    return totals, elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming export vs JSON array memory benchmark")
+    add_target_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1", help="stand-in host the app is configured for")
+    parser.add_argument("--port", type=int, default=54321, help="stand-in port the app is configured for")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="order lines to seed and export")
+    parser.add_argument("--legacy-rows", type=int, default=100_000, help="rows for the JSON array read (0 = skip)")
+    parser.add_argument("--batch", type=int, default=1000, help="rows per export query")
+    parser.add_argument("--every", type=int, default=100_000, help="rows between memory samples")
+    parser.add_argument("--server-pid", type=int, help="Next server process to sample RSS from")
+    parser.add_argument("--tolerance-mb", type=float, default=5.0, help="allowed heap growth over the export")
+    args = parser.parse_args(argv)
+    client = ShopClient.from_args(args, timeout=120)
+
+    print("=" * 70)
+    print("EXPORT BENCHMARK - STREAMING NDJSON VS ONE JSON ARRAY")
+    print("=" * 70)
+    print(f"App: {client.base_url}")
+    print(f"Stand-in: http://{args.host}:{args.port}")
+    print()
+
+    with LocalSupabase(args.host, args.port) as supabase:
+        print(f"Seeding {args.rows} order lines...")
+        seed_start = time.perf_counter()
+        supabase.store.seed_orders(args.rows)
+        print(f"   done in {time.perf_counter() - seed_start:.1f}s")
+        with supabase.store.lock:
+            expected_count, expected_revenue = supabase.store.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(total_price), 0) FROM orders"
+            ).fetchone()
+
+        tracemalloc.start()
+        print()
+        print(f"Streaming export (batch {args.batch}):")
+        totals, elapsed, samples = run_export(client, args)
+        legacy = run_legacy(supabase.url, args.legacy_rows) if args.legacy_rows else None
+        tracemalloc.stop()
+
+    print()
+    print(f"Export: {totals.count} rows in {elapsed:.1f}s ({totals.count / elapsed:,.0f} rows/s)")
+    print(f"   statuses: {dict(sorted(totals.statuses.items()))}")
+    growth = samples[-1][1] - samples[0][1] if len(samples) > 1 else 0.0
+    if samples:
+        print(f"   heap: first sample {samples[0][1]:.1f} MB, last {samples[-1][1]:.1f} MB "
+              f"(growth {growth:+.1f} MB)")
+        server = [s[2] for s in samples if s[2] is not None]
+        if server:
+            print(f"   server RSS: {min(server):.1f} - {max(server):.1f} MB")
+    if legacy:
+        legacy_totals, legacy_elapsed, legacy_peak = legacy
+        print(f"Legacy JSON array: {legacy_totals.count} rows in {legacy_elapsed:.1f}s, "
+              f"heap peak {legacy_peak:.1f} MB")
+    print()
+
+    complete = totals.count == expected_count and abs(totals.revenue - expected_revenue) < 0.01 * max(1, totals.count)
+    flat = growth <= args.tolerance_mb
+    if complete and flat:
+        print("✅ Every row was exported once and memory stayed flat")
+    if not complete:
+        print(f"❌ Export returned {totals.count} rows / {totals.revenue:.2f} revenue, "
+              f"expected {expected_count} / {expected_revenue:.2f}")
+    if not flat:
+        print(f"❌ Heap grew {growth:.1f} MB over the export (tolerance {args.tolerance_mb} MB)")
+    return complete and flat
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
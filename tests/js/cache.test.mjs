@@ -0,0 +1,38 @@
+// Unit tests for lib/cache.js: npm run test:js
+import assert from 'node:assert/strict'
+import { test } from 'node:test'
+import { cached, invalidate } from '../../lib/cache.js'
+
+test('a loader that throws synchronously rejects and is not kept in flight', async () => {
+  const key = 'test:sync-throw'
+  await assert.rejects(cached(key, 1000, () => { throw new Error('boom') }), /boom/)
+
+  // The failure is not cached: the next call runs its own loader
+  assert.equal(await cached(key, 1000, () => 'fresh'), 'fresh')
+  invalidate(key)
+})
+
+test('a rejected async load is passed to every waiter and not cached', async () => {
+  const key = 'test:async-reject'
+  let calls = 0
+  const load = async () => {
+    calls++
+    throw new Error('down')
+  }
+  const results = await Promise.allSettled([cached(key, 1000, load), cached(key, 1000, load)])
+  assert.deepEqual(results.map((r) => r.status), ['rejected', 'rejected'])
+  assert.equal(calls, 1)
+
+  assert.equal(await cached(key, 1000, async () => 'back'), 'back')
+  invalidate(key)
+})
+
+test('concurrent misses share one load and the value is cached', async () => {
+  const key = 'test:coalesce'
+  let calls = 0
+  const load = async () => ++calls
+  const values = await Promise.all([cached(key, 1000, load), cached(key, 1000, load)])
+  assert.deepEqual(values, [1, 1])
+  assert.equal(await cached(key, 1000, load), 1)
+  invalidate(key)
+})
@@ -0,0 +1,46 @@
+// Unit tests for lib/serverTiming.js: npm run test:js
+import assert from 'node:assert/strict'
+import { test } from 'node:test'
+import { dbOperation, timedFetch, withServerTiming } from '../../lib/serverTiming.js'
+
+const BASE = 'http://supabase.test'
+
+function streamingFetch(chunks) {
+  return async () => new Response(new ReadableStream({
+    pull(controller) {
+      if (chunks.length) controller.enqueue(new TextEncoder().encode(chunks.shift()))
+      else controller.close()
+    }
+  }), { status: 200, headers: { 'content-type': 'application/json' } })
+}
+
+test('auth calls are a db-* operation', () => {
+  assert.equal(dbOperation('POST', `${BASE}/auth/v1/token`), 'db-auth')
+  assert.equal(dbOperation('GET', `${BASE}/rest/v1/products`), 'db-select')
+})
+
+test('the body streams through and the call is recorded once it is read', async () => {
+  const fetchWithTiming = timedFetch(streamingFetch(['[{"id":1}', ',{"id":2}]']))
+  const handler = withServerTiming(async () => {
+    const response = await fetchWithTiming(`${BASE}/rest/v1/products`)
+    assert.ok(response.body instanceof ReadableStream)
+    const reader = response.body.getReader()
+    const first = await reader.read()
+    assert.equal(new TextDecoder().decode(first.value), '[{"id":1}')
+    while (!(await reader.read()).done);
+    return new Response('ok')
+  })
+  const header = (await handler()).headers.get('server-timing')
+  assert.match(header, /db-select;dur=[\d.]+;count=1/)
+  assert.match(header, /db;dur=[\d.]+;count=1/)
+})
+
+test('a cancelled body is still recorded', async () => {
+  const fetchWithTiming = timedFetch(streamingFetch(['a', 'b', 'c']))
+  const handler = withServerTiming(async () => {
+    const response = await fetchWithTiming(`${BASE}/rest/v1/orders`)
+    await response.body.cancel()
+    return new Response('ok')
+  })
+  assert.match((await handler()).headers.get('server-timing'), /db-select;dur=[\d.]+;count=1/)
+})
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Async Load Generator - Concurrent replay of the backend test flows
+
+Runs N virtual users, each repeating the journey exercised by
+comprehensive_backend_test.py and cart_test_focused.py:
+
+    register -> add to cart -> PATCH qty -> create order -> list orders -> wishlist
+
+All users share one request-rate limiter so the target rate is global.
+Reports throughput and p50/p95/p99 latency per endpoint.
+
+--cart-sizes runs one pass per checkout size and tabulates POST /orders
+latency against the number of line items.
+
+POST /cart and POST /orders carry a fresh Idempotency-Key per call, so with
+--retries a timed-out or 5xx checkout is retried under the same key and the
+server replays the first result instead of adding a second order or
+incrementing the cart twice. --no-idempotency-keys sends them bare (and
+never retries them), as before.
+
+Usage:
+    python -m tests.load_generator --users 50 --rate 100 --duration 60
+    python -m tests.load_generator --users 10 --duration 20 --cart-sizes 1,5,10,20
+    python -m tests.load_generator --target staging --users 10 --rate 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import Counter
+
+import aiohttp
+
+from tests.api_client import add_target_arguments, print_server_timing, resolve_base_url
+from tests.api_client.aio import AsyncShopClient
+from tests.local_supabase import fixture_product_ids
+from tests.stats import LatencyRecorder, print_report
+
+TEST_PRODUCT_ID = os.environ.get("TEST_PRODUCT_ID", "868f777a-a525-4cc3-a4a1-86e0b813495e")
+
+
+class RateLimiter:
+    """Spaces request starts evenly so all users together stay at `rate` req/s"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = time.perf_counter()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.perf_counter()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class VirtualUser:
+    """One simulated shopper walking through the checkout journey"""
+
+    def __init__(self, index, client, limiter, recorder, product_ids, cart_size=1,
+                 idempotency_keys=True, retries=None):
+        self.index = index
+        self.client = client
+        self.limiter = limiter
+        self.recorder = recorder
+        self.product_ids = product_ids
+        self.product_id = product_ids[0]
+        self.cart_size = cart_size
+        self.idempotency_keys = idempotency_keys
+        self.retries = retries if retries is not None else Counter()
+        self.user_id = None
+
+    def idempotency_key(self):
+        return str(uuid.uuid4()) if self.idempotency_keys else None
+
+    async def call(self, endpoint, request):
+        """Await one client request under the rate limit and record its latency.
+
+        `request` is the unstarted coroutine from an AsyncShopClient method,
+        so the clock starts only once the limiter lets it through.
+        """
+        await self.limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = await request
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.recorder.record(endpoint, time.perf_counter() - start, type(e).__name__, ok=False)
+            return None
+        self.recorder.record(endpoint, response.elapsed, response.status_code, response.ok)
+        if response.attempts > 1:
+            self.retries["retried"] += 1
+        if response.replayed:
+            self.retries["replayed"] += 1
+        return response
+
+    async def register(self):
+        email = f"load_{uuid.uuid4().hex[:12]}@example.com"
+        response = await self.call("POST /auth/register", self.client.register(
+            email, "loadtest123", name=f"Load User {self.index}", phone="9000000000"
+        ))
+        try:
+            data = response.json() if response and response.ok else None
+        except ValueError:
+            data = None
+        if data and data.get("success"):
+            self.user_id = data["user"]["id"]
+        return self.user_id
+
+    async def journey(self):
+        """One full pass through the shopping flow"""
+        if not self.user_id and not await self.register():
+            return False
+
+        response = await self.call("POST /cart", self.client.add_to_cart(
+            self.user_id, self.product_id, 1, idempotency_key=self.idempotency_key()
+        ))
+        cart_id = (response.data or {}).get("id") if response and response.ok else None
+
+        if cart_id:
+            await self.call("PATCH /cart", self.client.update_cart_item(cart_id, 2))
+
+        await self.call("GET /cart", self.client.get_cart(self.user_id))
+
+        items = [
+            {"product_id": self.product_ids[i % len(self.product_ids)], "quantity": 2}
+            for i in range(self.cart_size)
+        ]
+        await self.call("POST /orders", self.client.create_order(
+            self.user_id, items, payment_method="credit_card", idempotency_key=self.idempotency_key()
+        ))
+        await self.call("GET /orders", self.client.get_orders(self.user_id))
+
+        await self.call("POST /wishlist", self.client.add_to_wishlist(self.user_id, self.product_id))
+        await self.call("GET /wishlist", self.client.get_wishlist(self.user_id))
+
+        await self.call("GET /users/count", self.client.users_count())
+        return True
+
+    async def run(self, deadline, iterations):
+        done = 0
+        while time.perf_counter() < deadline and (not iterations or done < iterations):
+            await self.journey()
+            done += 1
+
+
+async def run_load(users, rate, duration, iterations, base_url, product_ids, timeout, cart_size=1, retries=0,
+                   idempotency_keys=True):
+    """Start `users` virtual users and return (recorder, wall_time, server timings, retry counts)"""
+    recorder = LatencyRecorder()
+    limiter = RateLimiter(rate)
+    retry_counts = Counter()
+
+    async with AsyncShopClient(base_url, pool_size=users, timeout=timeout, retries=retries) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        vusers = [
+            VirtualUser(i, client, limiter, recorder, product_ids, cart_size, idempotency_keys, retry_counts)
+            for i in range(users)
+        ]
+        await asyncio.gather(*(vu.run(deadline, iterations) for vu in vusers))
+        wall_time = time.perf_counter() - start
+
+    return recorder, wall_time, client.timings, retry_counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent load generator for the shop API")
+    add_target_arguments(parser)
+    parser.add_argument("--users", type=int, default=10, help="number of virtual users")
+    parser.add_argument("--rate", type=float, default=0, help="target total requests/sec (0 = unthrottled)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--iterations", type=int, default=0, help="journeys per user (0 = until duration)")
+    parser.add_argument("--product-id", default=TEST_PRODUCT_ID, help="existing product used by the flows")
+    parser.add_argument("--product-ids", help="comma-separated products for multi-item checkouts "
+                                              "(default: --product-id plus the stand-in fixtures)")
+    parser.add_argument("--cart-size", type=int, default=1, help="line items per checkout")
+    parser.add_argument("--cart-sizes", help="comma-separated checkout sizes to sweep, e.g. 1,5,10,20")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="client retries on 5xx/connection errors and timeouts; POSTs only with "
+                             "idempotency keys (0 = every failure counts)")
+    parser.add_argument("--no-idempotency-keys", dest="idempotency_keys", action="store_false",
+                        help="send POST /cart and POST /orders without an Idempotency-Key")
+    parser.add_argument("--json", dest="json_path", help="also write the report as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the load test and print a per-endpoint report"""
+    args = parse_args(argv)
+    args.base_url = resolve_base_url(args.base_url, args.target)
+
+    print("🚀 ASYNC LOAD GENERATOR")
+    print("=" * 60)
+    print(f"Backend URL: {args.base_url}")
+    print(f"Virtual users: {args.users}")
+    print(f"Target rate: {args.rate or 'unthrottled'} req/s")
+    print(f"Duration: {args.duration}s")
+    print("=" * 60)
+
+    if args.product_ids:
+        product_ids = args.product_ids.split(",")
+    else:
+        product_ids = [args.product_id] + fixture_product_ids()
+
+    if args.cart_sizes:
+        return sweep_cart_sizes(args, product_ids)
+
+    recorder, wall_time, timings, retry_counts = asyncio.run(run_load(
+        args.users, args.rate, args.duration, args.iterations,
+        args.base_url, product_ids, args.timeout, args.cart_size, args.retries, args.idempotency_keys
+    ))
+    rows = recorder.report(wall_time)
+    print_report(rows, wall_time)
+    print_server_timing(timings.report())
+    if args.retries:
+        print(f"Retried requests: {retry_counts['retried']}  "
+              f"(replayed by idempotency key: {retry_counts['replayed']})")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"wall_time": wall_time, "endpoints": rows, "server_timing": timings.report(),
+                       "retries": dict(retry_counts)},
+                      f, indent=2, default=str)
+
+    return rows
+
+
+def sweep_cart_sizes(args, product_ids):
+    """Repeat the run per checkout size and compare POST /orders latency"""
+    sizes = [int(n) for n in args.cart_sizes.split(",")]
+    results = []
+    for size in sizes:
+        recorder, wall_time, timings, _ = asyncio.run(run_load(
+            args.users, args.rate, args.duration, args.iterations,
+            args.base_url, product_ids, args.timeout, size, args.retries, args.idempotency_keys
+        ))
+        row = recorder.summary("POST /orders", wall_time)
+        row["cart_size"] = size
+        row["server_timing"] = timings.summary("POST /orders")
+        results.append(row)
+
+    print(f"\n{'='*60}")
+    print(f"{'ITEMS':>6}{'REQS':>8}{'ERR':>6}{'P50 ms':>12}{'P95 ms':>12}{'P99 ms':>12}")
+    print('='*60)
+    for row in results:
+        print(f"{row['cart_size']:>6}{row['requests']:>8}{row['errors']:>6}"
+              f"{row['p50_ms']:>12.1f}{row['p95_ms']:>12.1f}{row['p99_ms']:>12.1f}")
+    print('='*60)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"checkout_sweep": results}, f, indent=2, default=str)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1324 @@
+#!/usr/bin/env python3
+"""
+Local Supabase Stand-in - Offline PostgREST subset backed by SQLite
+
+Serves the part of the Supabase HTTP surface the API routes actually use,
+so the Python suites and benchmarks can run without network access:
+
+    /rest/v1/<table>   select / eq / neq / gt / gte / lt / lte / like / ilike /
+                       is / in / or / order / limit / offset, insert, upsert,
+                       update, delete, .single(), count=exact and HEAD counts
+    /rest/v1/rpc/<fn>  database functions registered in RPC_FUNCTIONS
+    /auth/v1/admin/users  createUser / listUsers / deleteUser
+
+Every request can be delayed by an injected latency (plus optional jitter)
+to model a remote database.
+
+Usage:
+    python -m tests.local_supabase --port 54321 --latency-ms 20 --jitter-ms 5
+
+    NEXT_PUBLIC_SUPABASE_URL=http://localhost:54321 \\
+    SUPABASE_SERVICE_ROLE_KEY=local next start
+
+or from Python:
+    with LocalSupabase(latency_ms=20) as db:
+        print(db.url)
+"""
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from itertools import chain, islice
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from tests.pricing import round_money, shipping_for
+
+TEST_USER_ID = "eecfbc52-7245-48a0-a6bb-d1129dfae60e"
+TEST_PRODUCT_ID = "868f777a-a525-4cc3-a4a1-86e0b813495e"
+FIXTURE_NAMESPACE = uuid.UUID("6f1c3c52-8a4e-4d5b-9a51-0c7d1e2f3a4b")
+FIXTURE_PRODUCT_COUNT = 50
+FIXTURE_CATEGORIES = ["Clothing", "Footwear", "Accessories", "Electronics", "Home"]
+
+# (column, type, default) - defaults: "uuid" -> uuid4, "now" -> current timestamp
+SCHEMA = {
+    "users": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("email", "text", None),
+            ("name", "text", None),
+            ("phone", "integer", None),
+            ("role", "text", "user"),
+            ("created_at", "timestamptz", "now"),
+        ],
+        "unique": [("email",)],
+        "indexes": [("name", "id"), ("created_at", "id")],
+    },
+    "products": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("name", "text", None),
+            ("description", "text", None),
+            ("price", "numeric", None),
+            ("category", "text", None),
+            ("image_url", "text", None),
+            ("created_at", "timestamptz", "now"),
+        ],
+        "indexes": [("name", "id"), ("price", "id"), ("created_at", "id"), ("category", "price", "id")],
+    },
+    "cart": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("user_id", "uuid", None),
+            ("product_id", "uuid", None),
+            ("qty", "integer", 1),
+            ("created_at", "timestamptz", "now"),
+            ("updated_at", "timestamptz", "now"),
+        ],
+        "references": {"user_id": "users", "product_id": "products"},
+        "unique": [("user_id", "product_id")],
+    },
+    "wishlist": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("user_id", "uuid", None),
+            ("product_id", "uuid", None),
+            ("created_at", "timestamptz", "now"),
+        ],
+        "references": {"user_id": "users", "product_id": "products"},
+    },
+    "order_groups": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("user_id", "uuid", None),
+            ("item_count", "integer", 0),
+            ("subtotal", "numeric", None),
+            ("discount", "numeric", 0),
+            ("shipping", "numeric", 0),
+            ("total_amount", "numeric", None),
+            ("promo_code", "text", None),
+            ("payment_method", "text", None),
+            ("shipping_address", "text", None),
+            ("created_at", "timestamptz", "now"),
+        ],
+        "references": {"user_id": "users"},
+        "indexes": [("user_id", "created_at", "id")],
+    },
+    "orders": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("user_id", "uuid", None),
+            ("product_id", "uuid", None),
+            ("quantity", "integer", 1),
+            ("total_price", "numeric", None),
+            ("status", "text", "pending"),
+            ("payment_method", "text", None),
+            ("shipping_address", "text", None),
+            ("order_group_id", "uuid", None),
+            ("created_at", "timestamptz", "now"),
+        ],
+        "references": {"user_id": "users", "product_id": "products", "order_group_id": "order_groups"},
+        "indexes": [("user_id", "created_at", "id"), ("created_at", "id")],
+    },
+    "reviews": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("product_id", "uuid", None),
+            ("user_id", "uuid", None),
+            ("rating", "integer", None),
+            ("review_text", "text", None),
+            ("created_at", "timestamptz", "now"),
+        ],
+        "references": {"user_id": "users", "product_id": "products"},
+        "indexes": [("product_id", "created_at", "id")],
+        "triggers": [
+            # reviews_rating_summary from the product_rating_summaries migration
+            """CREATE TRIGGER IF NOT EXISTS reviews_summary_insert AFTER INSERT ON reviews
+               WHEN NEW.rating BETWEEN 1 AND 5 BEGIN
+                 INSERT INTO product_rating_summaries (product_id) VALUES (NEW.product_id)
+                   ON CONFLICT (product_id) DO NOTHING;
+                 UPDATE product_rating_summaries SET
+                   rating_count = rating_count + 1, rating_total = rating_total + NEW.rating,
+                   rating_1 = rating_1 + (NEW.rating = 1), rating_2 = rating_2 + (NEW.rating = 2),
+                   rating_3 = rating_3 + (NEW.rating = 3), rating_4 = rating_4 + (NEW.rating = 4),
+                   rating_5 = rating_5 + (NEW.rating = 5), updated_at = strftime('%Y-%m-%dT%H:%M:%fZ')
+                 WHERE product_id = NEW.product_id;
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS reviews_summary_delete AFTER DELETE ON reviews
+               WHEN OLD.rating BETWEEN 1 AND 5 BEGIN
+                 UPDATE product_rating_summaries SET
+                   rating_count = rating_count - 1, rating_total = rating_total - OLD.rating,
+                   rating_1 = rating_1 - (OLD.rating = 1), rating_2 = rating_2 - (OLD.rating = 2),
+                   rating_3 = rating_3 - (OLD.rating = 3), rating_4 = rating_4 - (OLD.rating = 4),
+                   rating_5 = rating_5 - (OLD.rating = 5), updated_at = strftime('%Y-%m-%dT%H:%M:%fZ')
+                 WHERE product_id = OLD.product_id;
+               END""",
+        ],
+    },
+    "product_rating_summaries": {
+        "columns": [
+            ("product_id", "uuid", None),
+            ("rating_count", "integer", 0),
+            ("rating_total", "integer", 0),
+            ("rating_1", "integer", 0),
+            ("rating_2", "integer", 0),
+            ("rating_3", "integer", 0),
+            ("rating_4", "integer", 0),
+            ("rating_5", "integer", 0),
+            ("updated_at", "timestamptz", "now"),
+        ],
+        "references": {"product_id": "products"},
+        "unique": [("product_id",)],
+    },
+    "promotions": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("name", "text", None),
+            ("description", "text", None),
+            ("discount_percentage", "numeric", None),
+            ("discount_amount", "numeric", None),
+            ("code", "text", None),
+            ("start_date", "timestamptz", None),
+            ("end_date", "timestamptz", None),
+            ("active", "boolean", True),
+            ("created_at", "timestamptz", "now"),
+        ],
+    },
+    "saved_cards": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("user_id", "uuid", None),
+            ("card_type", "text", None),
+            ("card_last4", "text", None),
+            ("card_holder", "text", None),
+            ("expiry_month", "text", None),
+            ("expiry_year", "text", None),
+            ("is_default", "boolean", False),
+            ("created_at", "timestamptz", "now"),
+        ],
+        "references": {"user_id": "users"},
+    },
+    "idempotency_keys": {
+        "columns": [
+            ("id", "text", None),
+            ("fingerprint", "text", None),
+            ("response", "jsonb", None),
+            ("created_at", "timestamptz", "now"),
+            ("expires_at", "timestamptz", None),
+        ],
+        "indexes": [("expires_at",)],
+    },
+    "status_checks": {
+        "columns": [
+            ("id", "uuid", "uuid"),
+            ("client_name", "text", None),
+            ("timestamp", "timestamptz", "now"),
+        ],
+    },
+}
+
+SQLITE_TYPES = {
+    "uuid": "TEXT",
+    "text": "TEXT",
+    "timestamptz": "TEXT",
+    "integer": "INTEGER",
+    "numeric": "REAL",
+    "boolean": "INTEGER",
+    "jsonb": "TEXT",
+}
+
+# name -> callable(store, args) returning JSON-serializable data
+RPC_FUNCTIONS = {}
+
+
+def rpc(name):
+    """Register a Python stand-in for a database function in supabase/migrations"""
+    def register(fn):
+        RPC_FUNCTIONS[name] = fn
+        return fn
+    return register
+
+OPERATORS = {
+    "eq": "=",
+    "neq": "<>",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "like": "LIKE",
+    "ilike": "LIKE",
+}
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns", "or", "and"}
+
+
+def legacy_schema():
+    """SCHEMA as it was before orders gained payment_method/shipping_address and order groups"""
+    schema = {table: dict(spec) for table, spec in SCHEMA.items() if table != "order_groups"}
+    schema["orders"]["columns"] = [
+        c for c in SCHEMA["orders"]["columns"]
+        if c[0] not in ("payment_method", "shipping_address", "order_group_id")
+    ]
+    schema["orders"]["references"] = {"user_id": "users", "product_id": "products"}
+    return schema
+
+
+def fixture_product_ids(count=FIXTURE_PRODUCT_COUNT):
+    """Deterministic ids of the catalog rows created by load_fixtures()"""
+    return [str(uuid.uuid5(FIXTURE_NAMESPACE, f"product-{i}")) for i in range(count)]
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class PostgrestError(Exception):
+    """Error rendered in PostgREST's {code, message, details, hint} shape"""
+
+    def __init__(self, status, code, message, details=None, hint=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+        self.hint = hint
+
+    def to_dict(self):
+        return {"code": self.code, "message": self.message, "details": self.details, "hint": self.hint}
+
+
+def split_top_level(text, sep=","):
+    """Split on `sep` outside parentheses and double quotes"""
+    parts, depth, quoted, escaped, current = [], 0, False, False, []
+    for ch in text:
+        if escaped:
+            escaped = False
+        elif ch == "\\" and quoted:
+            escaped = True
+        elif ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == sep and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    if current:
+        parts.append("".join(current))
+    return parts
+
+
+def unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return value
+
+
+def parse_select(select):
+    """Parse `*,alias:table(cols)` into (columns, embeds)"""
+    columns, embeds = [], []
+    for item in split_top_level(select or "*"):
+        item = item.strip()
+        if not item:
+            continue
+        match = re.match(r"^(?:(\w+):)?(\w+)(?:!\w+)?\((.*)\)$", item)
+        if match:
+            alias, table, inner = match.groups()
+            embeds.append((alias or table, table, inner))
+            continue
+        alias, _, column = item.rpartition(":")
+        columns.append((alias or column, column.split("::")[0]))
+    return columns, embeds
+
+
+class Store:
+    """SQLite-backed tables plus the PostgREST query translation"""
+
+    def __init__(self, db_path=":memory:", schema=None):
+        self.schema = schema or SCHEMA
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.lock = threading.RLock()
+        self.auth_users = {}
+        self.create_tables()
+
+    # -- schema -------------------------------------------------------------
+
+    def create_tables(self):
+        with self.lock:
+            for table, spec in self.schema.items():
+                cols = []
+                for name, col_type, default in spec["columns"]:
+                    line = f'"{name}" {SQLITE_TYPES[col_type]}'
+                    if isinstance(default, int) and not isinstance(default, bool):
+                        line += f" DEFAULT {default}"
+                    if name == "id":
+                        line += " PRIMARY KEY"
+                    ref = spec.get("references", {}).get(name)
+                    if ref:
+                        line += f' REFERENCES "{ref}"(id) ON DELETE CASCADE'
+                    cols.append(line)
+                for unique in spec.get("unique", []):
+                    cols.append("UNIQUE (" + ", ".join(f'"{c}"' for c in unique) + ")")
+                self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(cols)})')
+                for index in spec.get("indexes", []):
+                    name = f"idx_{table}_{'_'.join(index)}"
+                    cols_sql = ", ".join(f'"{c}"' for c in index)
+                    self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({cols_sql})')
+                for ref_col in spec.get("references", {}):
+                    self.conn.execute(
+                        f'CREATE INDEX IF NOT EXISTS "idx_{table}_{ref_col}" ON "{table}" ("{ref_col}")'
+                    )
+            # Triggers last, once every table they write to exists
+            for spec in self.schema.values():
+                for trigger in spec.get("triggers", []):
+                    self.conn.execute(trigger)
+            self.conn.commit()
+
+    def columns(self, table):
+        return [c[0] for c in self.table_spec(table)["columns"]]
+
+    def column_types(self, table):
+        return {c[0]: c[1] for c in self.table_spec(table)["columns"]}
+
+    def table_spec(self, table):
+        spec = self.schema.get(table)
+        if spec is None:
+            raise PostgrestError(
+                404, "42P01", f'relation "public.{table}" does not exist'
+            )
+        return spec
+
+    def check_column(self, table, column):
+        if column not in self.column_types(table):
+            raise PostgrestError(400, "42703", f"column {table}.{column} does not exist")
+
+    # -- value conversion ---------------------------------------------------
+
+    def to_db(self, table, column, value):
+        col_type = self.column_types(table).get(column)
+        if value is None:
+            return None
+        if col_type == "boolean":
+            if isinstance(value, str):
+                return 1 if value.lower() == "true" else 0
+            return 1 if value else 0
+        if col_type == "jsonb" or isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return value
+
+    def from_db(self, table, row):
+        types = self.column_types(table)
+        out = {}
+        for key in row.keys():
+            value = row[key]
+            col_type = types.get(key)
+            if value is not None and col_type == "boolean":
+                value = bool(value)
+            elif value is not None and col_type == "jsonb":
+                value = json.loads(value)
+            out[key] = value
+        return out
+
+    # -- filters ------------------------------------------------------------
+
+    def condition(self, table, column, expr):
+        """Translate `op.value` (optionally prefixed by `not.`) into SQL"""
+        self.check_column(table, column)
+        negate = False
+        op, _, value = expr.partition(".")
+        if op == "not":
+            negate = True
+            op, _, value = value.partition(".")
+
+        if op == "is":
+            keyword = {"null": "NULL", "true": "1", "false": "0"}.get(value.lower())
+            if keyword is None:
+                raise PostgrestError(400, "PGRST100", f'failed to parse filter ({expr})')
+            sql = f'"{column}" IS {keyword}' if keyword == "NULL" else f'"{column}" = {keyword}'
+            params = []
+        elif op == "in":
+            inner = value.strip()
+            if not (inner.startswith("(") and inner.endswith(")")):
+                raise PostgrestError(400, "PGRST100", f'failed to parse filter ({expr})')
+            items = [unquote(v.strip()) for v in split_top_level(inner[1:-1]) if v.strip()]
+            if not items:
+                sql, params = "0", []
+            else:
+                sql = f'"{column}" IN ({", ".join("?" for _ in items)})'
+                params = [self.to_db(table, column, v) for v in items]
+        elif op in OPERATORS:
+            if op in ("like", "ilike"):
+                value = value.replace("*", "%")
+            if op == "ilike":
+                sql = f'LOWER("{column}") LIKE LOWER(?)'
+            else:
+                sql = f'"{column}" {OPERATORS[op]} ?'
+            if op in ("like", "ilike"):
+                # Backslash escapes % and _ as it does in Postgres
+                sql += " ESCAPE '\\'"
+            params = [self.to_db(table, column, unquote(value))]
+        else:
+            raise PostgrestError(400, "PGRST100", f'"failed to parse filter ({expr})"')
+
+        if negate:
+            sql = f"NOT ({sql})"
+        return sql, params
+
+    def logic_tree(self, table, joiner, body):
+        """Translate `or=(a.eq.1,and(b.gt.2,c.lt.3))` bodies into SQL"""
+        body = body.strip()
+        if body.startswith("(") and body.endswith(")"):
+            body = body[1:-1]
+        clauses, params = [], []
+        for item in split_top_level(body):
+            item = item.strip()
+            nested = re.match(r"^(not\.)?(and|or)\((.*)\)$", item)
+            if nested:
+                sql, p = self.logic_tree(table, nested.group(2), nested.group(3))
+                if nested.group(1):
+                    sql = f"NOT {sql}"
+            else:
+                column, _, expr = item.partition(".")
+                sql, p = self.condition(table, column, expr)
+            clauses.append(sql)
+            params.extend(p)
+        return "(" + f" {joiner.upper()} ".join(clauses) + ")", params
+
+    def where(self, table, query):
+        clauses, params = [], []
+        for key, value in query:
+            if key in ("or", "and"):
+                sql, p = self.logic_tree(table, key, value)
+            elif key in RESERVED_PARAMS or "." in key:
+                continue
+            else:
+                sql, p = self.condition(table, key, value)
+            clauses.append(sql)
+            params.extend(p)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def order_by(self, table, order):
+        if not order:
+            return ""
+        terms = []
+        for term in order.split(","):
+            parts = term.split(".")
+            column = parts[0]
+            self.check_column(table, column)
+            direction = "DESC" if "desc" in parts[1:] else "ASC"
+            # Postgres default: NULLs sort as if larger than every value
+            nulls = " NULLS FIRST" if direction == "DESC" else " NULLS LAST"
+            if "nullsfirst" in parts[1:]:
+                nulls = " NULLS FIRST"
+            elif "nullslast" in parts[1:]:
+                nulls = " NULLS LAST"
+            terms.append(f'"{column}" {direction}{nulls}')
+        return " ORDER BY " + ", ".join(terms)
+
+    # -- projection / embedding ---------------------------------------------
+
+    def project(self, table, rows, select):
+        columns, embeds = parse_select(select)
+        all_columns = self.columns(table)
+        for alias, column in columns:
+            if column != "*":
+                self.check_column(table, column)
+
+        for alias, embedded, inner in embeds:
+            self.embed(table, rows, alias, embedded, inner)
+
+        embed_aliases = [alias for alias, _, _ in embeds]
+        out = []
+        for row in rows:
+            item = {}
+            for alias, column in columns:
+                if column == "*":
+                    for c in all_columns:
+                        item[c] = row.get(c)
+                else:
+                    item[alias] = row.get(column)
+            for alias in embed_aliases:
+                item[alias] = row.get(alias)
+            out.append(item)
+        return out
+
+    def embed(self, table, rows, alias, embedded, inner):
+        """Attach a many-to-one (`<embedded>_id`) or one-to-many resource"""
+        self.table_spec(embedded)
+        fk = embedded[:-1] + "_id" if embedded.endswith("s") else embedded + "_id"
+        back_fk = (table[:-1] if table.endswith("s") else table) + "_id"
+
+        if fk in self.column_types(table):
+            ids = sorted({r[fk] for r in rows if r.get(fk)})
+            related = self.fetch(embedded, [("id", f"in.({','.join(ids)})")]) if ids else []
+            by_id = {r["id"]: r for r in related}
+            projected = {r["id"]: p for r, p in zip(related, self.project(embedded, related, inner))}
+            for row in rows:
+                row[alias] = projected.get(row.get(fk)) if row.get(fk) in by_id else None
+        elif back_fk in self.column_types(embedded):
+            ids = sorted({r["id"] for r in rows})
+            related = self.fetch(embedded, [(back_fk, f"in.({','.join(ids)})")]) if ids else []
+            grouped = {}
+            for r, p in zip(related, self.project(embedded, related, inner)):
+                grouped.setdefault(r[back_fk], []).append(p)
+            for row in rows:
+                row[alias] = grouped.get(row["id"], [])
+        else:
+            raise PostgrestError(
+                400, "PGRST200",
+                f"Could not find a relationship between '{table}' and '{embedded}' in the schema cache"
+            )
+
+    # -- CRUD ---------------------------------------------------------------
+
+    def fetch(self, table, query, order=None, limit=None, offset=None):
+        self.table_spec(table)
+        where, params = self.where(table, query)
+        sql = f'SELECT * FROM "{table}"{where}{self.order_by(table, order)}'
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+            if offset:
+                sql += f" OFFSET {int(offset)}"
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self.from_db(table, r) for r in rows]
+
+    def count(self, table, query):
+        where, params = self.where(table, query)
+        with self.lock:
+            return self.conn.execute(f'SELECT COUNT(*) FROM "{table}"{where}', params).fetchone()[0]
+
+    def select(self, table, query):
+        params = dict(query)
+        rows = self.fetch(
+            table, query,
+            order=params.get("order"),
+            limit=params.get("limit"),
+            offset=params.get("offset"),
+        )
+        return self.project(table, rows, params.get("select", "*"))
+
+    def prepare_row(self, table, values, columns=None):
+        types = self.column_types(table)
+        for key in values:
+            if key not in types:
+                raise PostgrestError(
+                    400, "PGRST204",
+                    f"Could not find the '{key}' column of '{table}' in the schema cache"
+                )
+        row = {}
+        for name, _, default in self.table_spec(table)["columns"]:
+            if name in values and (columns is None or name in columns):
+                row[name] = self.to_db(table, name, values[name])
+            elif default == "uuid":
+                row[name] = str(uuid.uuid4())
+            elif default == "now":
+                row[name] = now_iso()
+            elif default is not None:
+                row[name] = self.to_db(table, name, default)
+        return row
+
+    def insert(self, table, values, columns=None, on_conflict=None, resolution=None):
+        self.table_spec(table)
+        records = values if isinstance(values, list) else [values]
+        ids = []
+        with self.lock:
+            try:
+                for record in records:
+                    row = self.prepare_row(table, record, columns)
+                    names = list(row)
+                    cols_sql = ", ".join(f'"{n}"' for n in names)
+                    sql = f'INSERT INTO "{table}" ({cols_sql}) VALUES ({", ".join("?" for _ in names)})'
+                    if resolution:
+                        target = on_conflict or "id"
+                        target_cols = [c.strip() for c in target.split(",")]
+                        if resolution == "ignore-duplicates":
+                            sql += f' ON CONFLICT ({", ".join(target_cols)}) DO NOTHING'
+                        else:
+                            updates = [n for n in names if n in record and n not in target_cols]
+                            set_sql = ", ".join(f'"{n}" = excluded."{n}"' for n in updates)
+                            set_sql = set_sql or f'"{target_cols[0]}" = excluded."{target_cols[0]}"'
+                            sql += f' ON CONFLICT ({", ".join(target_cols)}) DO UPDATE SET {set_sql}'
+                    sql += " RETURNING id"
+                    returned = self.conn.execute(sql, [row[n] for n in names]).fetchone()
+                    if returned is not None:
+                        ids.append(returned[0])
+                self.conn.commit()
+            except sqlite3.IntegrityError as e:
+                self.conn.rollback()
+                raise self.integrity_error(table, e)
+        return self.fetch_ids(table, ids)
+
+    def bulk_insert(self, table, records, batch_size=5000):
+        """INSERT OR IGNORE `records` (an iterable of dicts with the same keys)
+        in executemany batches; rows whose key already exists are skipped, so
+        re-running a seeder is harmless"""
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            return
+        names = list(first)
+        for name in names:
+            self.check_column(table, name)
+        cols_sql = ", ".join(f'"{n}"' for n in names)
+        sql = f'INSERT OR IGNORE INTO "{table}" ({cols_sql}) VALUES ({", ".join("?" for _ in names)})'
+        rows = ([self.to_db(table, n, r[n]) for n in names] for r in chain([first], records))
+        try:
+            self._insert_batches(sql, rows, batch_size)
+        except sqlite3.IntegrityError as e:
+            raise self.integrity_error(table, e)
+
+    def update(self, table, values, query):
+        self.table_spec(table)
+        row = {}
+        for key, value in values.items():
+            self.check_column(table, key)
+            row[key] = self.to_db(table, key, value)
+        where, params = self.where(table, query)
+        with self.lock:
+            ids = [r[0] for r in self.conn.execute(f'SELECT id FROM "{table}"{where}', params)]
+            if row and ids:
+                set_sql = ", ".join(f'"{k}" = ?' for k in row)
+                try:
+                    self.conn.execute(
+                        f'UPDATE "{table}" SET {set_sql}{where}', list(row.values()) + params
+                    )
+                    self.conn.commit()
+                except sqlite3.IntegrityError as e:
+                    self.conn.rollback()
+                    raise self.integrity_error(table, e)
+        return self.fetch_ids(table, ids)
+
+    def delete(self, table, query):
+        self.table_spec(table)
+        where, params = self.where(table, query)
+        with self.lock:
+            rows = [self.from_db(table, r) for r in self.conn.execute(f'SELECT * FROM "{table}"{where}', params)]
+            self.conn.execute(f'DELETE FROM "{table}"{where}', params)
+            self.conn.commit()
+        return rows
+
+    def fetch_ids(self, table, ids):
+        if not ids:
+            return []
+        by_id = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            with self.lock:
+                rows = self.conn.execute(
+                    f'SELECT * FROM "{table}" WHERE id IN ({", ".join("?" for _ in chunk)})', chunk
+                ).fetchall()
+            for r in rows:
+                by_id[r["id"]] = self.from_db(table, r)
+        return [by_id[i] for i in ids if i in by_id]
+
+    def integrity_error(self, table, error):
+        message = str(error)
+        if "FOREIGN KEY" in message:
+            return PostgrestError(
+                409, "23503",
+                f'insert or update on table "{table}" violates foreign key constraint',
+                details=message,
+            )
+        if "UNIQUE" in message or "PRIMARY KEY" in message:
+            return PostgrestError(
+                409, "23505",
+                f'duplicate key value violates unique constraint on table "{table}"',
+                details=message,
+            )
+        return PostgrestError(400, "23502", message)
+
+    # -- auth ---------------------------------------------------------------
+
+    def create_auth_user(self, email, password):
+        with self.lock:
+            if any(u["email"] == email for u in self.auth_users.values()):
+                raise PostgrestError(422, "email_exists", "A user with this email address has already been registered")
+            user = {
+                "id": str(uuid.uuid4()),
+                "aud": "authenticated",
+                "role": "authenticated",
+                "email": email,
+                "email_confirmed_at": now_iso(),
+                "created_at": now_iso(),
+                "app_metadata": {},
+                "user_metadata": {},
+            }
+            self.auth_users[user["id"]] = user
+        return user
+
+    # -- seeding ------------------------------------------------------------
+
+    def _insert_batches(self, sql, rows, batch_size=5000):
+        """executemany `sql` over the `rows` iterator, committing every
+        `batch_size` rows so a large seed never sits in memory at once"""
+        rows = iter(rows)
+        while batch := list(islice(rows, batch_size)):
+            with self.lock:
+                try:
+                    self.conn.executemany(sql, batch)
+                    self.conn.commit()
+                except sqlite3.IntegrityError:
+                    self.conn.rollback()
+                    raise
+
+    # The seed_* rows come from tests.seed_data's Generator, so the stand-in
+    # and the bulk seeder load the same data. It is imported on use because
+    # seed_data itself imports this module.
+
+    def _seed_users(self, count, seed):
+        """Insert the first `count` seed_users() rows if missing and return their ids"""
+        from tests.seed_data import Generator
+
+        self.seed_users(count, seed)
+        generator = Generator(seed, {})
+        return [generator.row_id("users", i) for i in range(count)]
+
+    def seed_products(self, count, seed=0, batch_size=5000):
+        """Bulk-load the first `count` catalog rows of the bulk seeder"""
+        from tests.seed_data import Generator
+
+        generator = Generator(seed, {})
+        self.bulk_insert("products", (generator.product(i) for i in range(count)), batch_size)
+
+    def seed_users(self, count, seed=0, batch_size=5000):
+        """Bulk-load the first `count` users of the bulk seeder: customers with
+        a few admins and some rows without a name"""
+        from tests.seed_data import Generator
+
+        generator = Generator(seed, {})
+        self.bulk_insert("users", (generator.user(i) for i in range(count)), batch_size)
+
+    def seed_reviews(self, product_ids, per_product, seed=0, reviewers=200, batch_size=5000):
+        """Bulk-load `per_product` deterministic reviews on each product, written
+        by `reviewers` seeded users; the reviews trigger fills the summaries"""
+        rng = random.Random(seed)
+        user_ids = self._seed_users(reviewers, seed)
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+        weights = [0.05, 0.07, 0.15, 0.33, 0.40]
+
+        def rows():
+            for product_id in product_ids:
+                for i in range(per_product):
+                    rating = rng.choices(range(1, 6), weights)[0]
+                    yield {
+                        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                        "product_id": product_id,
+                        "user_id": user_ids[rng.randrange(len(user_ids))],
+                        "rating": rating,
+                        "review_text": f"Seeded {rating}-star review {i} " + "lorem ipsum " * rng.randrange(2, 20),
+                        "created_at": datetime.fromtimestamp(base + i * 90, timezone.utc).isoformat(),
+                    }
+
+        self.bulk_insert("reviews", rows(), batch_size)
+
+    def seed_orders(self, count, seed=0, customers=1000, batch_size=10000):
+        """Bulk-load `count` deterministic order lines, oldest first, placed by
+        `customers` seeded users over the fixture catalog. Each line is its own
+        checkout, priced from the catalog like lib/pricing.js, with an
+        order_groups row unless the orders table predates order groups."""
+        from tests.seed_data import ORDER_STATUSES, PAYMENT_METHODS
+
+        rng = random.Random(seed)
+        product_ids = fixture_product_ids()
+        prices = {p["id"]: p["price"] for p in self.fetch_ids("products", product_ids)}
+        grouped = "order_group_id" in self.columns("orders")
+        user_ids = self._seed_users(customers, seed)
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+        def checkout(i):
+            product_id = product_ids[rng.randrange(len(product_ids))]
+            quantity = rng.randint(1, 5)
+            total = round_money(prices[product_id] * quantity)
+            pincode = f"{rng.randint(1, 9)}{rng.randrange(10 ** 5):05d}"
+            line = {
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "user_id": user_ids[rng.randrange(len(user_ids))],
+                "product_id": product_id,
+                "quantity": quantity,
+                "total_price": total,
+                "status": rng.choice(ORDER_STATUSES),
+                "created_at": datetime.fromtimestamp(base + i * 30, timezone.utc).isoformat(),
+            }
+            if not grouped:
+                return None, line
+            group = {
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "user_id": line["user_id"],
+                "item_count": 1,
+                "subtotal": total,
+                "discount": 0,
+                "shipping": shipping_for(pincode),
+                "total_amount": round_money(total + shipping_for(pincode)),
+                "promo_code": None,
+                "payment_method": rng.choice(PAYMENT_METHODS),
+                "shipping_address": f"{rng.randint(1, 999)} Seed Street, Seedville {pincode}",
+                "created_at": line["created_at"],
+            }
+            line.update(payment_method=group["payment_method"], shipping_address=group["shipping_address"],
+                        order_group_id=group["id"])
+            return group, line
+
+        # Groups go in before the lines of the same batch that reference them
+        for start in range(0, count, batch_size):
+            checkouts = [checkout(i) for i in range(start, min(count, start + batch_size))]
+            if grouped:
+                self.bulk_insert("order_groups", (group for group, _ in checkouts), batch_size)
+            self.bulk_insert("orders", (line for _, line in checkouts), batch_size)
+
+    def load_fixtures(self):
+        """The fixed user/product the legacy scripts hardcode, plus a small catalog"""
+        self.insert("users", {"id": TEST_USER_ID, "email": "test@example.com", "name": "Test User", "role": "user"})
+        self.insert("products", {
+            "id": TEST_PRODUCT_ID,
+            "name": "Cotton T-Shirt",
+            "description": "Fixture product for offline test runs",
+            "price": 25.0,
+            "category": "Clothing",
+            "image_url": "https://example.com/tshirt.png",
+        })
+        self.insert("products", [
+            {
+                "id": product_id,
+                "name": f"Fixture Product {i}",
+                "description": "Fixture product for offline test runs",
+                "price": float(10 + (i * 37) % 490),
+                "category": FIXTURE_CATEGORIES[i % len(FIXTURE_CATEGORIES)],
+                "image_url": f"https://example.com/product-{i}.png",
+            }
+            for i, product_id in enumerate(fixture_product_ids())
+        ])
+
+
+@rpc("add_to_cart")
+def rpc_add_to_cart(store, args):
+    """INSERT ... ON CONFLICT (user_id, product_id) DO UPDATE SET qty = qty + excluded.qty"""
+    ts = now_iso()
+    with store.lock:
+        try:
+            row = store.conn.execute(
+                'INSERT INTO "cart" (id, user_id, product_id, qty, created_at, updated_at) '
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id, product_id) DO UPDATE "
+                "SET qty = cart.qty + excluded.qty, updated_at = excluded.updated_at "
+                "RETURNING *",
+                [str(uuid.uuid4()), args.get("p_user_id"), args.get("p_product_id"),
+                 max(args.get("p_qty") or 1, 1), ts, ts],
+            ).fetchone()
+            store.conn.commit()
+        except sqlite3.IntegrityError as e:
+            store.conn.rollback()
+            raise store.integrity_error("cart", e)
+    return [store.from_db("cart", row)]
+
+
+@rpc("set_cart_qty")
+def rpc_set_cart_qty(store, args):
+    """UPDATE cart SET qty = p_qty WHERE id = p_id RETURNING *"""
+    with store.lock:
+        rows = store.conn.execute(
+            'UPDATE "cart" SET qty = ?, updated_at = ? WHERE id = ? RETURNING *',
+            [args.get("p_qty"), now_iso(), args.get("p_id")],
+        ).fetchall()
+        store.conn.commit()
+    return [store.from_db("cart", r) for r in rows]
+
+
+@rpc("add_to_cart_batch")
+def rpc_add_to_cart_batch(store, args):
+    """Upsert every {product_id, qty} in p_items, summing duplicates first"""
+    totals = {}
+    for item in args.get("p_items") or []:
+        totals[item["product_id"]] = totals.get(item["product_id"], 0) + max(item.get("qty") or 1, 1)
+    rows = []
+    with store.lock:
+        for product_id, qty in totals.items():
+            rows.extend(rpc_add_to_cart(store, {
+                "p_user_id": args.get("p_user_id"), "p_product_id": product_id, "p_qty": qty
+            }))
+    return rows
+
+
+@rpc("set_cart_qty_batch")
+def rpc_set_cart_qty_batch(store, args):
+    """Set qty for every {id, qty} in p_items owned by p_user_id"""
+    rows = []
+    with store.lock:
+        for item in args.get("p_items") or []:
+            rows.extend(store.conn.execute(
+                'UPDATE "cart" SET qty = ?, updated_at = ? WHERE id = ? AND user_id = ? RETURNING *',
+                [item.get("qty"), now_iso(), item.get("id"), args.get("p_user_id")],
+            ).fetchall())
+        store.conn.commit()
+    return [store.from_db("cart", r) for r in rows]
+
+
+@rpc("place_order")
+def rpc_place_order(store, args):
+    """Insert the order_groups row and one orders row per p_items entry in one transaction"""
+    group_id = str(uuid.uuid4())
+    items = args.get("p_items") or []
+    ts = now_iso()
+    with store.lock:
+        try:
+            store.conn.execute(
+                'INSERT INTO "order_groups" (id, user_id, item_count, subtotal, discount, shipping, '
+                "total_amount, promo_code, payment_method, shipping_address, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [group_id, args.get("p_user_id"), len(items), args.get("p_subtotal"),
+                 args.get("p_discount") or 0, args.get("p_shipping") or 0, args.get("p_total_amount"),
+                 args.get("p_promo_code"), args.get("p_payment_method"), args.get("p_shipping_address"), ts],
+            )
+            rows = [
+                store.conn.execute(
+                    'INSERT INTO "orders" (id, user_id, product_id, quantity, total_price, status, '
+                    "payment_method, shipping_address, order_group_id, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?) RETURNING *",
+                    [str(uuid.uuid4()), args.get("p_user_id"), item.get("product_id"), item.get("quantity"),
+                     item.get("total_price"), args.get("p_payment_method"), args.get("p_shipping_address"),
+                     group_id, ts],
+                ).fetchone()
+                for item in items
+            ]
+            store.conn.commit()
+        except sqlite3.IntegrityError as e:
+            store.conn.rollback()
+            raise store.integrity_error("orders", e)
+    return [store.from_db("orders", r) for r in rows]
+
+
+PRICE_BOUNDS = [0, 500, 1000, 2500, 5000]
+
+
+@rpc("product_facets")
+def rpc_product_facets(store, args):
+    """Category and price-bucket counts; each facet ignores its own filter"""
+    search = args.get("p_search")
+    category = args.get("p_category")
+    min_price = args.get("p_min_price")
+    max_price = args.get("p_max_price")
+    bounds = args.get("p_price_bounds") or PRICE_BOUNDS
+
+    search_sql, search_params = "1", []
+    if search:
+        pattern = f"%{search.lower()}%"
+        search_sql = ("(LOWER(name) LIKE ? ESCAPE '\\' OR LOWER(description) LIKE ? ESCAPE '\\' "
+                      "OR LOWER(category) LIKE ? ESCAPE '\\')")
+        search_params = [pattern, pattern, pattern]
+
+    def filters(use_category=True, use_price=True):
+        sql, params = [search_sql], list(search_params)
+        if use_category and category:
+            sql.append("category = ?")
+            params.append(category)
+        if use_price and min_price is not None:
+            sql.append("price >= ?")
+            params.append(min_price)
+        if use_price and max_price is not None:
+            sql.append("price <= ?")
+            params.append(max_price)
+        return " AND ".join(sql), params
+
+    with store.lock:
+        where, params = filters()
+        total = store.conn.execute(f"SELECT COUNT(*) FROM products WHERE {where}", params).fetchone()[0]
+        max_row = store.conn.execute(f"SELECT MAX(price) FROM products WHERE {search_sql}", search_params).fetchone()
+
+        where, params = filters(use_category=False)
+        categories = [
+            {"category": r[0], "count": r[1]}
+            for r in store.conn.execute(
+                f"SELECT category, COUNT(*) FROM products WHERE {where} GROUP BY category ORDER BY category", params
+            )
+        ]
+
+        where, params = filters(use_price=False)
+        buckets = []
+        for i, lower in enumerate(bounds):
+            upper = bounds[i + 1] if i + 1 < len(bounds) else None
+            sql = f"SELECT COUNT(*) FROM products WHERE {where} AND price >= ?"
+            bucket_params = params + [lower]
+            if upper is not None:
+                sql += " AND price < ?"
+                bucket_params.append(upper)
+            count = store.conn.execute(sql, bucket_params).fetchone()[0]
+            buckets.append({"min": lower, "max": upper, "count": count})
+
+    return {"total": total, "max_price": max_row[0], "categories": categories, "price_buckets": buckets}
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP calls to the Store using PostgREST conventions"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "LocalSupabase/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # -- plumbing -----------------------------------------------------------
+
+    def inject_latency(self):
+        latency = self.server.latency_ms
+        jitter = self.server.jitter_ms
+        if latency or jitter:
+            time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)) / 1000.0)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        return json.loads(self.rfile.read(length))
+
+    def prefer(self):
+        values = {}
+        for part in (self.headers.get("Prefer") or "").split(","):
+            key, _, value = part.strip().partition("=")
+            if key:
+                values[key] = value
+        return values
+
+    def send_json(self, status, payload, headers=None, head=False):
+        body = b"" if payload is None else json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", "0" if head else str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def send_error_json(self, error):
+        self.send_json(error.status, error.to_dict())
+
+    def dispatch(self, method):
+        self.inject_latency()
+        parts = urlsplit(self.path)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        path = parts.path.rstrip("/")
+        try:
+            if path.startswith("/rest/v1/rpc/"):
+                self.handle_rpc(path[len("/rest/v1/rpc/"):])
+            elif path.startswith("/rest/v1/"):
+                self.handle_table(method, path[len("/rest/v1/"):], query)
+            elif path.startswith("/auth/v1/admin/users"):
+                self.handle_auth(method, path[len("/auth/v1/admin/users"):].strip("/"))
+            else:
+                self.send_json(404, {"message": f"no route for {path}"})
+        except PostgrestError as e:
+            self.send_error_json(e)
+        except (ValueError, sqlite3.Error) as e:
+            self.send_error_json(PostgrestError(400, "PGRST100", str(e)))
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_HEAD(self):
+        self.dispatch("HEAD")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    # -- resources ----------------------------------------------------------
+
+    def respond_rows(self, status, table, rows, query, prefer, head=False):
+        """Render rows honoring select, return=, count= and single-object Accept"""
+        store = self.server.store
+        headers = {}
+        if prefer.get("count") in ("exact", "planned", "estimated"):
+            total = store.count(table, query)
+            headers["Content-Range"] = f"0-{len(rows) - 1}/{total}" if rows else f"*/{total}"
+        else:
+            headers["Content-Range"] = f"0-{len(rows) - 1}/*" if rows else "*/*"
+
+        if self.command != "GET" and self.command != "HEAD" and prefer.get("return") != "representation":
+            self.send_json(204 if self.command != "POST" else 201, None, headers)
+            return
+
+        params = dict(query)
+        rows = store.project(table, rows, params.get("select", "*"))
+        self.send_rows(status, rows, headers, head)
+
+    def send_rows(self, status, rows, headers=None, head=False):
+        """Send a row list, or one object when .single()/.maybeSingle() asked for it"""
+        if "vnd.pgrst.object" in (self.headers.get("Accept") or ""):
+            if len(rows) != 1:
+                self.send_json(406, {
+                    "code": "PGRST116",
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                    "details": f"The result contains {len(rows)} rows",
+                    "hint": None,
+                })
+                return
+            self.send_json(status, rows[0], headers, head)
+            return
+        self.send_json(status, rows, headers, head)
+
+    def handle_table(self, method, table, query):
+        store = self.server.store
+        prefer = self.prefer()
+        params = dict(query)
+
+        if method in ("GET", "HEAD"):
+            rows = store.fetch(table, query, params.get("order"), params.get("limit"), params.get("offset"))
+            self.respond_rows(200, table, rows, query, prefer, head=method == "HEAD")
+        elif method == "POST":
+            columns = None
+            if params.get("columns"):
+                columns = {unquote(c) for c in params["columns"].split(",")}
+            resolution = prefer.get("resolution")
+            rows = store.insert(table, self.read_body(), columns, params.get("on_conflict"), resolution)
+            self.respond_rows(201, table, rows, query, prefer)
+        elif method == "PATCH":
+            rows = store.update(table, self.read_body() or {}, query)
+            self.respond_rows(200, table, rows, query, prefer)
+        elif method == "DELETE":
+            rows = store.delete(table, query)
+            self.respond_rows(200, table, rows, query, prefer)
+
+    def handle_rpc(self, name):
+        fn = RPC_FUNCTIONS.get(name)
+        if fn is None:
+            raise PostgrestError(
+                404, "PGRST202",
+                f"Could not find the function public.{name} in the schema cache"
+            )
+        result = fn(self.server.store, self.read_body() or {})
+        if isinstance(result, list):
+            self.send_rows(200, result)
+        else:
+            self.send_json(200, result)
+
+    def handle_auth(self, method, user_id):
+        store = self.server.store
+        if method == "POST" and not user_id:
+            body = self.read_body() or {}
+            try:
+                user = store.create_auth_user(body.get("email"), body.get("password"))
+            except PostgrestError as e:
+                self.send_json(e.status, {"code": e.status, "error_code": e.code, "msg": e.message})
+                return
+            self.send_json(200, user)
+        elif method == "GET" and not user_id:
+            self.send_json(200, {"users": list(store.auth_users.values()), "aud": "authenticated"})
+        elif method == "GET":
+            user = store.auth_users.get(user_id)
+            self.send_json(200 if user else 404, user or {"msg": "User not found"})
+        elif method == "DELETE":
+            store.auth_users.pop(user_id, None)
+            self.send_json(200, {})
+        else:
+            self.send_json(405, {"msg": "method not allowed"})
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class LocalSupabase:
+    """Background-thread server; use as a context manager from tests/"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0,
+                 db_path=":memory:", fixtures=True, verbose=False, schema=None):
+        self.store = Store(db_path, schema)
+        if fixtures:
+            self.store.load_fixtures()
+        self.httpd = StandInServer((host, port), RequestHandler)
+        self.httpd.store = self.store
+        self.httpd.latency_ms = latency_ms
+        self.httpd.jitter_ms = jitter_ms
+        self.httpd.verbose = verbose
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def set_latency(self, latency_ms, jitter_ms=0.0):
+        self.httpd.latency_ms = latency_ms
+        self.httpd.jitter_ms = jitter_ms
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline Supabase/PostgREST stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="+/- uniform jitter on the delay")
+    parser.add_argument("--db", default=":memory:", help="SQLite file (default: in-memory)")
+    parser.add_argument("--seed-products", type=int, default=0, help="bulk-load this many catalog rows")
+    parser.add_argument("--seed-users", type=int, default=0, help="bulk-load this many customer rows")
+    parser.add_argument("--seed-reviews", type=int, default=0,
+                        help="bulk-load this many reviews on each fixture product")
+    parser.add_argument("--seed-orders", type=int, default=0,
+                        help="bulk-load this many order lines for seeded customers")
+    parser.add_argument("--legacy-orders", action="store_true",
+                        help="orders table without payment_method/shipping_address")
+    parser.add_argument("--no-fixtures", action="store_true", help="skip the fixture user and catalog rows")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = LocalSupabase(
+        args.host, args.port, args.latency_ms, args.jitter_ms,
+        args.db, fixtures=not args.no_fixtures, verbose=args.verbose,
+        schema=legacy_schema() if args.legacy_orders else None
+    )
+    if args.seed_products:
+        server.store.seed_products(args.seed_products)
+    if args.seed_users:
+        server.store.seed_users(args.seed_users)
+    if args.seed_reviews:
+        server.store.seed_reviews([TEST_PRODUCT_ID] + fixture_product_ids(), args.seed_reviews)
+    if args.seed_orders:
+        server.store.seed_orders(args.seed_orders)
+    print(f"Local Supabase stand-in listening on {server.url}")
+    print(f"Injected latency: {args.latency_ms}ms +/- {args.jitter_ms}ms")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
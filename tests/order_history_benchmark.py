@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Order History Benchmark - Dashboard orders with one batched product join
+
+For each history size in --sizes, gives a fresh user that many order lines
+in the stand-in and loads their dashboard both ways:
+
+    api     GET /api/orders?view=history - one page of lines plus one
+            batched product lookup, read back from Server-Timing db;count
+    legacy  what app/dashboard/page.js did before: every order line from
+            the Supabase REST endpoint, then one products request per line,
+            --legacy-concurrency at a time (a browser's per-host limit)
+
+Database round trips for the api path must stay the same at every size;
+the legacy path makes 1 + N. Use --latency-ms to model a remote database,
+which is where the N requests hurt.
+
+The app has to point at the stand-in port this script serves on:
+    NEXT_PUBLIC_SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_ROLE_KEY=local next start &
+    python -m tests.order_history_benchmark --sizes 10,100,1000 --latency-ms 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from tests.api_client import ShopClient, add_target_arguments
+from tests.local_supabase import LocalSupabase, fixture_product_ids
+
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "local")
+
+
+def seed_history(store, size, seed):
+    """A new user with `size` order lines, one a day going back from today"""
+    rng = random.Random(seed)
+    product_ids = fixture_product_ids()
+    user_id = str(uuid.uuid4())
+    store.insert("users", {"id": user_id, "email": f"history_{user_id[:8]}@example.com",
+                           "name": "History Test", "role": "user"})
+    now = datetime.now(timezone.utc)
+    store.insert("orders", [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "product_id": rng.choice(product_ids),
+            "quantity": rng.randint(1, 3),
+            "total_price": round(rng.uniform(10, 500), 2),
+            "status": rng.choice(["pending", "completed", "cancelled"]),
+            "created_at": (now - timedelta(days=i)).isoformat(),
+        }
+        for i in range(size)
+    ])
+    return user_id
+
+
+def load_api(client, user_id, limit):
+    start = time.perf_counter()
+    response = client.order_history(user_id, limit=limit).raise_for_status()
+    elapsed = time.perf_counter() - start
+    db = response.server_timing.get("db", {})
+    return elapsed, db.get("count"), len(response.json()["data"])
+
+
+def load_legacy(supabase_url, user_id, concurrency):
+    session = requests.Session()
+    session.headers.update({"apikey": SUPABASE_ANON_KEY, "Authorization": f"Bearer {SUPABASE_ANON_KEY}"})
+    rest = f"{supabase_url}/rest/v1"
+
+    def product(order):
+        response = session.get(f"{rest}/products", params={
+            "select": "name,image_url,category", "id": f"eq.{order['product_id']}"
+        })
+        response.raise_for_status()
+        return response.json()
+
+    start = time.perf_counter()
+    response = session.get(f"{rest}/orders", params={
+        "select": "*", "user_id": f"eq.{user_id}", "order": "created_at.desc"
+    })
+    response.raise_for_status()
+    orders = response.json()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(product, orders))
+    return time.perf_counter() - start, 1 + len(orders), len(orders)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Order history round trips: batched join vs per-order lookups")
+    add_target_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1", help="stand-in host the app is configured for")
+    parser.add_argument("--port", type=int, default=54321, help="stand-in port the app is configured for")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay the stand-in adds to every request")
+    parser.add_argument("--sizes", default="10,100,500,1000", help="comma-separated order lines per user")
+    parser.add_argument("--limit", type=int, default=20, help="page size requested from the api")
+    parser.add_argument("--repeat", type=int, default=5, help="loads per size and path (median is reported)")
+    parser.add_argument("--legacy-concurrency", type=int, default=6, help="parallel product requests")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    client = ShopClient.from_args(args, timeout=120)
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    print("=" * 70)
+    print("ORDER HISTORY BENCHMARK - BATCHED JOIN VS PER-ORDER LOOKUPS")
+    print("=" * 70)
+    print(f"App: {client.base_url}")
+    print(f"Stand-in: http://{args.host}:{args.port} (latency {args.latency_ms}ms)")
+    print()
+
+    rows = []
+    with LocalSupabase(args.host, args.port, latency_ms=args.latency_ms) as supabase:
+        for size in sizes:
+            user_id = seed_history(supabase.store, size, args.seed + size)
+            api = sorted(load_api(client, user_id, args.limit) for _ in range(args.repeat))
+            legacy = sorted(load_legacy(supabase.url, user_id, args.legacy_concurrency) for _ in range(args.repeat))
+            rows.append((size, api[len(api) // 2], legacy[len(legacy) // 2]))
+
+    print(f"{'ORDERS':>8}{'API ms':>10}{'API TRIPS':>11}{'ROWS':>6}{'LEGACY ms':>12}{'LEGACY TRIPS':>14}")
+    for size, (api_s, api_trips, api_rows), (legacy_s, legacy_trips, _) in rows:
+        print(f"{size:>8}{api_s * 1000:>10.1f}{api_trips if api_trips is not None else '?':>11}{api_rows:>6}"
+              f"{legacy_s * 1000:>12.1f}{legacy_trips:>14}")
+    print()
+
+    trips = {api[1] for _, api, _ in rows}
+    pages = all(api[2] == min(size, args.limit) for size, api, _ in rows)
+    success = True
+    if None in trips:
+        print("❌ Responses carried no Server-Timing db count")
+        success = False
+    elif len(trips) != 1:
+        print(f"❌ API round trips changed with history size: {sorted(trips)}")
+        success = False
+    if not pages:
+        print(f"❌ API pages did not hold min(size, {args.limit}) rows")
+        success = False
+    if success:
+        print(f"✅ PASS - {trips.pop()} database round trips per page at every history size")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Page Render Benchmark - Pre-rendered vs client-rendered product pages
+
+Loads /products and /products/<id> both ways and reports time to first byte
+and time to content:
+
+    ssr     the pages as served now: one GET, streamed; content is the first
+            byte that carries the product markup (products-grid /
+            product-title). X-Nextjs-Cache is reported (HIT, STALE, MISS).
+    csr     what the client-rendered pages cost before: the HTML shell, then
+            its <script> chunks in parallel, then the API call the page made
+            on mount. No JavaScript is executed, so this is a lower bound on
+            the real browser time.
+
+--check-revalidation also renames the product through PUT /api/products/<id>,
+checks the very next page load shows the new name (on-demand revalidation,
+not the 5 minute timer), then puts the name back.
+
+Run against a production build (`next build && next start`); in `next dev`
+every page renders on every request.
+
+Usage:
+    python -m tests.page_render_benchmark
+    python -m tests.page_render_benchmark --product-id <uuid> --repeat 20 --check-revalidation
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+
+from tests.api_client import ShopClient, add_target_arguments
+
+TEST_PRODUCT_ID = os.environ.get("TEST_PRODUCT_ID", "868f777a-a525-4cc3-a4a1-86e0b813495e")
+
+CONTENT_MARKERS = {"catalog": b'id="products-grid"', "detail": b'id="product-title"'}
+SCRIPT_SRC = re.compile(rb'<script[^>]+src="([^"]+)"')
+
+
+def site_root(base_url):
+    """The app origin for an API base URL like http://host:3000/api"""
+    return re.sub(r"/api/?$", "", base_url.rstrip("/"))
+
+
+def load_ssr(session, url, marker):
+    """(ttfb, time to content or None, X-Nextjs-Cache) for one streamed page load"""
+    start = time.perf_counter()
+    with session.get(url, stream=True, headers={"Accept": "text/html"}) as response:
+        response.raise_for_status()
+        ttfb = None
+        content = None
+        tail = b""
+        for chunk in response.iter_content(chunk_size=None):
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            # Keep the end of the previous chunk so a marker split across two is found
+            if marker in tail + chunk:
+                content = time.perf_counter() - start
+                break
+            tail = chunk[-len(marker):]
+        return ttfb, content, response.headers.get("x-nextjs-cache", "-")
+
+
+def load_csr(session, url, api_url):
+    """(ttfb, time to content) for shell + scripts + the page's API call"""
+    start = time.perf_counter()
+    response = session.get(url, headers={"Accept": "text/html"}, stream=True)
+    response.raise_for_status()
+    ttfb = time.perf_counter() - start
+    html = response.content
+
+    scripts = [urljoin(url, src.decode()) for src in SCRIPT_SRC.findall(html)]
+    if scripts:
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda src: session.get(src).raise_for_status(), scripts))
+    session.get(api_url).raise_for_status()
+    return ttfb, time.perf_counter() - start
+
+
+def median(values):
+    values = sorted(v for v in values if v is not None)
+    return values[len(values) // 2] if values else None
+
+
+def ms(value):
+    return f"{value * 1000:.1f}" if value is not None else "-"
+
+
+def check_revalidation(client, session, root, product_id):
+    product = client.get_product(product_id).raise_for_status().data
+    original = product["name"]
+    renamed = f"{original} (revalidate {int(time.time())})"
+    try:
+        client.put(f"/products/{product_id}", json={"name": renamed}).raise_for_status()
+        page = session.get(f"{root}/products/{product_id}").text
+        catalog = session.get(f"{root}/products").text
+    finally:
+        client.put(f"/products/{product_id}", json={"name": original}).raise_for_status()
+
+    success = True
+    for name, html in (("detail", page), ("catalog", catalog)):
+        # React escapes the rendered text the same way as html.escape for these characters
+        if renamed.replace("&", "&amp;") in html:
+            print(f"✅ {name} page showed the new name on the next load")
+        elif name == "catalog" and original.replace("&", "&amp;") not in catalog:
+            print(f"✅ {name} page regenerated (product is not on the first page)")
+        else:
+            print(f"❌ {name} page still served the old name after the update")
+            success = False
+    return success
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Product page TTFB and time to content, pre-rendered vs client-rendered")
+    add_target_arguments(parser)
+    parser.add_argument("--product-id", default=TEST_PRODUCT_ID, help="existing product for the detail page")
+    parser.add_argument("--repeat", type=int, default=10, help="loads per page and mode (median is reported)")
+    parser.add_argument("--check-revalidation", action="store_true",
+                        help="rename the product and check the pages update on the next load")
+    args = parser.parse_args(argv)
+    client = ShopClient.from_args(args, timeout=60)
+    root = site_root(client.base_url)
+    session = requests.Session()
+
+    pages = [
+        ("catalog", f"{root}/products", f"{client.base_url}/products?sort=name&limit=8&min_price=0"),
+        ("detail", f"{root}/products/{args.product_id}", f"{client.base_url}/products/{args.product_id}?expand=detail"),
+    ]
+
+    print("=" * 70)
+    print("PAGE RENDER BENCHMARK - PRE-RENDERED VS CLIENT-RENDERED")
+    print("=" * 70)
+    print(f"Site: {root}")
+    print(f"Product: {args.product_id}")
+    print()
+
+    rows = []
+    for name, url, api_url in pages:
+        # Warm the page cache so the ssr numbers are for a cached render
+        session.get(url).raise_for_status()
+        ssr = [load_ssr(session, url, CONTENT_MARKERS[name]) for _ in range(args.repeat)]
+        csr = [load_csr(session, url, api_url) for _ in range(args.repeat)]
+        caches = sorted({cache for _, _, cache in ssr})
+        rows.append((name, median(t for t, _, _ in ssr), median(c for _, c, _ in ssr),
+                     sum(c is None for _, c, _ in ssr), "/".join(caches),
+                     median(t for t, _ in csr), median(c for _, c in csr)))
+
+    print(f"{'PAGE':<10}{'SSR TTFB':>10}{'SSR CONTENT':>13}{'CACHE':>12}{'CSR TTFB':>10}{'CSR CONTENT':>13}")
+    for name, ssr_ttfb, ssr_content, _, caches, csr_ttfb, csr_content in rows:
+        print(f"{name:<10}{ms(ssr_ttfb):>10}{ms(ssr_content):>13}{caches:>12}{ms(csr_ttfb):>10}{ms(csr_content):>13}")
+    print("(ms, median; csr is a lower bound - scripts are downloaded, not run)")
+    print()
+
+    success = True
+    for name, _, ssr_content, missing, caches, _, csr_content in rows:
+        if missing:
+            print(f"❌ {name}: {missing} of {args.repeat} loads had no product markup in the HTML")
+            success = False
+        elif ssr_content < csr_content:
+            print(f"✅ {name}: content {csr_content / ssr_content:.1f}x sooner pre-rendered")
+        else:
+            print(f"❌ {name}: pre-rendered content was not sooner than client-rendered")
+            success = False
+        if "HIT" not in caches:
+            print(f"   ⚠️  {name}: no X-Nextjs-Cache HIT - is this a production build?")
+
+    if args.check_revalidation:
+        print()
+        success = check_revalidation(client, session, root, args.product_id) and success
+
+    print()
+    print("✅ PASS" if success else "❌ FAIL")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,64 @@
+"""
+Python mirror of the checkout arithmetic in lib/pricing.js, shared by the
+scripts that price orders themselves (seeders, the pricing load test)
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+
+
+def round_money(value):
+    # Same rounding as roundMoney() in lib/lookups.js
+    return math.floor(value * 100 + 0.5) / 100
+
+
+def shipping_for(pincode):
+    """The tiers of shippingFor(); 0 for anything but a 6-digit pincode"""
+    if not pincode or len(pincode) != 6 or not pincode.isdigit():
+        return 0
+    first = int(pincode[0])
+    return 50 if first <= 3 else 80 if first <= 6 else 120
+
+
+def discount_for(promotion, subtotal):
+    raw = subtotal * (promotion["discount_percentage"] or 0) / 100 + (promotion["discount_amount"] or 0)
+    return round_money(min(subtotal, raw))
+
+
+def allocate_discount(line_totals, discount, subtotal):
+    """Each line's share of `discount`, in proportion to its total; the
+    rounding remainder goes to the last line so the shares add up exactly"""
+    shares = []
+    remaining = discount
+    for n, line_total in enumerate(line_totals):
+        if n == len(line_totals) - 1:
+            share = remaining
+        else:
+            share = round_money(discount * line_total / subtotal if subtotal else 0)
+        remaining = round_money(remaining - share)
+        shares.append(share)
+    return shares
+
+
+def parse_time(value):
+    """A timestamptz or date string as an aware datetime (dates are midnight UTC)"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def promotion_error(promotion, at):
+    """None when `promotion` applies at `at` (an aware datetime), otherwise
+    the promo_error priceItems() answers with, as findPromotion() in
+    lib/promotionIndex.js decides it"""
+    if not promotion or not promotion.get("active") or not promotion.get("code"):
+        return "Invalid promo code"
+    if promotion.get("start_date") and parse_time(promotion["start_date"]) > at:
+        return "Promo code is not active yet"
+    if promotion.get("end_date"):
+        end = parse_time(promotion["end_date"]).astimezone(timezone.utc)
+        # A date-only end (midnight UTC) runs through that day
+        if end == end.replace(hour=0, minute=0, second=0, microsecond=0):
+            end += timedelta(days=1) - timedelta(milliseconds=1)
+        if at > end:
+            return "Promo code has expired"
+    return None
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Pricing Load Test - POST /api/pricing at a sustained request rate
+
+Creates four throwaway promotions through /api/promotions (current,
+expired, not yet started and inactive), then fires mixed quotes at
+--rate req/s: random carts over the products, each with one of the codes,
+an unknown code or none. Every quote is checked against totals computed
+here from the catalog prices:
+
+    subtotal   sum of price * quantity
+    discount   subtotal * pct / 100 + amount, capped at the subtotal, for
+               the current promotion only; the other codes must come back
+               with the matching promo_error and no discount
+    shipping   50 / 80 / 120 by the pincode's first digit
+    lines      line totals minus their discount share add up to the total
+
+Halfway through, the current promotion's percentage is changed with PUT
+and quotes started after the update must use the new value. The report
+shows throughput, latency percentiles and the Server-Timing database
+round trips per quote (0 once the product and promotion caches are warm).
+
+Usage:
+    python -m tests.pricing_load_test --rate 200 --duration 30
+    python -m tests.pricing_load_test --target staging --rate 50 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+import aiohttp
+
+from tests.api_client import add_target_arguments, print_server_timing
+from tests.api_client.aio import AsyncShopClient
+from tests.load_generator import RateLimiter
+from tests.pricing import discount_for, round_money, shipping_for
+from tests.stats import LatencyRecorder, print_report
+
+PINCODES = ["110001", "400001", "560001", "700001", "795001", "12345", None]
+
+
+def expected_quote(prices, items, promotion, pincode):
+    subtotal = round_money(sum(round_money(prices[i["product_id"]] * i["quantity"]) for i in items))
+    discount = 0
+    if promotion:
+        discount = discount_for(promotion, subtotal)
+    shipping = shipping_for(pincode)
+    return {"subtotal": subtotal, "discount": discount, "shipping": shipping,
+            "total": round_money(subtotal - discount + shipping)}
+
+
+def check_quote(quote, expected, promo_error, quantities):
+    lines = quote["lines"]
+    return (
+        all(abs(quote[k] - v) < 0.005 for k, v in expected.items())
+        and quote["promo_error"] == promo_error
+        and [line["quantity"] for line in lines] == quantities
+        and abs(sum(line["total"] for line in lines) + quote["shipping"] - quote["total"]) < 0.005
+    )
+
+
+async def create_promotions(client, tag):
+    """Current, expired, future and inactive promotions with unique codes"""
+    today = date.today()
+    specs = {
+        "current": dict(start_date=str(today - timedelta(days=1)), end_date=str(today + timedelta(days=7)),
+                        discount_percentage=10, discount_amount=5),
+        "expired": dict(start_date=str(today - timedelta(days=30)), end_date=str(today - timedelta(days=2)),
+                        discount_percentage=50, discount_amount=0),
+        "future": dict(start_date=str(today + timedelta(days=5)), end_date=str(today + timedelta(days=30)),
+                       discount_percentage=50, discount_amount=0),
+        "inactive": dict(start_date=str(today - timedelta(days=1)), end_date=str(today + timedelta(days=7)),
+                         discount_percentage=50, discount_amount=0, active=False),
+    }
+    promotions = {}
+    for kind, fields in specs.items():
+        code = f"LOAD{kind[:3].upper()}{tag}"
+        response = await client.create_promotion(f"Pricing load test ({kind})", code=code, **fields)
+        promotions[kind] = {**response.raise_for_status().data, "code": code}
+    return promotions
+
+
+class PricingRun:
+    """Shared state of the quote workers: the current promotion's terms and the results"""
+
+    def __init__(self, client, limiter, recorder, prices, promotions):
+        self.client = client
+        self.limiter = limiter
+        self.recorder = recorder
+        self.prices = prices
+        self.product_ids = list(prices)
+        self.promotions = promotions
+        self.current = {"discount_percentage": 10.0, "discount_amount": 5.0}
+        self.updated_at = None
+        self.checked = 0
+        self.mismatches = []
+
+    def random_request(self, rng):
+        items = [
+            {"product_id": product_id, "quantity": rng.randint(1, 5)}
+            for product_id in rng.sample(self.product_ids, rng.randint(1, min(5, len(self.product_ids))))
+        ]
+        kind = rng.choice(["current", "current", "expired", "future", "inactive", "unknown", None])
+        if kind is None:
+            code = None
+        elif kind == "unknown":
+            code = f"NOPE{rng.randrange(10 ** 6)}"
+        else:
+            code = self.promotions[kind]["code"]
+            if rng.random() < 0.3:
+                code = f"  {code.lower()} "
+        return items, kind, code, rng.choice(PINCODES)
+
+    async def quote(self, rng):
+        items, kind, code, pincode = self.random_request(rng)
+        await self.limiter.acquire()
+        terms = dict(self.current)
+        started = time.perf_counter()
+        try:
+            response = await self.client.price_cart(items, promo_code=code, pincode=pincode)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.recorder.record("POST /pricing", time.perf_counter() - started, type(e).__name__, ok=False)
+            return
+        self.recorder.record("POST /pricing", response.elapsed, response.status_code, response.ok,
+                             len(response.text.encode()))
+        if not response.ok:
+            return
+
+        # Quotes that overlap the PUT may see either percentage
+        if self.updated_at and self.updated_at > started:
+            return
+        promo_error = {
+            None: None, "current": None, "expired": "Promo code has expired",
+            "future": "Promo code is not active yet", "inactive": "Invalid promo code",
+            "unknown": "Invalid promo code",
+        }[kind]
+        expected = expected_quote(self.prices, items, terms if kind == "current" else None, pincode)
+        self.checked += 1
+        if not check_quote(response.data, expected, promo_error, [i["quantity"] for i in items]):
+            self.mismatches.append((items, code, pincode, expected, response.data))
+
+    async def worker(self, seed, deadline):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            await self.quote(rng)
+
+    async def update_current(self, delay, percentage):
+        """PUT a new percentage on the current promotion partway through the run"""
+        await asyncio.sleep(delay)
+        self.updated_at = time.perf_counter()
+        response = await self.client.update_promotion(self.promotions["current"]["id"],
+                                                      discount_percentage=percentage)
+        response.raise_for_status()
+        self.current = {**self.current, "discount_percentage": float(percentage)}
+        self.updated_at = time.perf_counter()
+
+
+async def run(args, client):
+    async with client:
+        products = (await client.list_products(limit=args.products)).raise_for_status().data or []
+        prices = {p["id"]: float(p["price"] or 0) for p in products}
+        if not prices:
+            raise RuntimeError("No products to price")
+
+        promotions = await create_promotions(client, uuid.uuid4().hex[:6].upper())
+        recorder = LatencyRecorder()
+        pricing = PricingRun(client, RateLimiter(args.rate), recorder, prices, promotions)
+        try:
+            start = time.perf_counter()
+            deadline = start + args.duration
+            await asyncio.gather(
+                pricing.update_current(args.duration / 2, 25),
+                *(pricing.worker(args.seed + i, deadline) for i in range(args.concurrency)),
+            )
+            wall_time = time.perf_counter() - start
+        finally:
+            for promotion in promotions.values():
+                await client.delete_promotion(promotion["id"])
+
+    return pricing, recorder, wall_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sustained-rate test of POST /api/pricing")
+    add_target_arguments(parser)
+    parser.add_argument("--rate", type=float, default=200, help="target quotes/sec (0 = unthrottled)")
+    parser.add_argument("--duration", type=float, default=20, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=50, help="quotes in flight")
+    parser.add_argument("--products", type=int, default=20, help="products to build carts from")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random carts")
+    parser.add_argument("--timeout", type=float, default=10, help="per-request timeout in seconds")
+    args = parser.parse_args(argv)
+    client = AsyncShopClient.from_args(args, pool_size=args.concurrency, timeout=args.timeout)
+
+    print("=" * 60)
+    print("PRICING LOAD TEST - PROMO CODES AND TOTALS UNDER LOAD")
+    print("=" * 60)
+    print(f"Backend URL: {client.base_url}")
+    print(f"Target rate: {args.rate or 'unthrottled'} req/s for {args.duration}s")
+    print()
+
+    pricing, recorder, wall_time = asyncio.run(run(args, client))
+    rows = recorder.report(wall_time)
+    print_report(rows, wall_time)
+    print_server_timing(client.timings.report())
+
+    errors = sum(row["errors"] for row in rows)
+    print(f"Quotes checked: {pricing.checked}")
+    print(f"Mismatched quotes: {len(pricing.mismatches)}")
+    for items, code, pincode, expected, quote in pricing.mismatches[:5]:
+        print(f"   code={code!r} pincode={pincode!r} expected={expected} got="
+              f"{ {k: quote.get(k) for k in ('subtotal', 'discount', 'shipping', 'total', 'promo_error')} }")
+    print()
+
+    success = not errors and not pricing.mismatches and pricing.checked > 0
+    if success:
+        print("✅ PASS - every quote matched the catalog prices and promotion terms")
+    else:
+        if errors:
+            print(f"❌ FAIL - {errors} quotes returned errors")
+        if pricing.mismatches or not pricing.checked:
+            print("❌ FAIL - quotes disagreed with the locally computed totals")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Products Benchmark - Whole-catalog download vs GET /api/products
+
+Compares the old products page path (download every row from the Supabase
+REST endpoint, then filter/sort/paginate client-side) with the server-side
+listing endpoint, for a handful of filter scenarios. Reports bytes
+transferred and time to first page.
+
+Setup (100k seeded products behind the app):
+    python -m tests.local_supabase --seed-products 100000 &
+    NEXT_PUBLIC_SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_ROLE_KEY=local next start &
+    python -m tests.products_benchmark
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+from tests.api_client import ShopClient, add_target_arguments
+
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "http://127.0.0.1:54321")
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "local")
+PAGE_SIZE = 8
+
+SCENARIOS = [
+    ("default", {"sort": "name"}),
+    ("search", {"sort": "name", "search": "item 0001"}),
+    ("category", {"sort": "price-low", "category": "Footwear"}),
+    ("price range", {"sort": "price-high", "min_price": 500, "max_price": 1000}),
+]
+
+
+def client_side_page(products, params):
+    """The filterProducts() + slice logic from the old products page"""
+    term = (params.get("search") or "").lower()
+    filtered = [
+        p for p in products
+        if (not term or term in (p.get("name") or "").lower()
+            or term in (p.get("description") or "").lower()
+            or term in (p.get("category") or "").lower())
+        and (not params.get("category") or p.get("category") == params["category"])
+        and float(p["price"]) >= float(params.get("min_price", 0))
+        and float(p["price"]) <= float(params.get("max_price", float("inf")))
+    ]
+    sort = params.get("sort")
+    if sort == "price-low":
+        filtered.sort(key=lambda p: float(p["price"]))
+    elif sort == "price-high":
+        filtered.sort(key=lambda p: float(p["price"]), reverse=True)
+    else:
+        filtered.sort(key=lambda p: p["name"])
+    return filtered[:PAGE_SIZE]
+
+
+def legacy_first_page(session, supabase_url, params):
+    start = time.perf_counter()
+    response = session.get(
+        f"{supabase_url}/rest/v1/products",
+        params={"select": "*", "order": "created_at.desc"},
+        headers={"apikey": SUPABASE_ANON_KEY, "Authorization": f"Bearer {SUPABASE_ANON_KEY}"},
+        timeout=300,
+    )
+    response.raise_for_status()
+    page = client_side_page(response.json(), params)
+    return time.perf_counter() - start, len(response.content), page
+
+
+def server_first_page(client, params):
+    response = client.list_products(**params, limit=PAGE_SIZE).raise_for_status()
+    return response.elapsed, len(response.text.encode()), response.data
+
+
+def measure(fn, repeat, *args):
+    timings, size, page = [], 0, None
+    for _ in range(repeat):
+        elapsed, size, page = fn(*args)
+        timings.append(elapsed)
+    return statistics.median(timings), size, page
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catalog listing benchmark")
+    add_target_arguments(parser)
+    parser.add_argument("--supabase-url", default=SUPABASE_URL)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario (median is reported)")
+    args = parser.parse_args(argv)
+    client = ShopClient.from_args(args, timeout=60)
+
+    print("=" * 78)
+    print("PRODUCTS BENCHMARK - CLIENT-SIDE VS SERVER-SIDE LISTING")
+    print("=" * 78)
+    print(f"App: {client.base_url}")
+    print(f"Supabase: {args.supabase_url}")
+    print()
+    print(f"{'SCENARIO':<14}{'LEGACY ms':>11}{'LEGACY KB':>12}{'API ms':>10}{'API KB':>10}{'SPEEDUP':>10}{'MATCH':>8}")
+
+    session = requests.Session()
+    all_match = True
+    for label, params in SCENARIOS:
+        legacy_time, legacy_bytes, legacy_page = measure(
+            legacy_first_page, args.repeat, session, args.supabase_url, params
+        )
+        api_time, api_bytes, api_page = measure(
+            server_first_page, args.repeat, client, params
+        )
+        match = [p["id"] for p in legacy_page] == [p["id"] for p in api_page]
+        all_match = all_match and match
+        print(
+            f"{label:<14}{legacy_time * 1000:>11.1f}{legacy_bytes / 1024:>12.1f}"
+            f"{api_time * 1000:>10.1f}{api_bytes / 1024:>10.1f}"
+            f"{legacy_time / api_time:>9.1f}x{'yes' if match else 'no':>8}"
+        )
+
+    print()
+    if all_match:
+        print("✅ Server-side listing returned the same first page as the client-side path")
+    else:
+        print("⚠️  First pages differ (ties in sort order can reorder equal names/prices)")
+    return all_match
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
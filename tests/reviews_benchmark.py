@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Reviews Benchmark - Full review download vs paginated reviews + rating summary
+
+For each reviews-per-product size a different fixture product is seeded
+with that many reviews (so no cached summary from an earlier size is
+reused) and two ways of rendering its rating and reviews are timed:
+
+    legacy  every review of the product with its users(name, email) join
+            from the Supabase REST endpoint (what GET /api/reviews used to
+            return), with the average and histogram computed client-side
+    api     GET /api/reviews/summary plus the first page of GET /api/reviews,
+            then the second page through the cursor
+
+The summary is checked against the legacy client-side computation, and the
+two pages against the newest-first ordering.
+
+The app has to point at the stand-in port this script serves on:
+    NEXT_PUBLIC_SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_ROLE_KEY=local next start &
+    python -m tests.reviews_benchmark --sizes 1000,5000,20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+from tests.api_client import ShopClient, add_target_arguments
+from tests.local_supabase import LocalSupabase, fixture_product_ids
+from tests.stats import median_of
+
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "local")
+PAGE_SIZE = 10
+
+
+def legacy_reviews(session, supabase_url, product_id):
+    """The old GET /api/reviews payload, plus the average the page derived from it"""
+    start = time.perf_counter()
+    response = session.get(
+        f"{supabase_url}/rest/v1/reviews",
+        params={"select": "*,users(name,email)", "product_id": f"eq.{product_id}",
+                "order": "created_at.desc"},
+        headers={"apikey": SUPABASE_ANON_KEY, "Authorization": f"Bearer {SUPABASE_ANON_KEY}"},
+        timeout=600,
+    )
+    response.raise_for_status()
+    reviews = response.json()
+    histogram = {str(star): 0 for star in range(1, 6)}
+    for review in reviews:
+        histogram[str(review["rating"])] += 1
+    count = len(reviews)
+    average = round(sum(r["rating"] for r in reviews) / count, 2) if count else None
+    elapsed = time.perf_counter() - start
+    return elapsed, len(response.content), {"count": count, "average": average, "histogram": histogram}
+
+
+def api_reviews(client, product_id):
+    """Rating summary and the first review page, as the product page needs them"""
+    start = time.perf_counter()
+    summary = client.get_rating_summary(product_id).raise_for_status()
+    first = client.get_reviews(product_id, limit=PAGE_SIZE).raise_for_status()
+    elapsed = time.perf_counter() - start
+    size = len(summary.text.encode()) + len(first.text.encode())
+    return elapsed, size, summary.data, first.json()
+
+
+def api_next_page(client, product_id, cursor):
+    response = client.get_reviews(product_id, limit=PAGE_SIZE, cursor=cursor).raise_for_status()
+    return response.elapsed, response.json()
+
+
+def run_size(args, client, session, supabase, product_id, size):
+    seed_start = time.perf_counter()
+    supabase.store.seed_reviews([product_id], size, seed=size)
+    seed_time = time.perf_counter() - seed_start
+
+    legacy_time, (_, legacy_bytes, legacy) = median_of(
+        legacy_reviews, args.repeat, session, supabase.url, product_id
+    )
+    api_time, (_, api_bytes, summary, first) = median_of(api_reviews, args.repeat, client, product_id)
+    next_time, (_, second) = median_of(api_next_page, args.repeat, client, product_id, first["next_cursor"])
+
+    page = first["data"] + second["data"]
+    stamps = [r["created_at"] for r in page]
+    valid = (
+        summary["count"] == legacy["count"] == size
+        and summary["average"] == legacy["average"]
+        and {str(k): v for k, v in summary["histogram"].items()} == legacy["histogram"]
+        and stamps == sorted(stamps, reverse=True)
+        and len({r["id"] for r in page}) == len(page) == min(size, 2 * PAGE_SIZE)
+    )
+    return {
+        "reviews": size, "seed_s": seed_time,
+        "legacy_ms": legacy_time * 1000, "legacy_kb": legacy_bytes / 1024,
+        "api_ms": api_time * 1000, "api_kb": api_bytes / 1024,
+        "page2_ms": next_time * 1000, "valid": valid,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Review list vs rating summary benchmark")
+    add_target_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1", help="stand-in host the app is configured for")
+    parser.add_argument("--port", type=int, default=54321, help="stand-in port the app is configured for")
+    parser.add_argument("--sizes", default="1000,5000,20000", help="comma-separated reviews per product")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (median is reported)")
+    args = parser.parse_args(argv)
+    client = ShopClient.from_args(args, timeout=120)
+
+    sizes = [int(n) for n in args.sizes.split(",")]
+    products = fixture_product_ids()
+    if len(sizes) > len(products):
+        parser.error(f"at most {len(products)} sizes per run")
+
+    print("=" * 78)
+    print("REVIEWS BENCHMARK - FULL REVIEW LIST VS SUMMARY + PAGINATED REVIEWS")
+    print("=" * 78)
+    print(f"App: {client.base_url}")
+    print(f"Stand-in: http://{args.host}:{args.port}")
+    print()
+
+    session = requests.Session()
+    rows = []
+    with LocalSupabase(args.host, args.port) as supabase:
+        for product_id, size in zip(products, sizes):
+            print(f"Seeding {size} reviews...")
+            rows.append(run_size(args, client, session, supabase, product_id, size))
+
+    print()
+    print(f"{'REVIEWS':>9}{'LEGACY ms':>11}{'LEGACY KB':>11}{'API ms':>9}{'API KB':>9}"
+          f"{'PAGE2 ms':>10}{'SPEEDUP':>9}{'SMALLER':>9}{'OK':>5}")
+    for row in rows:
+        print(f"{row['reviews']:>9}{row['legacy_ms']:>11.1f}{row['legacy_kb']:>11.1f}"
+              f"{row['api_ms']:>9.1f}{row['api_kb']:>9.1f}{row['page2_ms']:>10.1f}"
+              f"{row['legacy_ms'] / row['api_ms']:>8.1f}x{row['legacy_kb'] / row['api_kb']:>8.0f}x"
+              f"{'yes' if row['valid'] else 'no':>5}")
+    print()
+
+    success = all(row["valid"] for row in rows)
+    if success:
+        print("✅ Summaries matched the full review list and pages were newest-first without repeats")
+    else:
+        print("❌ A summary disagreed with the review list or a page was out of order")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Seed Data - Deterministic bulk data for scale tests
+
+Generates a catalog, customers, promotions, carts, wishlists, multi-line
+orders and reviews, and loads them in batched inserts. Every row is a pure
+function of (--seed, table, row number): ids are uuid5s of that triple and
+each row draws from its own Random, so
+
+  - the same seed always produces the same rows, whatever the volumes of
+    the other tables and however the load is batched
+  - references (an order's products, a review's author) are computed, never
+    looked up, so generation keeps no rows around and memory stays flat
+
+The per-table fingerprint printed at the end is a hash over the generated
+rows; two runs with equal fingerprints loaded identical data.
+
+Targets:
+    (default)            an in-memory stand-in, seeded and then served on
+                         --host/--port until interrupted
+    --db FILE            a stand-in SQLite file; serve it afterwards with
+                         python -m tests.local_supabase --db FILE --no-fixtures
+    --supabase-url URL   any PostgREST endpoint, e.g. a staging project, with
+                         the key from $SUPABASE_SERVICE_ROLE_KEY. Customers
+                         are rows in public.users only, without auth accounts.
+    --dry-run            generate and fingerprint without writing
+
+Usage:
+    python -m tests.seed_data --scale 0.01
+    python -m tests.seed_data --seed 7 --db /tmp/shop.sqlite
+    python -m tests.seed_data --supabase-url https://xyz.supabase.co --products 100000 --users 50000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import resource
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from tests.local_supabase import LocalSupabase, Store
+from tests.pricing import allocate_discount, discount_for, promotion_error, round_money, shipping_for
+
+SEED_NAMESPACE = uuid.UUID("3d0e8a4c-5b7f-4c21-9e6a-1f2b3c4d5e6f")
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Default volumes; --scale multiplies all of them
+VOLUMES = {
+    "products": 100_000,
+    "users": 50_000,
+    "promotions": 50,
+    "carts": 20_000,
+    "wishlists": 20_000,
+    "orders": 100_000,
+    "reviews": 200_000,
+}
+
+CATALOG = {
+    "Clothing": ["Shirt", "T-Shirt", "Jeans", "Jacket", "Kurta", "Hoodie", "Dress"],
+    "Footwear": ["Sneakers", "Sandals", "Boots", "Loafers", "Slippers"],
+    "Accessories": ["Watch", "Wallet", "Belt", "Sunglasses", "Backpack"],
+    "Electronics": ["Headphones", "Speaker", "Charger", "Keyboard", "Smartwatch"],
+    "Home": ["Lamp", "Cushion", "Mug", "Bedsheet", "Planter"],
+}
+ADJECTIVES = ["Classic", "Premium", "Everyday", "Urban", "Vintage", "Slim", "Eco", "Pro", "Lite", "Deluxe"]
+FIRST_NAMES = ["Asha", "Ben", "Chen", "Divya", "Elena", "Farid", "Grace", "Hiro", "Isla", "Jon", "Kavya", "Luis"]
+LAST_NAMES = ["Iyer", "Smith", "Wang", "Rao", "Garcia", "Khan", "Okafor", "Sato", "Brown", "Mehta"]
+PAYMENT_METHODS = ["credit_card", "debit_card", "upi", "cod"]
+ORDER_STATUSES = ["pending", "completed", "cancelled"]
+# Every ADMIN_EVERY-th user is an admin and every UNNAMED_EVERY-th has no
+# name, so the users listing filters have something to filter
+ADMIN_EVERY = 1000
+UNNAMED_EVERY = 50
+RATING_WEIGHTS = [0.05, 0.07, 0.15, 0.33, 0.40]
+
+
+def iso(dt):
+    return dt.isoformat()
+
+
+class Generator:
+    """Rows for one seed and set of volumes; every method is random-access"""
+
+    def __init__(self, seed, volumes, legacy_orders=False):
+        self.seed = seed
+        self.volumes = volumes
+        self.legacy_orders = legacy_orders
+
+    def row_id(self, table, key):
+        return str(uuid.uuid5(SEED_NAMESPACE, f"{self.seed}:{table}:{key}"))
+
+    def rng(self, table, i):
+        return random.Random(f"{self.seed}:{table}:{i}")
+
+    # -- rows ---------------------------------------------------------------
+
+    def product(self, i):
+        r = self.rng("products", i)
+        category = r.choice(list(CATALOG))
+        noun = r.choice(CATALOG[category])
+        return {
+            "id": self.row_id("products", i),
+            "name": f"{r.choice(ADJECTIVES)} {noun} {i:06d}",
+            "description": f"Seeded {category.lower()} item: {noun.lower()} number {i}",
+            "price": round_money(min(max(r.lognormvariate(6.5, 1.0), 49), 99_999)),
+            "category": category,
+            "image_url": f"https://example.com/seed/{self.seed}/{i}.png",
+            "created_at": iso(BASE_TIME + timedelta(minutes=i)),
+        }
+
+    def user(self, i):
+        r = self.rng("users", i)
+        admin = i % ADMIN_EVERY == 0
+        name = f"{r.choice(FIRST_NAMES)} {r.choice(LAST_NAMES)}"
+        return {
+            "id": self.row_id("users", i),
+            "email": f"seed{self.seed}_{'admin' if admin else 'user'}{i:07d}@example.com",
+            "name": None if i % UNNAMED_EVERY == 1 else name,
+            "phone": 7_000_000_000 + i,
+            "role": "admin" if admin else "user",
+            "created_at": iso(BASE_TIME + timedelta(seconds=30 * i)),
+        }
+
+    def promotion(self, i):
+        r = self.rng("promotions", i)
+        percentage = r.choice([5, 10, 15, 20, 25]) if r.random() < 0.7 else None
+        # Spread around BASE_TIME so orders meet current, expired and future codes
+        start = BASE_TIME + timedelta(days=r.randrange(-400, 200))
+        return {
+            "id": self.row_id("promotions", i),
+            "name": f"Seed Promotion {i}",
+            "description": "Seeded promotion",
+            "discount_percentage": percentage,
+            "discount_amount": None if percentage else r.choice([50, 100, 200, 500]),
+            "code": f"SEED{self.seed}X{i:04d}",
+            "start_date": iso(start),
+            "end_date": iso(start + timedelta(days=r.choice([7, 30, 365, 3650]))),
+            "active": i % 10 != 9,
+            "created_at": iso(start),
+        }
+
+    def sample_products(self, r, k):
+        return r.sample(range(self.volumes["products"]), min(k, self.volumes["products"]))
+
+    def cart(self, u):
+        """Cart lines of customer `u`"""
+        r = self.rng("cart", u)
+        user_id = self.row_id("users", u)
+        for p in self.sample_products(r, r.randint(1, 6)):
+            yield {
+                "id": self.row_id("cart", f"{u}:{p}"),
+                "user_id": user_id,
+                "product_id": self.row_id("products", p),
+                "qty": r.randint(1, 3),
+            }
+
+    def wishlist(self, u):
+        """Saved products of customer `u`, counting back from the last customer"""
+        u = self.volumes["users"] - 1 - u
+        r = self.rng("wishlist", u)
+        user_id = self.row_id("users", u)
+        for p in self.sample_products(r, r.randint(1, 8)):
+            yield {
+                "id": self.row_id("wishlist", f"{u}:{p}"),
+                "user_id": user_id,
+                "product_id": self.row_id("products", p),
+            }
+
+    def checkout(self, j):
+        """One checkout: its order_groups row and order lines, priced the way
+        lib/pricing.js does (percentage + amount discount, spread over lines,
+        only from a promotion that is active on the order date)"""
+        r = self.rng("orders", j)
+        user_id = self.row_id("users", r.randrange(self.volumes["users"]))
+        placed_at = BASE_TIME + timedelta(seconds=30 * j)
+        created_at = iso(placed_at)
+        group_id = self.row_id("order_groups", j)
+        status = r.choices(ORDER_STATUSES, [0.2, 0.7, 0.1])[0]
+        pincode = f"{r.randint(1, 9)}{r.randrange(10 ** 5):05d}"
+        payment_method = r.choice(PAYMENT_METHODS)
+        shipping_address = f"{r.randint(1, 999)} Seed Street, Seedville {pincode}"
+
+        lines = []
+        for p in self.sample_products(r, r.choices([1, 2, 3, 4, 5], [40, 25, 15, 12, 8])[0]):
+            quantity = r.randint(1, 3)
+            lines.append((p, quantity, round_money(self.product(p)["price"] * quantity)))
+        subtotal = round_money(sum(total for _, _, total in lines))
+
+        promotion = None
+        if self.volumes["promotions"] and r.random() < 0.2:
+            promotion = self.promotion(r.randrange(self.volumes["promotions"]))
+            # Checkout refuses a code that is inactive or outside its dates
+            if promotion_error(promotion, placed_at):
+                promotion = None
+        discount = discount_for(promotion, subtotal) if promotion else 0
+        shipping = shipping_for(pincode)
+        shares = allocate_discount([total for _, _, total in lines], discount, subtotal)
+
+        rows = []
+        for n, ((p, quantity, line_total), share) in enumerate(zip(lines, shares)):
+            row = {
+                "id": self.row_id("orders", f"{j}:{n}"),
+                "user_id": user_id,
+                "product_id": self.row_id("products", p),
+                "quantity": quantity,
+                "total_price": round_money(line_total - share),
+                "status": status,
+                "created_at": created_at,
+            }
+            if not self.legacy_orders:
+                row.update(payment_method=payment_method, shipping_address=shipping_address,
+                           order_group_id=group_id)
+            rows.append(row)
+
+        group = None if self.legacy_orders else {
+            "id": group_id,
+            "user_id": user_id,
+            "item_count": len(rows),
+            "subtotal": subtotal,
+            "discount": discount,
+            "shipping": shipping,
+            "total_amount": round_money(subtotal - discount + shipping),
+            "promo_code": promotion["code"] if promotion else None,
+            "payment_method": payment_method,
+            "shipping_address": shipping_address,
+            "created_at": created_at,
+        }
+        return group, rows
+
+    def review(self, i):
+        r = self.rng("reviews", i)
+        # Skewed towards the first products, so a few have thousands of reviews
+        product = int(self.volumes["products"] * r.random() ** 3)
+        rating = r.choices(range(1, 6), RATING_WEIGHTS)[0]
+        return {
+            "id": self.row_id("reviews", i),
+            "product_id": self.row_id("products", product),
+            "user_id": self.row_id("users", r.randrange(self.volumes["users"])),
+            "rating": rating,
+            "review_text": f"Seeded {rating}-star review " + "lorem ipsum " * r.randrange(2, 20),
+            "created_at": iso(BASE_TIME + timedelta(seconds=45 * i)),
+        }
+
+    # -- streams ------------------------------------------------------------
+
+    def rows(self):
+        """(table, row) pairs, parents before the rows that reference them"""
+        v = self.volumes
+        for i in range(v["products"]):
+            yield "products", self.product(i)
+        for i in range(v["users"]):
+            yield "users", self.user(i)
+        for i in range(v["promotions"]):
+            yield "promotions", self.promotion(i)
+        if not v["users"] or not v["products"]:
+            return
+        for u in range(min(v["carts"], v["users"])):
+            for row in self.cart(u):
+                yield "cart", row
+        for u in range(min(v["wishlists"], v["users"])):
+            for row in self.wishlist(u):
+                yield "wishlist", row
+        for j in range(v["orders"]):
+            group, lines = self.checkout(j)
+            if group:
+                yield "order_groups", group
+            for row in lines:
+                yield "orders", row
+        for i in range(v["reviews"]):
+            yield "reviews", self.review(i)
+
+
+# Flush order: a batch of a table only goes out after its parents' batches
+TABLE_ORDER = ["products", "users", "promotions", "cart", "wishlist", "order_groups", "orders", "reviews"]
+
+
+class StoreSink:
+    """Writes straight into a stand-in Store"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def write(self, table, rows):
+        self.store.bulk_insert(table, rows)
+
+
+class RestSink:
+    """Bulk POSTs to a PostgREST endpoint, skipping rows that already exist"""
+
+    def __init__(self, supabase_url, key, timeout=120):
+        self.rest = f"{supabase_url.rstrip('/')}/rest/v1"
+        self.session = requests.Session()
+        self.session.headers.update({
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+            "Prefer": "return=minimal,resolution=ignore-duplicates",
+        })
+        self.timeout = timeout
+
+    def write(self, table, rows):
+        response = self.session.post(f"{self.rest}/{table}", data=json.dumps(rows), timeout=self.timeout)
+        if response.status_code >= 300:
+            raise RuntimeError(f"Insert into {table} failed ({response.status_code}): {response.text}")
+
+
+class NullSink:
+    def write(self, table, rows):
+        pass
+
+
+def load(generator, sink, batch_size, on_flush=None):
+    """Stream the generator's rows into `sink` in batches of `batch_size`.
+
+    Returns {table: (rows, fingerprint)}. When any table's buffer fills, every
+    buffer is flushed in TABLE_ORDER so no row is written before its parent.
+    """
+    buffers = {table: [] for table in TABLE_ORDER}
+    counts = dict.fromkeys(TABLE_ORDER, 0)
+    hashes = {table: hashlib.sha256() for table in TABLE_ORDER}
+
+    def flush():
+        for table in TABLE_ORDER:
+            if buffers[table]:
+                sink.write(table, buffers[table])
+                buffers[table] = []
+        if on_flush:
+            on_flush(counts)
+
+    for table, row in generator.rows():
+        buffers[table].append(row)
+        counts[table] += 1
+        hashes[table].update(json.dumps(row, sort_keys=True).encode("utf-8"))
+        if len(buffers[table]) >= batch_size:
+            flush()
+    flush()
+    return {table: (counts[table], hashes[table].hexdigest()[:16]) for table in TABLE_ORDER if counts[table]}
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deterministic bulk data for scale tests")
+    parser.add_argument("--seed", type=int, default=0, help="same seed, same rows")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every default volume")
+    for table, count in VOLUMES.items():
+        noun = {"carts": "customers with a cart", "wishlists": "customers with a wishlist",
+                "orders": "checkouts (1-5 lines each)"}.get(table, table)
+        parser.add_argument(f"--{table}", type=int, help=f"{noun} (default {count:,} x --scale)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per insert")
+    parser.add_argument("--legacy-orders", action="store_true",
+                        help="orders without order groups or payment columns (pre-migration databases)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--db", help="stand-in SQLite file to seed")
+    target.add_argument("--supabase-url", help="PostgREST endpoint to seed (key from $SUPABASE_SERVICE_ROLE_KEY)")
+    target.add_argument("--dry-run", action="store_true", help="generate and fingerprint only")
+    parser.add_argument("--host", default="127.0.0.1", help="where to serve the in-memory stand-in")
+    parser.add_argument("--port", type=int, default=54321)
+    args = parser.parse_args(argv)
+
+    volumes = {table: getattr(args, table) if getattr(args, table) is not None else max(1, int(count * args.scale))
+               for table, count in VOLUMES.items()}
+    generator = Generator(args.seed, volumes, legacy_orders=args.legacy_orders)
+
+    server = None
+    if args.dry_run:
+        sink, where = NullSink(), "dry run"
+    elif args.supabase_url:
+        key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+        if not key:
+            print("❌ Set SUPABASE_SERVICE_ROLE_KEY to seed a Supabase project")
+            return False
+        sink, where = RestSink(args.supabase_url, key), args.supabase_url
+    elif args.db:
+        store = Store(args.db)
+        sink, where = StoreSink(store), args.db
+    else:
+        server = LocalSupabase(args.host, args.port)
+        sink, where = StoreSink(server.store), f"in-memory stand-in on {server.url}"
+
+    print("=" * 70)
+    print("SEED DATA - DETERMINISTIC BULK LOAD")
+    print("=" * 70)
+    print(f"Target: {where}")
+    print(f"Seed: {args.seed}, batch size {args.batch_size}")
+    print("Volumes: " + ", ".join(f"{table}={count:,}" for table, count in volumes.items()))
+    print()
+
+    start = time.perf_counter()
+    last_report = [start]
+
+    def progress(counts):
+        now = time.perf_counter()
+        if now - last_report[0] >= 5:
+            last_report[0] = now
+            total = sum(counts.values())
+            print(f"   {total:>10,} rows  {total / (now - start):>8,.0f} rows/s  peak RSS {peak_rss_mb():.0f} MB")
+
+    try:
+        loaded = load(generator, sink, args.batch_size, on_flush=progress)
+    except Exception as e:
+        print(f"❌ Load failed: {e}")
+        return False
+    elapsed = time.perf_counter() - start
+
+    total = sum(count for count, _ in loaded.values())
+    print()
+    print(f"{'TABLE':<14}{'ROWS':>12}  FINGERPRINT")
+    for table, (count, fingerprint) in loaded.items():
+        print(f"{table:<14}{count:>12,}  {fingerprint}")
+    print()
+    print(f"✅ {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s), peak RSS {peak_rss_mb():.0f} MB")
+
+    if server:
+        print(f"Serving on {server.url} - Ctrl+C to stop")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.httpd.server_close()
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,83 @@
+"""
+Latency bookkeeping shared by the load generator and benchmark scripts
+"""
+
+import math
+import statistics
+from collections import defaultdict
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def median_of(fn, repeat, *args):
+    """Run fn(*args) `repeat` times; (median of each run's first item, last run)"""
+    runs = [fn(*args) for _ in range(repeat)]
+    return statistics.median(r[0] for r in runs), runs[-1]
+
+
+class LatencyRecorder:
+    """Collects per-endpoint latencies (in seconds) and error counts"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.bytes = defaultdict(int)
+
+    def record(self, endpoint, elapsed, status, ok=True, nbytes=0):
+        self.latencies[endpoint].append(elapsed)
+        self.statuses[endpoint][status] += 1
+        self.bytes[endpoint] += nbytes
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def endpoints(self):
+        return sorted(self.latencies)
+
+    def summary(self, endpoint, wall_time):
+        values = sorted(self.latencies[endpoint])
+        count = len(values)
+        return {
+            "endpoint": endpoint,
+            "requests": count,
+            "errors": self.errors[endpoint],
+            "error_rate": (self.errors[endpoint] / count) if count else 0.0,
+            "throughput_rps": (count / wall_time) if wall_time else 0.0,
+            "min_ms": (values[0] * 1000) if values else 0.0,
+            "mean_ms": (sum(values) / count * 1000) if count else 0.0,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p90_ms": percentile(values, 90) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": (values[-1] * 1000) if values else 0.0,
+            "bytes_total": self.bytes[endpoint],
+            "bytes_mean": (self.bytes[endpoint] / count) if count else 0.0,
+            "statuses": dict(self.statuses[endpoint]),
+        }
+
+    def report(self, wall_time):
+        return [self.summary(endpoint, wall_time) for endpoint in self.endpoints()]
+
+
+def print_report(rows, wall_time):
+    """Print a fixed-width table of endpoint summaries"""
+    print(f"\n{'='*96}")
+    print(f"{'ENDPOINT':<28}{'REQS':>7}{'ERR':>6}{'RPS':>9}{'P50 ms':>11}{'P95 ms':>11}{'P99 ms':>11}{'MAX ms':>11}")
+    print('='*96)
+    total = 0
+    for row in rows:
+        total += row["requests"]
+        print(
+            f"{row['endpoint']:<28}{row['requests']:>7}{row['errors']:>6}"
+            f"{row['throughput_rps']:>9.1f}{row['p50_ms']:>11.1f}{row['p95_ms']:>11.1f}"
+            f"{row['p99_ms']:>11.1f}{row['max_ms']:>11.1f}"
+        )
+    print('='*96)
+    overall = (total / wall_time) if wall_time else 0.0
+    print(f"Total requests: {total} in {wall_time:.1f}s ({overall:.1f} req/s)")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Users Benchmark - Legacy users listing vs paginated GET /api/users
+
+For each table size the stand-in is reseeded and two paths are timed:
+
+    legacy  two full scans of the users table from the Supabase REST
+            endpoint, the extraData.find() merge (O(n^2)), then the admin
+            dashboard's client-side admin filter and name sort
+    api     the first page of GET /api/users (sorted by name), an email
+            prefix search, and the second page through the keyset cursor
+
+The O(n^2) merge is only run up to --quadratic-max users; above that the
+legacy column reports the scans plus a dict merge, which understates it.
+
+The app has to point at the stand-in port this script serves on:
+    NEXT_PUBLIC_SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_ROLE_KEY=local next start &
+    python -m tests.users_benchmark --sizes 10000,100000,1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+from tests.api_client import ShopClient, add_target_arguments
+from tests.local_supabase import LocalSupabase
+from tests.stats import median_of
+
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "local")
+PAGE_SIZE = 50
+
+
+def rest_get(session, supabase_url, params):
+    response = session.get(
+        f"{supabase_url}/rest/v1/users",
+        params=params,
+        headers={"apikey": SUPABASE_ANON_KEY, "Authorization": f"Bearer {SUPABASE_ANON_KEY}"},
+        timeout=600,
+    )
+    response.raise_for_status()
+    return response
+
+
+def legacy_first_page(session, supabase_url, quadratic):
+    """GET /api/users before the rewrite plus fetchUsers() in the dashboard"""
+    start = time.perf_counter()
+    basic = rest_get(session, supabase_url, {"select": "id,email,role,created_at", "order": "created_at.desc"})
+    extra = rest_get(session, supabase_url, {"select": "id,name,phone"})
+    basic_rows, extra_rows = basic.json(), extra.json()
+    scanned = time.perf_counter()
+
+    if quadratic:
+        merged = []
+        for user in basic_rows:
+            found = next((e for e in extra_rows if e["id"] == user["id"]), None)
+            merged.append({**user, "name": (found or {}).get("name"), "phone": (found or {}).get("phone")})
+    else:
+        by_id = {e["id"]: e for e in extra_rows}
+        merged = [{**u, "name": by_id[u["id"]]["name"], "phone": by_id[u["id"]]["phone"]} for u in basic_rows]
+    merge_time = time.perf_counter() - scanned
+
+    users = [u for u in merged if not u["email"].startswith("admin@")]
+    users.sort(key=lambda u: (u["name"] or u["email"] or "").lower())
+    elapsed = time.perf_counter() - start
+    return elapsed, len(basic.content) + len(extra.content), merge_time, users[:PAGE_SIZE]
+
+
+def api_get(client, params):
+    response = client.list_users(**params, limit=PAGE_SIZE).raise_for_status()
+    return response.elapsed, len(response.text.encode()), response.json()
+
+
+def wait_for_app(client, attempts=20):
+    """The app may hold keep-alive sockets to the previous stand-in"""
+    for _ in range(attempts):
+        try:
+            if client.list_users(limit=1).ok:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def run_size(args, client, session, size):
+    with LocalSupabase(args.host, args.port, fixtures=False) as supabase:
+        seed_start = time.perf_counter()
+        supabase.store.seed_users(size)
+        seed_time = time.perf_counter() - seed_start
+        if not wait_for_app(client):
+            raise RuntimeError(f"App at {client.base_url} did not answer after reseeding")
+
+        row = {"users": size, "seed_s": seed_time}
+
+        if size <= args.legacy_max:
+            quadratic = size <= args.quadratic_max
+            legacy_time, (_, legacy_bytes, merge_time, _) = median_of(
+                legacy_first_page, args.repeat, session, supabase.url, quadratic
+            )
+            row.update(legacy_ms=legacy_time * 1000, legacy_mb=legacy_bytes / 2 ** 20,
+                       merge_ms=merge_time * 1000, quadratic=quadratic)
+
+        first_time, (_, first_bytes, first) = median_of(api_get, args.repeat, client, {"sort": "name"})
+        search_time, _ = median_of(api_get, args.repeat, client, {"sort": "name", "search": "seed0_user00012"})
+        next_time, (_, _, second) = median_of(
+            api_get, args.repeat, client, {"sort": "name", "cursor": first["next_cursor"]}
+        )
+
+        page = first["data"] + second["data"]
+        names = [u["name"] for u in page if u["name"] is not None]
+        row.update(
+            api_ms=first_time * 1000, api_kb=first_bytes / 1024,
+            search_ms=search_time * 1000, page2_ms=next_time * 1000,
+            total=first["total"],
+            valid=(all(u["role"] != "admin" and not u["email"].startswith("admin@") for u in page)
+                   and names == sorted(names)
+                   and len({u["id"] for u in page}) == len(page)),
+        )
+        return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GET /api/users benchmark")
+    add_target_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1", help="stand-in host the app is configured for")
+    parser.add_argument("--port", type=int, default=54321, help="stand-in port the app is configured for")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated table sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (median is reported)")
+    parser.add_argument("--quadratic-max", type=int, default=20000,
+                        help="largest size the O(n^2) legacy merge is actually run at")
+    parser.add_argument("--legacy-max", type=int, default=1000000,
+                        help="skip the legacy full-table path above this size")
+    args = parser.parse_args(argv)
+    client = ShopClient.from_args(args, timeout=120)
+
+    sizes = [int(n) for n in args.sizes.split(",")]
+
+    print("=" * 78)
+    print("USERS BENCHMARK - FULL SCAN + MERGE VS PAGINATED GET /api/users")
+    print("=" * 78)
+    print(f"App: {client.base_url}")
+    print(f"Stand-in: http://{args.host}:{args.port}")
+    print()
+
+    session = requests.Session()
+    rows = []
+    for size in sizes:
+        print(f"Seeding {size} users...")
+        rows.append(run_size(args, client, session, size))
+
+    print()
+    print(f"{'USERS':>9}{'LEGACY ms':>11}{'LEGACY MB':>11}{'MERGE ms':>10}"
+          f"{'API ms':>9}{'SEARCH ms':>11}{'PAGE2 ms':>10}{'SPEEDUP':>9}{'OK':>5}")
+    for row in rows:
+        if "legacy_ms" in row:
+            merge = f"{row['merge_ms']:.0f}{'' if row['quadratic'] else '*'}"
+            legacy = f"{row['legacy_ms']:>11.0f}{row['legacy_mb']:>11.1f}{merge:>10}"
+            speedup = f"{row['legacy_ms'] / row['api_ms']:>8.0f}x"
+        else:
+            legacy = f"{'-':>11}{'-':>11}{'-':>10}"
+            speedup = f"{'-':>9}"
+        print(f"{row['users']:>9}{legacy}{row['api_ms']:>9.1f}{row['search_ms']:>11.1f}"
+              f"{row['page2_ms']:>10.1f}{speedup}{'yes' if row['valid'] else 'no':>5}")
+    print()
+    if any(not row.get("quadratic", True) for row in rows):
+        print(f"* dict merge; the O(n^2) merge is only run up to {args.quadratic_max} users")
+
+    success = all(row["valid"] for row in rows)
+    if success:
+        print("✅ Every API page excluded admins, was sorted by name and had no duplicates")
+    else:
+        print("❌ An API page contained admins, was out of order or repeated users")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -4,15 +4,12 @@ Verify Cart API Fix - Check if updated_at trigger error is resolved
 This test focuses on verifying that the specific "updated_at field" error is gone
 """
 
-import requests
-import json
+import argparse
 import uuid
-from datetime import datetime
 
-BASE_URL = "https://supashop-3.preview.emergentagent.com/api"
-HEADERS = {"Content-Type": "application/json"}
+from tests.api_client import ShopClient, add_target_arguments
 
-def test_cart_error_analysis():
+def test_cart_error_analysis(client):
     """Test Cart API to analyze the specific error and verify updated_at fix"""
     print("=" * 80)
     print("CART API ERROR ANALYSIS - VERIFYING UPDATED_AT FIX")
@@ -28,19 +25,8 @@ def test_cart_error_analysis():
     print()
     
     # Test POST /api/cart
-    cart_data = {
-        "user_id": test_user_id,
-        "product_id": test_product_id,
-        "quantity": 1
-    }
-    
     try:
-        response = requests.post(
-            f"{BASE_URL}/cart",
-            headers=HEADERS,
-            json=cart_data,
-            timeout=10
-        )
+        response = client.add_to_cart(test_user_id, test_product_id, quantity=1)
         
         print(f"POST /api/cart Response:")
         print(f"  Status: {response.status_code}")
@@ -73,7 +59,7 @@ def test_cart_error_analysis():
         print(f"❌ EXCEPTION: {str(e)}")
         return False, "exception"
 
-def test_cart_patch_error():
+def test_cart_patch_error(client):
     """Test PATCH operation to see if updated_at error occurs there"""
     print("=" * 80)
     print("TESTING CART PATCH OPERATION")
@@ -82,23 +68,13 @@ def test_cart_patch_error():
     # Test PATCH with a random cart ID
     test_cart_id = str(uuid.uuid4())
     
-    update_data = {
-        "id": test_cart_id,
-        "quantity": 3
-    }
-    
     print(f"Testing PATCH /api/cart with non-existent cart ID:")
     print(f"  Cart ID: {test_cart_id}")
     print(f"  New Quantity: 3")
     print()
     
     try:
-        response = requests.patch(
-            f"{BASE_URL}/cart",
-            headers=HEADERS,
-            json=update_data,
-            timeout=10
-        )
+        response = client.update_cart_item(test_cart_id, 3)
         
         print(f"PATCH /api/cart Response:")
         print(f"  Status: {response.status_code}")
@@ -123,20 +99,24 @@ def test_cart_patch_error():
         print(f"❌ EXCEPTION in PATCH: {str(e)}")
         return False
 
-def main():
+def main(argv=None):
     """Run cart fix verification tests"""
+    parser = add_target_arguments(argparse.ArgumentParser(description="Cart updated_at fix verification"))
+    client = ShopClient.from_args(parser.parse_args(argv), default_target="preview")
+
     print("CART API FIX VERIFICATION")
     print("Checking if CRITICAL_FIX.sql resolved the updated_at trigger error")
+    print(f"Backend URL: {client.base_url}")
     print("=" * 80)
     print()
     
     # Test POST operation
-    post_success, error_type = test_cart_error_analysis()
+    post_success, error_type = test_cart_error_analysis(client)
     
     print("\n")
     
     # Test PATCH operation
-    patch_success = test_cart_patch_error()
+    patch_success = test_cart_patch_error(client)
     
     # Final Analysis
     print("\n" + "=" * 80)